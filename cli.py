@@ -0,0 +1,205 @@
+"""
+Command-line interface for SOE Engine Rotation Creator.
+
+Validates (and optionally converts) rotation files without the GUI:
+
+    python -m cli rotations/ --to soe --out build/ --workers 8
+
+Every file is imported, validated and exported in a process pool and one JSON
+object per file is written to stdout as soon as it is done.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.exporter import RotationConverter, write_file
+from core.validator import RotationValidator
+
+# Exit codes
+EXIT_OK = 0          # every rotation is valid
+EXIT_INVALID = 1     # at least one rotation failed validation
+EXIT_USAGE = 2       # bad arguments (argparse uses this too)
+EXIT_FAILED = 3      # at least one file could not be read, imported or written
+
+def find_rotation_files(paths: List[str], recursive: bool = True) -> Iterator[str]:
+    """Yield rotation files (by extension) from files and directories, in sorted order"""
+    formats = RotationConverter.IMPORTERS
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            if not recursive:
+                subdirectories.clear()
+            for name in sorted(files):
+                if os.path.splitext(name)[1][1:].lower() in formats:
+                    yield os.path.join(directory, name)
+
+def _output_path(path: str, root: Optional[str], output_dir: str, to_format: str) -> str:
+    """Mirror the file's location under output_dir with the target extension"""
+    relative = os.path.relpath(path, root) if root else os.path.basename(path)
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + "." + to_format)
+
+def _path_key(path: str) -> str:
+    """Key under which two spellings of the same file compare equal"""
+    return os.path.normcase(os.path.realpath(path))
+
+def _describe(error: Exception) -> str:
+    """Message for a failure; unexpected exception types are named"""
+    if isinstance(error, (OSError, UnicodeDecodeError, ValueError)):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+def process_file(path: str, root: Optional[str] = None, to_format: Optional[str] = None,
+                 output_dir: Optional[str] = None, strict: bool = False) -> Dict[str, Any]:
+    """
+    Import, validate and optionally export one rotation file
+    Returns a JSON-serializable record; never raises for bad input
+    """
+    from_format = os.path.splitext(path)[1][1:].lower()
+    record: Dict[str, Any] = {"file": path, "format": from_format}
+    try:
+        if from_format in RotationConverter.BINARY_FORMATS:
+            with open(path, 'rb') as f:
+                content = f.read()
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        importer = RotationConverter.IMPORTERS.get(from_format)
+        if importer is None:
+            raise ValueError(f"Unsupported source format: {from_format}")
+        rotation = importer(content)
+        result = RotationValidator.validate_rotation(rotation)
+    except Exception as e:
+        # One broken file must not abort the batch
+        record.update(status="error", error=_describe(e))
+        return record
+
+    valid = result.is_valid and not (strict and result.warnings)
+    record.update(
+        status="valid" if valid else "invalid",
+        name=rotation.metadata.name,
+        class_name=rotation.metadata.class_name,
+        spec_name=rotation.metadata.spec_name,
+        errors=result.errors,
+        warnings=result.warnings,
+        stats=result.stats
+    )
+
+    if to_format:
+        output = _output_path(path, root, output_dir or ".", to_format)
+        try:
+            if _path_key(output) == _path_key(path):
+                raise ValueError(f"{output} would overwrite its own input")
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            writer = RotationConverter.WRITERS[to_format]
+            write_file(output, lambda f: writer(rotation, f),
+                       binary=to_format in RotationConverter.BINARY_FORMATS)
+            record["output"] = output
+        except Exception as e:
+            record.update(status="error", error=f"Export failed: {_describe(e)}")
+    return record
+
+def _process_task(task: tuple) -> Dict[str, Any]:
+    *arguments, conflict = task
+    if conflict is None:
+        return process_file(*arguments)
+    # Another file already claimed the output: validate only, never overwrite its result
+    file_path, root, to_format, output_dir, strict = arguments
+    record = process_file(file_path, root, strict=strict)
+    if record["status"] != "error":
+        output, owner = conflict
+        record.update(status="error", error=f"Export failed: {output} is also the output of {owner}")
+    return record
+
+def _tasks(paths: List[str], args: argparse.Namespace) -> Iterator[tuple]:
+    """
+    Yield process_file arguments plus an (output, owner) conflict when an
+    earlier file in the batch already converts to the same output path
+    """
+    owners: Dict[str, str] = {}
+    for path in paths:
+        root = path if os.path.isdir(path) else None
+        for file_path in find_rotation_files([path], recursive=not args.no_recursive):
+            conflict: Optional[Tuple[str, str]] = None
+            if args.to:
+                output = _output_path(file_path, root, args.out or ".", args.to)
+                key = _path_key(output)
+                if key in owners:
+                    conflict = (output, owners[key])
+                else:
+                    owners[key] = file_path
+            yield (file_path, root, args.to, args.out, args.strict, conflict)
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Validate and convert SOE Engine rotation files."
+    )
+    parser.add_argument("paths", nargs="+", help="rotation files or directories")
+    parser.add_argument("--to", choices=sorted(RotationConverter.WRITERS),
+                        help="convert every rotation to this format")
+    parser.add_argument("--out", default=None,
+                        help="output directory for converted files (default: current directory)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count; 1 runs in-process)")
+    parser.add_argument("--strict", action="store_true",
+                        help="treat validation warnings as failures")
+    parser.add_argument("--no-recursive", action="store_true",
+                        help="do not descend into subdirectories")
+    parser.add_argument("--quiet", action="store_true",
+                        help="do not print the summary to stderr")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the CLI and return its exit code"""
+    args = _parse_args(argv)
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        print(f"No such file or directory: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_USAGE
+
+    start = time.perf_counter()
+    counts = {"valid": 0, "invalid": 0, "error": 0}
+    workers = args.workers or os.cpu_count() or 1
+    out = sys.stdout
+
+    if workers <= 1:
+        results = map(_process_task, _tasks(args.paths, args))
+        executor = None
+    else:
+        tasks = list(_tasks(args.paths, args))
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Large chunks keep pickling overhead low; results still arrive in order
+        chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+        results = executor.map(_process_task, tasks, chunksize=chunksize)
+
+    try:
+        for record in results:
+            counts[record["status"]] += 1
+            out.write(json.dumps(record) + "\n")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    out.flush()
+
+    if not args.quiet:
+        total = sum(counts.values())
+        print(f"Checked {total} files in {time.perf_counter() - start:.2f}s: "
+              f"{counts['valid']} valid, {counts['invalid']} invalid, {counts['error']} errors",
+              file=sys.stderr)
+
+    if counts["error"]:
+        return EXIT_FAILED
+    if counts["invalid"]:
+        return EXIT_INVALID
+    return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,240 @@
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
+from dataclasses import dataclass
+from functools import lru_cache
 import re
 
+# Maximum number of distinct condition strings kept in the parse cache
+CONDITION_CACHE_SIZE = 4096
+
+# Error categories reported by the validator
+SYNTAX_ERROR = "Invalid condition syntax"
+OPERATOR_ERROR = "Invalid operator usage"
+PARENTHESES_ERROR = "Mismatched parentheses"
+COMPONENT_ERROR = "Invalid condition components"
+
+class ConditionSyntaxError(ValueError):
+    """Raised when a condition string cannot be parsed"""
+
+    def __init__(self, message: str, position: int = 0, length: int = 1, detail: str = ""):
+        super().__init__(message)
+        self.message = message
+        self.position = position
+        self.length = length
+        self.detail = detail
+
+@dataclass(frozen=True)
+class Token:
+    """A single lexical token of a condition"""
+    kind: str       # 'ident', 'number', 'arg', 'op', 'lparen', 'rparen', 'end'
+    value: str
+    position: int
+
+@dataclass(frozen=True)
+class Literal:
+    """Boolean literal (true/false)"""
+    value: bool
+    position: int = 0
+
+@dataclass(frozen=True)
+class Number:
+    """Numeric literal"""
+    value: float
+    position: int = 0
+
+@dataclass(frozen=True)
+class Reference:
+    """Reference to a game value, e.g. player.health or player.buff(Name)"""
+    path: str
+    argument: Optional[str] = None
+    position: int = 0
+
+    @property
+    def category(self) -> str:
+        return self.path.split('.', 1)[0]
+
+@dataclass(frozen=True)
+class Not:
+    """Logical negation"""
+    operand: 'ConditionNode'
+    position: int = 0
+
+@dataclass(frozen=True)
+class Compare:
+    """Comparison between two operands"""
+    op: str
+    left: 'ConditionNode'
+    right: 'ConditionNode'
+    position: int = 0
+
+@dataclass(frozen=True)
+class Logical:
+    """Logical AND/OR of two conditions"""
+    op: str
+    left: 'ConditionNode'
+    right: 'ConditionNode'
+    position: int = 0
+
+ConditionNode = Union[Literal, Number, Reference, Not, Compare, Logical]
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+  | (?P<op>&&|\|\||>=|<=|==|!=|>|<|!)
+  | (?P<lparen>\()
+  | (?P<rparen>\))
+""", re.VERBOSE)
+
+# Characters allowed inside a call argument such as player.buff(Name)
+_ARG_RE = re.compile(r'[^()"\\]*')
+
+def tokenize_condition(condition: str) -> List[Token]:
+    """
+    Split a condition string into tokens
+    Raises ConditionSyntaxError on characters outside the condition grammar
+    """
+    tokens: List[Token] = []
+    pos = 0
+    length = len(condition)
+    while pos < length:
+        match = _TOKEN_RE.match(condition, pos)
+        if not match:
+            raise ConditionSyntaxError(SYNTAX_ERROR, pos, 1,
+                                       f"unexpected character {condition[pos]!r}")
+        kind = match.lastgroup
+        if kind != 'space':
+            tokens.append(Token(kind, match.group(), pos))
+        pos = match.end()
+
+        # An identifier immediately followed by '(' is a call: capture the raw argument
+        if kind == 'ident' and pos < length and condition[pos] == '(':
+            arg_match = _ARG_RE.match(condition, pos + 1)
+            end = arg_match.end()
+            if end >= length or condition[end] != ')':
+                if end < length and condition[end] != '(':
+                    raise ConditionSyntaxError(SYNTAX_ERROR, end, 1,
+                                               f"unexpected character {condition[end]!r}")
+                raise ConditionSyntaxError(PARENTHESES_ERROR, pos, 1, "unclosed argument list")
+            tokens.append(Token('arg', arg_match.group().strip(), pos))
+            pos = end + 1
+
+    tokens.append(Token('end', '', length))
+    return tokens
+
+class ConditionParser:
+    """Precedence-climbing parser producing a typed condition AST"""
+
+    BINARY_PRECEDENCE = {
+        '||': 1,
+        '&&': 2,
+        '>': 3, '<': 3, '>=': 3, '<=': 3, '==': 3, '!=': 3
+    }
+    COMPARISON_OPERATORS = frozenset(['>', '<', '>=', '<=', '==', '!='])
+
+    def __init__(self, condition: str):
+        self.condition = condition
+        self.tokens = tokenize_condition(condition)
+        self.index = 0
+
+    def parse(self) -> ConditionNode:
+        """Parse the whole condition"""
+        node = self._parse_expression(1)
+        token = self._peek()
+        if token.kind == 'rparen':
+            raise ConditionSyntaxError(PARENTHESES_ERROR, token.position, 1, "unexpected ')'")
+        if token.kind != 'end':
+            self._unexpected(token)
+        self._check_boolean(node)
+        return node
+
+    def _peek(self) -> Token:
+        return self.tokens[self.index]
+
+    def _advance(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _unexpected(self, token: Token) -> None:
+        if token.kind == 'op':
+            raise ConditionSyntaxError(OPERATOR_ERROR, token.position, len(token.value),
+                                       f"unexpected operator '{token.value}'")
+        if token.kind == 'end':
+            raise ConditionSyntaxError(OPERATOR_ERROR, token.position, 1,
+                                       "condition ends with an operator")
+        raise ConditionSyntaxError(SYNTAX_ERROR, token.position, max(len(token.value), 1),
+                                   f"unexpected '{token.value}'")
+
+    def _parse_expression(self, min_precedence: int) -> ConditionNode:
+        left = self._parse_unary()
+        while True:
+            token = self._peek()
+            precedence = self.BINARY_PRECEDENCE.get(token.value) if token.kind == 'op' else None
+            if precedence is None or precedence < min_precedence:
+                return left
+            self._advance()
+            right = self._parse_expression(precedence + 1)
+            if token.value in self.COMPARISON_OPERATORS:
+                for operand in (left, right):
+                    if not isinstance(operand, (Number, Reference)):
+                        raise ConditionSyntaxError(OPERATOR_ERROR, token.position, len(token.value),
+                                                   f"'{token.value}' needs a value on both sides")
+                left = Compare(token.value, left, right, token.position)
+            else:
+                self._check_boolean(left)
+                self._check_boolean(right)
+                left = Logical(token.value, left, right, token.position)
+
+    def _parse_unary(self) -> ConditionNode:
+        token = self._peek()
+        if token.kind == 'op' and token.value == '!':
+            self._advance()
+            operand = self._parse_unary()
+            self._check_boolean(operand)
+            return Not(operand, token.position)
+        return self._parse_primary()
+
+    def _parse_primary(self) -> ConditionNode:
+        token = self._advance()
+        if token.kind == 'lparen':
+            node = self._parse_expression(1)
+            closing = self._advance()
+            if closing.kind != 'rparen':
+                if closing.kind == 'end':
+                    raise ConditionSyntaxError(PARENTHESES_ERROR, token.position, 1, "unclosed '('")
+                self._unexpected(closing)
+            return node
+        if token.kind == 'number':
+            return Number(float(token.value), token.position)
+        if token.kind == 'ident':
+            if token.value in ('true', 'false'):
+                return Literal(token.value == 'true', token.position)
+            argument = None
+            if self._peek().kind == 'arg':
+                argument = self._advance().value
+            return self._make_reference(token, argument)
+        if token.kind == 'rparen':
+            raise ConditionSyntaxError(PARENTHESES_ERROR, token.position, 1, "unexpected ')'")
+        self._unexpected(token)
+
+    def _make_reference(self, token: Token, argument: Optional[str]) -> Reference:
+        if any(token.value in conditions
+               for conditions in ConditionValidator.CLASS_CONDITIONS.values()):
+            return Reference(token.value, argument, token.position)
+        parts = token.value.split('.')
+        if (len(parts) < 2
+                or parts[0] not in ConditionValidator.BASIC_CONDITIONS
+                or parts[1] not in ConditionValidator.BASIC_CONDITIONS[parts[0]]):
+            raise ConditionSyntaxError(COMPONENT_ERROR, token.position, len(token.value),
+                                       f"unknown condition '{token.value}'")
+        return Reference(token.value, argument, token.position)
+
+    @staticmethod
+    def _check_boolean(node: ConditionNode) -> None:
+        if isinstance(node, Number):
+            raise ConditionSyntaxError(COMPONENT_ERROR, node.position, 1,
+                                       "a number is not a condition")
+
 class ConditionValidator:
     """Validates and processes rotation conditions"""
     
@@ -135,113 +369,40 @@ class ConditionValidator:
         Validates a condition string
         Returns (is_valid, error_message)
         """
-        if not condition or condition.strip() == "true":
-            return True, ""
-            
-        try:
-            # Remove whitespace
-            condition = condition.strip()
-            
-            # Basic syntax validation
-            if not ConditionValidator._check_basic_syntax(condition):
-                return False, "Invalid condition syntax"
-            
-            # Validate operators
-            if not ConditionValidator._validate_operators(condition):
-                return False, "Invalid operator usage"
-            
-            # Validate parentheses
-            if not ConditionValidator._validate_parentheses(condition):
-                return False, "Mismatched parentheses"
-            
-            # Validate condition components
-            if not ConditionValidator._validate_components(condition):
-                return False, "Invalid condition components"
-            
-            return True, ""
-            
-        except Exception as e:
-            return False, f"Validation error: {str(e)}"
+        _, error = _parse_cached(condition)
+        if error is not None:
+            return False, error.message
+        return True, ""
 
     @staticmethod
-    def _check_basic_syntax(condition: str) -> bool:
-        """Check basic condition syntax"""
-        # Ensure no double spaces
-        if "  " in condition:
-            return False
-            
-        # Check for valid characters
-        valid_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-                         "0123456789._()!&|<>= ")
-        if not all(c in valid_chars for c in condition):
-            return False
-            
-        return True
-
-    @staticmethod
-    def _validate_operators(condition: str) -> bool:
-        """Validate operator usage"""
-        # Check for valid operator combinations
-        invalid_combinations = ['&&&&', '||||', '!!', '<<', '>>', '==>', '<==']
-        for combo in invalid_combinations:
-            if combo in condition:
-                return False
-                
-        # Ensure operators have spaces around them
-        for op in ConditionValidator.OPERATORS:
-            if op in condition and not (f" {op} " in condition or condition.startswith(f"{op} ")):
-                return False
-                
-        return True
+    def parse(condition: str) -> ConditionNode:
+        """
+        Parse a condition string into its AST
+        Results are cached per condition string; raises ConditionSyntaxError
+        """
+        node, error = _parse_cached(condition)
+        if error is not None:
+            # Raise a copy: re-raising the cached instance would keep extending its traceback
+            raise ConditionSyntaxError(error.message, error.position, error.length, error.detail)
+        return node
 
     @staticmethod
-    def _validate_parentheses(condition: str) -> bool:
-        """Validate parentheses matching"""
-        stack = []
-        for char in condition:
-            if char == '(':
-                stack.append(char)
-            elif char == ')':
-                if not stack:
-                    return False
-                stack.pop()
-        return len(stack) == 0
+    def clear_cache() -> None:
+        """Clear the parsed condition cache"""
+        _parse_cached.cache_clear()
 
-    @staticmethod
-    def _validate_components(condition: str) -> bool:
-        """Validate individual condition components"""
-        # Split condition into components
-        components = re.split(r'\s+(?:&&|\|\|)\s+', condition)
-        
-        for component in components:
-            # Remove NOT operator if present
-            if component.startswith('!'):
-                component = component[1:]
-                
-            # Extract the base condition
-            base = component.split('(')[0] if '(' in component else component
-            base = base.split('>')[0] if '>' in component else base
-            base = base.split('<')[0] if '<' in component else base
-            base = base.split('==')[0] if '==' in component else base
-            base = base.split('!=')[0] if '!=' in component else base
-            
-            # Check if base condition exists
-            parts = base.split('.')
-            if len(parts) < 2:
-                return False
-                
-            category = parts[0]
-            subcategory = parts[1]
-            
-            # Check if category exists
-            if category not in ConditionValidator.BASIC_CONDITIONS:
-                return False
-                
-            # Check if subcategory exists
-            if subcategory not in ConditionValidator.BASIC_CONDITIONS[category]:
-                return False
-                
-        return True
+@lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def _parse_cached(condition: str) -> Tuple[Optional[ConditionNode], Optional[ConditionSyntaxError]]:
+    """Parse a condition once per unique string, caching failures as well"""
+    if not condition or condition.strip() == "true":
+        return Literal(True), None
+    try:
+        return ConditionParser(condition).parse(), None
+    except ConditionSyntaxError as e:
+        # The cached error must not keep the parser's frames alive
+        return None, e.with_traceback(None)
+    except RecursionError:
+        return None, ConditionSyntaxError(SYNTAX_ERROR, 0, len(condition), "condition is nested too deeply")
 
 class ConditionBuilder:
     """Helps build conditions through UI interaction"""
@@ -272,7 +433,11 @@ class ConditionBuilder:
     def add_condition_part(self, category: str, condition: str, 
                          operator: str = "", value: str = "") -> None:
         """Add a part to the condition"""
-        condition_str = f"{category}.{condition}"
+        # Class conditions (e.g. runes.count) are not prefixed by their category
+        if category in ConditionValidator.CLASS_CONDITIONS:
+            condition_str = condition
+        else:
+            condition_str = f"{category}.{condition}"
         if operator and value:
             condition_str += f" {operator} {value}"
         self.condition_parts.append(condition_str)
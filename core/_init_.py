@@ -1,11 +1,41 @@
-from .rotation import Rotation, RotationManager
+from .rotation import Rotation, RotationChange, LazyRotation, RotationManager
 from .validator import RotationValidator
 from .exporter import RotationExporter, RotationImporter
+from .simulator import Simulator, GameState, SpellProfile, SimulationResult
+from .timeline import EventSimulator
+from .resources import ResourceModel, register_resource_model, get_resource_model
+from .vectorized import BatchEvaluator, state_grid
+from .montecarlo import MonteCarloSimulator, MonteCarloResult, Encounter
+from .optimizer import RotationOptimizer, OptimizationResult
+from .library import RotationLibrary, LibraryEntry
+from .bundle import RotationBundle, BundleEntry, write_bundle
 
 __all__ = [
     'Rotation',
+    'RotationChange',
+    'LazyRotation',
     'RotationManager',
     'RotationValidator',
     'RotationExporter',
-    'RotationImporter'
+    'RotationImporter',
+    'Simulator',
+    'GameState',
+    'SpellProfile',
+    'SimulationResult',
+    'EventSimulator',
+    'ResourceModel',
+    'register_resource_model',
+    'get_resource_model',
+    'BatchEvaluator',
+    'state_grid',
+    'MonteCarloSimulator',
+    'MonteCarloResult',
+    'Encounter',
+    'RotationOptimizer',
+    'OptimizationResult',
+    'RotationLibrary',
+    'LibraryEntry',
+    'RotationBundle',
+    'BundleEntry',
+    'write_bundle'
 ]
\ No newline at end of file
@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional, BinaryIO
+import struct
+from .rotation import Rotation, RotationMetadata, SpellEntry
+
+# Compact binary rotation format:
+#   header | varint section | string table
+# The varint section is a flat run of unsigned LEB128 varints:
+#   string count, string lengths (in characters),
+#   name, class, spec, author, version, description, tag count, tags,
+#   spec_id + 1 (0 means None), spell count,
+#   per spell: flags, name, condition, priority, notes[, zigzag id]
+# Strings are referenced by table index + 1 (0 means None) and the table is
+# the UTF-8 encoding of every distinct string, concatenated.
+
+_MAGIC = b"SOER"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIIdd")     # magic, version, varint bytes, table bytes, created_at, modified_at
+
+_FLAG_ENABLED = 0x01
+_FLAG_ID = 0x02
+
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError(f"Cannot store negative value {value} as a varint")
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varints(data: bytes) -> List[int]:
+    """Decode a run of varints"""
+    if data.isascii():
+        # Every value is below 128: one byte each
+        return list(data)
+    values = []
+    value = shift = 0
+    for byte in data:
+        if byte < 0x80:
+            values.append(value | (byte << shift))
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    if shift:
+        raise ValueError("Truncated varint")
+    return values
+
+def dumps(rotation: Rotation) -> bytes:
+    """Serialize a rotation to the binary format"""
+    strings: Dict[str, int] = {}
+    body: List[int] = []
+
+    def ref(value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index + 1
+
+    metadata = rotation.metadata
+    body.extend(ref(value) for value in (metadata.name, metadata.class_name, metadata.spec_name,
+                                         metadata.author, metadata.version, metadata.description))
+    body.append(len(metadata.tags))
+    body.extend(ref(tag) for tag in metadata.tags)
+    body.append(0 if rotation.spec_id is None else rotation.spec_id + 1)
+
+    spells = list(rotation.spells)
+    body.append(len(spells))
+    for spell in spells:
+        flags = (_FLAG_ENABLED if spell.enabled else 0) | (_FLAG_ID if spell.id is not None else 0)
+        body += (flags, ref(spell.name), ref(spell.condition), spell.priority, ref(spell.notes))
+        if spell.id is not None:
+            body.append(spell.id * 2 if spell.id >= 0 else -spell.id * 2 - 1)
+
+    varints = bytearray()
+    _write_varint(varints, len(strings))
+    for value in strings:
+        _write_varint(varints, len(value))
+    for value in body:
+        _write_varint(varints, value)
+    table = "".join(strings).encode('utf-8')
+    return b"".join((
+        _HEADER.pack(_MAGIC, _VERSION, len(varints), len(table), metadata.created_at, metadata.modified_at),
+        varints,
+        table
+    ))
+
+def loads(data: bytes) -> Rotation:
+    """Deserialize a rotation written by dumps"""
+    try:
+        magic, version, varint_size, table_size, created_at, modified_at = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a binary rotation")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported binary rotation version {version}")
+        start = _HEADER.size
+        if len(data) != start + varint_size + table_size:
+            raise ValueError("Binary rotation has the wrong length")
+        values = _read_varints(bytes(data[start:start + varint_size]))
+        text = bytes(data[start + varint_size:]).decode('utf-8')
+
+        count = values[0]
+        strings: List[Optional[str]] = [None]
+        offset = 0
+        for length in values[1:count + 1]:
+            strings.append(text[offset:offset + length])
+            offset += length
+        if offset != len(text):
+            raise ValueError("String table does not match its lengths")
+        position = count + 1
+
+        name, class_name, spec_name, author, version, description = (
+            strings[index] for index in values[position:position + 6])
+        position += 6
+        count = values[position]
+        tags = [strings[index] for index in values[position + 1:position + 1 + count]]
+        position += 1 + count
+        spec_id = values[position] - 1 if values[position] else None
+
+        count = values[position + 1]
+        position += 2
+        spells = []
+        for _ in range(count):
+            flags, name_index, condition_index, priority, notes_index = values[position:position + 5]
+            position += 5
+            spell_id = None
+            if flags & _FLAG_ID:
+                spell_id = values[position]
+                spell_id = spell_id >> 1 if not spell_id & 1 else -(spell_id >> 1) - 1
+                position += 1
+            spells.append(SpellEntry(strings[name_index], strings[condition_index], priority,
+                                     bool(flags & _FLAG_ENABLED), strings[notes_index], spell_id))
+        if position != len(values):
+            raise ValueError("Trailing data after binary rotation")
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt binary rotation: {e}")
+
+    rotation = Rotation(class_name, spec_name)
+    rotation.metadata = RotationMetadata(name, class_name, spec_name, author, version, description,
+                                         created_at, modified_at, tags)
+    rotation.spells = sorted(spells, key=lambda spell: spell.priority)
+    rotation.spec_id = spec_id
+    return rotation
+
+def dump(rotation: Rotation, f: BinaryIO) -> None:
+    """Write a rotation in the binary format to a binary file object"""
+    f.write(dumps(rotation))
+
+def load(f: BinaryIO) -> Rotation:
+    """Read a rotation in the binary format from a binary file object"""
+    return loads(f.read())
@@ -0,0 +1,191 @@
+from typing import Dict, List, Any, BinaryIO, Iterable, Iterator, Mapping, Union
+from dataclasses import dataclass, asdict
+import json
+import mmap
+import struct
+import zlib
+from .rotation import Rotation, RotationMetadata, SpellEntry, LazyRotation
+from .exporter import write_file
+import spell_data
+
+_MAGIC = b"SOEB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIQQ")         # magic, version, flags, count, TOC offset, TOC length
+_TOC_ENTRY = struct.Struct("<QII")          # payload offset, payload length, CRC-32 of payload
+_STRING = struct.Struct("<H")
+_BLOB = struct.Struct("<I")
+
+@dataclass
+class BundleEntry:
+    """Table of contents entry for one rotation in a bundle"""
+    key: str
+    class_name: str
+    spec_name: str
+    offset: int
+    length: int
+    checksum: int
+    metadata: RotationMetadata
+
+def _pack_string(value: str) -> bytes:
+    data = value.encode('utf-8')
+    if len(data) > 0xFFFF:
+        raise ValueError(f"String too long for bundle: {value[:40]}...")
+    return _STRING.pack(len(data)) + data
+
+def _bundle_keys(rotations: Union[Mapping[str, Rotation], Iterable[Rotation]]) -> Iterator[tuple]:
+    """(key, rotation) pairs; plain rotations get RotationManager-style keys"""
+    if isinstance(rotations, Mapping):
+        yield from rotations.items()
+        return
+    counters: Dict[str, int] = {}
+    for rotation in rotations:
+        base_key = f"{rotation.metadata.name}_{rotation.metadata.class_name}_{rotation.metadata.spec_name}"
+        counter = counters.get(base_key, 0)
+        counters[base_key] = counter + 1
+        yield (f"{base_key}_{counter}" if counter else base_key), rotation
+
+def write_bundle(path: str, rotations: Union[Mapping[str, Rotation], Iterable[Rotation]],
+                 level: int = 6) -> int:
+    """
+    Write rotations to a bundle file and return how many were written
+    Payloads are streamed to disk one rotation at a time; only the table of
+    contents is kept in memory and written at the end. A failed write leaves
+    any existing file at path untouched.
+    """
+    toc = []
+
+    def write(f: BinaryIO) -> None:
+        keys = set()
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0, 0, 0))
+        for key, rotation in _bundle_keys(rotations):
+            if key in keys:
+                raise ValueError(f"Duplicate rotation key in bundle: {key}")
+            keys.add(key)
+            # Spells are stored as rows in SpellEntry field order
+            payload = zlib.compress(json.dumps({
+                'spec_id': rotation.spec_id,
+                'spells': [[spell.name, spell.condition, spell.priority, spell.enabled, spell.notes, spell.id]
+                           for spell in rotation.spells]
+            }, separators=(',', ':')).encode('utf-8'), level)
+            offset = f.tell()
+            f.write(payload)
+            metadata = json.dumps(asdict(rotation.metadata), separators=(',', ':')).encode('utf-8')
+            toc.append(b"".join((
+                _TOC_ENTRY.pack(offset, len(payload), zlib.crc32(payload)),
+                _pack_string(key),
+                _pack_string(rotation.metadata.class_name),
+                _pack_string(rotation.metadata.spec_name),
+                _BLOB.pack(len(metadata)),
+                metadata
+            )))
+
+        toc_offset = f.tell()
+        toc_data = b"".join(toc)
+        f.write(toc_data)
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(toc), toc_offset, len(toc_data)))
+
+    write_file(path, write, binary=True)
+    return len(toc)
+
+class RotationBundle:
+    """
+    Read-only view of a rotation bundle file
+    Opening only reads the header and table of contents (which carries each
+    rotation's metadata); a rotation's payload is read by offset when loaded.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, count, toc_offset, toc_length = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"Not a rotation bundle: {path}")
+            if version != _VERSION:
+                raise ValueError(f"Unsupported bundle version {version}: {path}")
+            self.entries: Dict[str, BundleEntry] = {}
+            position = toc_offset
+            for _ in range(count):
+                entry, position = self._read_entry(position)
+                self.entries[entry.key] = entry
+            if position != toc_offset + toc_length:
+                raise ValueError(f"Corrupt bundle table of contents: {path}")
+        except (struct.error, UnicodeDecodeError, json.JSONDecodeError, TypeError) as e:
+            self._map.close()
+            raise ValueError(f"Corrupt bundle {path}: {e}")
+        except ValueError:
+            self._map.close()
+            raise
+
+    def _read_entry(self, position: int) -> tuple:
+        data = self._map
+        offset, length, checksum = _TOC_ENTRY.unpack_from(data, position)
+        position += _TOC_ENTRY.size
+        strings = []
+        for _ in range(3):
+            size, = _STRING.unpack_from(data, position)
+            position += _STRING.size
+            strings.append(data[position:position + size].decode('utf-8'))
+            position += size
+        size, = _BLOB.unpack_from(data, position)
+        position += _BLOB.size
+        metadata = RotationMetadata(**json.loads(data[position:position + size]))
+        position += size
+        key, class_name, spec_name = strings
+        return BundleEntry(key, class_name, spec_name, offset, length, checksum, metadata), position
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'RotationBundle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __iter__(self) -> Iterator[BundleEntry]:
+        return iter(self.entries.values())
+
+    def keys(self) -> List[str]:
+        """Rotation keys in bundle order"""
+        return list(self.entries)
+
+    def _read_payload(self, key: str) -> Dict[str, Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        payload = self._map[entry.offset:entry.offset + entry.length]
+        if zlib.crc32(payload) != entry.checksum:
+            raise ValueError(f"Checksum mismatch for rotation {key} in {self.path}")
+        return json.loads(zlib.decompress(payload))
+
+    def _load_spells(self, key: str) -> List[SpellEntry]:
+        payload = self._read_payload(key)
+        entry = self.entries[key]
+        # The payload's spec must match the class/spec the table of contents lists it under
+        if payload['spec_id'] != spell_data.get_spec_id(entry.class_name, entry.spec_name):
+            raise ValueError(f"Spec {payload['spec_id']} of rotation {key} does not match "
+                             f"{entry.class_name}/{entry.spec_name} in {self.path}")
+        return [SpellEntry(*row) for row in payload['spells']]
+
+    def load(self, key: str, lazy: bool = False) -> Rotation:
+        """Load one rotation by key; a lazy rotation reads its payload on first use"""
+        entry = self.entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        # Each load gets its own metadata copy so edits do not leak between rotations
+        metadata = RotationMetadata(**asdict(entry.metadata))
+        if lazy:
+            return LazyRotation(metadata, lambda: self._load_spells(key), validate=False)
+        rotation = Rotation(entry.class_name, entry.spec_name)
+        rotation.metadata = metadata
+        rotation.spells = self._load_spells(key)
+        return rotation
@@ -1,150 +1,336 @@
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Callable, IO, Iterable, Iterator, TextIO, BinaryIO, Union
+from contextlib import contextmanager
+import io
+import itertools
 import json
+import os
+import stat
+import tempfile
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 from datetime import datetime
 import re
 from .rotation import Rotation, SpellEntry
+from .tokenizer import LuaReader
+from . import binary
 import spell_data
 
+@contextmanager
+def _text_stream(f: IO) -> Iterator[TextIO]:
+    """Yield a text stream for f, wrapping binary file objects as UTF-8"""
+    if isinstance(f, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(f, 'mode', ''):
+        stream = io.TextIOWrapper(f, encoding='utf-8', newline='', write_through=True)
+        try:
+            yield stream
+        finally:
+            stream.flush()
+            stream.detach()
+    else:
+        yield f
+
+def write_file(filename: str, write: Callable[[IO], None], binary: bool = False) -> None:
+    """
+    Stream into a temp file next to filename and replace it only once the
+    write succeeded, so a failed write leaves the existing file untouched
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(filename), suffix=".tmp",
+                                     dir=os.path.dirname(filename) or ".")
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            write(f)
+        # mkstemp creates owner-only files; keep the permissions a plain open() would give
+        if os.path.exists(filename):
+            mode = stat.S_IMODE(os.stat(filename).st_mode)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, filename)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def _json_value(value: Any, pretty: bool, level: int) -> str:
+    """JSON for a value nested level deep in an indent=2 document"""
+    if not pretty:
+        return json.dumps(value)
+    return json.dumps(value, indent=2).replace("\n", "\n" + "  " * level)
+
+def _xml_text(value: Optional[str], pretty: bool) -> str:
+    # Matches the escaping of minidom (pretty) and ElementTree (compact)
+    return escape(value, _XML_QUOTE if pretty else {})
+
+_XML_QUOTE = {'"': '&quot;'}
+
+_HEADER_FIELD = re.compile(r'(Author|Version|Description|Created|Last Modified):\s*(.*)', re.S)
+
+def _apply_header_comments(rotation: Rotation, comments: List[str]) -> None:
+    """Set name/author/version/description from the comment header written by the exporters"""
+    description = None
+    for index, comment in enumerate(comments):
+        match = _HEADER_FIELD.match(comment)
+        if description is not None:
+            description.append(comment)
+        elif match:
+            field, value = match.groups()
+            if field == "Author":
+                rotation.metadata.author = value.strip()
+            elif field == "Version":
+                rotation.metadata.version = value.strip()
+            elif field == "Description":
+                # The description follows on its own comment lines
+                description = [value.strip()] if value.strip() else []
+        elif index == 0 and comment:
+            rotation.metadata.name = comment
+    if description is not None:
+        rotation.metadata.description = "\n".join(description)
+
+def _comment(text: str, prefix: str) -> str:
+    """Continue multi-line text on further comment lines"""
+    return text.replace("\n", "\n" + prefix)
+
+def _lua_string(value: str) -> str:
+    """Escape a value for a double-quoted Lua string"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
 class RotationExporter:
     """Handles exporting rotations to different formats"""
 
     @staticmethod
-    def to_soe(rotation: Rotation) -> str:
-        """Export rotation to SOE Engine format"""
-        lines = [
-            f"-- {rotation.metadata.name}",
-            f"-- Author: {rotation.metadata.author}",
-            f"-- Version: {rotation.metadata.version}",
-            f"-- Created: {datetime.fromtimestamp(rotation.metadata.created_at).strftime('%Y-%m-%d %H:%M:%S')}",
-            f"-- Last Modified: {datetime.fromtimestamp(rotation.metadata.modified_at).strftime('%Y-%m-%d %H:%M:%S')}",
-            "-- Description:",
-            f"-- {rotation.metadata.description}",
-            "",
-            f"SOEEngine.rotation.register({rotation.spec_id}, {{",
-            "    -- Combat rotation",
-        ]
-
-        # Add combat rotation spells
-        for spell in rotation.spells:
-            if spell.enabled:
-                condition = spell.condition if spell.condition != "true" else "true"
-                if spell.notes:
-                    lines.append(f"    -- {spell.notes}")
-                lines.append(f"    {{ \"{spell.name}\", \"{condition}\" }},")
-
-        # Add closing bracket
-        lines.append("})")
-
-        return "\n".join(lines)
+    def write_soe(rotation: Rotation, f: IO) -> None:
+        """Write rotation in SOE Engine format to a text or binary file object"""
+        metadata = rotation.metadata
+        with _text_stream(f) as out:
+            out.write(
+                f"-- {metadata.name}\n"
+                f"-- Author: {metadata.author}\n"
+                f"-- Version: {metadata.version}\n"
+                f"-- Created: {datetime.fromtimestamp(metadata.created_at).strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"-- Last Modified: {datetime.fromtimestamp(metadata.modified_at).strftime('%Y-%m-%d %H:%M:%S')}\n"
+                "-- Description:\n"
+                f"-- {_comment(metadata.description, '-- ')}\n"
+                "\n"
+                f"SOEEngine.rotation.register({rotation.spec_id}, {{\n"
+                "    -- Combat rotation\n"
+            )
+
+            # Add combat rotation spells
+            for spell in rotation.spells:
+                if spell.enabled:
+                    if spell.notes:
+                        out.write(f"    -- {_comment(spell.notes, '    -- ')}\n")
+                    out.write(f"    {{ \"{_lua_string(spell.name)}\", \"{_lua_string(spell.condition)}\" }},\n")
+
+            # Add closing bracket
+            out.write("})")
 
     @staticmethod
-    def to_json(rotation: Rotation, pretty: bool = True) -> str:
-        """Export rotation to JSON format"""
-        data = {
-            "format_version": "1.0",
-            "metadata": {
-                "name": rotation.metadata.name,
-                "class_name": rotation.metadata.class_name,
-                "spec_name": rotation.metadata.spec_name,
-                "author": rotation.metadata.author,
-                "version": rotation.metadata.version,
-                "description": rotation.metadata.description,
-                "created_at": rotation.metadata.created_at,
-                "modified_at": rotation.metadata.modified_at,
-                "tags": rotation.metadata.tags
-            },
-            "spec_id": rotation.spec_id,
-            "spells": [
-                {
+    def write_json(rotation: Rotation, f: IO, pretty: bool = True) -> None:
+        """Write rotation in JSON format to a text or binary file object, one spell at a time"""
+        metadata = {
+            "name": rotation.metadata.name,
+            "class_name": rotation.metadata.class_name,
+            "spec_name": rotation.metadata.spec_name,
+            "author": rotation.metadata.author,
+            "version": rotation.metadata.version,
+            "description": rotation.metadata.description,
+            "created_at": rotation.metadata.created_at,
+            "modified_at": rotation.metadata.modified_at,
+            "tags": rotation.metadata.tags
+        }
+        # Same layout as json.dumps(..., indent=2 if pretty else None)
+        member = ",\n  " if pretty else ", "
+        with _text_stream(f) as out:
+            out.write("{\n  " if pretty else "{")
+            out.write('"format_version": "1.0"' + member)
+            out.write('"metadata": ' + _json_value(metadata, pretty, 1) + member)
+            out.write('"spec_id": ' + json.dumps(rotation.spec_id) + member)
+            out.write('"spells": [')
+            separator = "\n    " if pretty else ""
+            for spell in rotation.spells:
+                out.write(separator + _json_value({
                     "name": spell.name,
                     "condition": spell.condition,
                     "priority": spell.priority,
                     "enabled": spell.enabled,
                     "notes": spell.notes
-                }
-                for spell in rotation.spells
-            ]
-        }
-        
-        return json.dumps(data, indent=2 if pretty else None)
+                }, pretty, 2))
+                separator = ",\n    " if pretty else ", "
+            if pretty and separator != "\n    ":
+                out.write("\n  ")
+            out.write("]\n}" if pretty else "]}")
 
     @staticmethod
-    def to_xml(rotation: Rotation, pretty: bool = True) -> str:
-        """Export rotation to XML format"""
-        root = ET.Element("rotation")
-        
+    def write_xml(rotation: Rotation, f: IO, pretty: bool = True) -> None:
+        """Write rotation in XML format to a text or binary file object"""
+        with _text_stream(f) as out:
+            if pretty:
+                out.write('<?xml version="1.0" ?>\n')
+            RotationExporter._write_xml_rotation(rotation, out, pretty, 0)
+
+    @staticmethod
+    def _write_xml_rotation(rotation: Rotation, out: TextIO, pretty: bool, level: int) -> None:
+        newline = "\n" if pretty else ""
+        empty = "/>" if pretty else " />"
+
+        def open_tag(tag: str, depth: int) -> None:
+            out.write(f"{'  ' * depth if pretty else ''}<{tag}>{newline}")
+
+        def close_tag(tag: str, depth: int) -> None:
+            out.write(f"{'  ' * depth if pretty else ''}</{tag}>{newline if depth else ''}")
+
+        def text_element(tag: str, value: Optional[str], depth: int) -> None:
+            indent = '  ' * depth if pretty else ''
+            if value:
+                out.write(f"{indent}<{tag}>{_xml_text(value, pretty)}</{tag}>{newline}")
+            else:
+                out.write(f"{indent}<{tag}{empty}{newline}")
+
+        metadata = rotation.metadata
+        open_tag("rotation", level)
+
         # Add metadata
-        metadata = ET.SubElement(root, "metadata")
-        ET.SubElement(metadata, "name").text = rotation.metadata.name
-        ET.SubElement(metadata, "class").text = rotation.metadata.class_name
-        ET.SubElement(metadata, "spec").text = rotation.metadata.spec_name
-        ET.SubElement(metadata, "author").text = rotation.metadata.author
-        ET.SubElement(metadata, "version").text = rotation.metadata.version
-        ET.SubElement(metadata, "description").text = rotation.metadata.description
-        ET.SubElement(metadata, "created").text = datetime.fromtimestamp(
-            rotation.metadata.created_at).isoformat()
-        ET.SubElement(metadata, "modified").text = datetime.fromtimestamp(
-            rotation.metadata.modified_at).isoformat()
-        
-        tags = ET.SubElement(metadata, "tags")
-        for tag in rotation.metadata.tags:
-            ET.SubElement(tags, "tag").text = tag
-        
+        open_tag("metadata", level + 1)
+        for tag, value in (
+            ("name", metadata.name),
+            ("class", metadata.class_name),
+            ("spec", metadata.spec_name),
+            ("author", metadata.author),
+            ("version", metadata.version),
+            ("description", metadata.description),
+            ("created", datetime.fromtimestamp(metadata.created_at).isoformat()),
+            ("modified", datetime.fromtimestamp(metadata.modified_at).isoformat())
+        ):
+            text_element(tag, value, level + 2)
+        if metadata.tags:
+            open_tag("tags", level + 2)
+            for tag in metadata.tags:
+                text_element("tag", tag, level + 3)
+            close_tag("tags", level + 2)
+        else:
+            text_element("tags", None, level + 2)
+        close_tag("metadata", level + 1)
+
         # Add spells
-        spells = ET.SubElement(root, "spells")
-        for spell in rotation.spells:
-            spell_elem = ET.SubElement(spells, "spell")
-            ET.SubElement(spell_elem, "name").text = spell.name
-            ET.SubElement(spell_elem, "condition").text = spell.condition
-            ET.SubElement(spell_elem, "priority").text = str(spell.priority)
-            ET.SubElement(spell_elem, "enabled").text = str(spell.enabled).lower()
-            ET.SubElement(spell_elem, "notes").text = spell.notes
-        
-        # Convert to string
-        if pretty:
-            from xml.dom import minidom
-            xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
-            # Remove empty lines
-            xml_str = '\n'.join([line for line in xml_str.split('\n') if line.strip()])
-            return xml_str
+        spells = iter(rotation.spells)
+        first = next(spells, None)
+        if first is None:
+            text_element("spells", None, level + 1)
         else:
-            return ET.tostring(root, encoding='unicode')
+            open_tag("spells", level + 1)
+            for spell in itertools.chain((first,), spells):
+                open_tag("spell", level + 2)
+                text_element("name", spell.name, level + 3)
+                text_element("condition", spell.condition, level + 3)
+                text_element("priority", str(spell.priority), level + 3)
+                text_element("enabled", str(spell.enabled).lower(), level + 3)
+                text_element("notes", spell.notes, level + 3)
+                close_tag("spell", level + 2)
+            close_tag("spells", level + 1)
+        close_tag("rotation", level)
+
+    @staticmethod
+    def write_lua(rotation: Rotation, f: IO) -> None:
+        """Write rotation as pure Lua to a text or binary file object"""
+        metadata = rotation.metadata
+        with _text_stream(f) as out:
+            out.write(
+                f"-- {metadata.name}\n"
+                f"-- Author: {metadata.author}\n"
+                f"-- Version: {metadata.version}\n"
+                "\n"
+                "local rotationTable = {\n"
+                f"    name = \"{_lua_string(metadata.name)}\",\n"
+                f"    class = \"{_lua_string(metadata.class_name)}\",\n"
+                f"    spec = \"{_lua_string(metadata.spec_name)}\",\n"
+                "    spells = {\n"
+            )
+
+            for spell in rotation.spells:
+                if spell.enabled:
+                    out.write(
+                        "        {\n"
+                        f"            name = \"{_lua_string(spell.name)}\",\n"
+                        f"            condition = \"{_lua_string(spell.condition)}\",\n"
+                        f"            priority = {spell.priority},\n"
+                        f"            notes = \"{_lua_string(spell.notes)}\"\n"
+                        "        },\n"
+                    )
+
+            out.write(
+                "    }\n"
+                "}\n"
+                "\n"
+                "return rotationTable"
+            )
+
+    @staticmethod
+    def write_all(rotations: Iterable[Rotation], f: IO, format_type: str) -> int:
+        """
+        Write several rotations to one file object, one rotation at a time
+        JSON is written as an array and XML under a <rotations> root; SOE and
+        Lua exports are separated by a blank line. Returns the number written.
+        """
+        if format_type not in RotationConverter.WRITERS:
+            raise ValueError(f"Unsupported export format: {format_type}")
+        if format_type in RotationConverter.BINARY_FORMATS:
+            raise ValueError(f"Cannot write several rotations as {format_type}; use a bundle")
+        count = 0
+        with _text_stream(f) as out:
+            if format_type == 'xml':
+                out.write('<?xml version="1.0" ?>\n<rotations>\n')
+            elif format_type == 'json':
+                out.write("[\n")
+            for rotation in rotations:
+                if count:
+                    out.write(",\n" if format_type == 'json' else "\n" if format_type == 'xml' else "\n\n")
+                if format_type == 'xml':
+                    RotationExporter._write_xml_rotation(rotation, out, True, 1)
+                else:
+                    RotationConverter.WRITERS[format_type](rotation, out)
+                count += 1
+            if format_type == 'xml':
+                out.write("\n</rotations>\n" if count else "</rotations>\n")
+            elif format_type == 'json':
+                out.write("\n]\n" if count else "]\n")
+        return count
+
+    @staticmethod
+    def _to_string(writer: Callable[..., None], rotation: Rotation, **kwargs) -> str:
+        buffer = io.StringIO()
+        writer(rotation, buffer, **kwargs)
+        return buffer.getvalue()
+
+    @staticmethod
+    def to_soe(rotation: Rotation) -> str:
+        """Export rotation to SOE Engine format"""
+        return RotationExporter._to_string(RotationExporter.write_soe, rotation)
+
+    @staticmethod
+    def to_json(rotation: Rotation, pretty: bool = True) -> str:
+        """Export rotation to JSON format"""
+        return RotationExporter._to_string(RotationExporter.write_json, rotation, pretty=pretty)
+
+    @staticmethod
+    def to_xml(rotation: Rotation, pretty: bool = True) -> str:
+        """Export rotation to XML format"""
+        return RotationExporter._to_string(RotationExporter.write_xml, rotation, pretty=pretty)
 
     @staticmethod
     def to_lua(rotation: Rotation) -> str:
         """Export rotation to pure Lua format"""
-        lines = [
-            f"-- {rotation.metadata.name}",
-            f"-- Author: {rotation.metadata.author}",
-            f"-- Version: {rotation.metadata.version}",
-            "",
-            "local rotationTable = {",
-            f"    name = \"{rotation.metadata.name}\",",
-            f"    class = \"{rotation.metadata.class_name}\",",
-            f"    spec = \"{rotation.metadata.spec_name}\",",
-            "    spells = {"
-        ]
-
-        for spell in rotation.spells:
-            if spell.enabled:
-                lines.extend([
-                    "        {",
-                    f"            name = \"{spell.name}\",",
-                    f"            condition = \"{spell.condition}\",",
-                    f"            priority = {spell.priority},",
-                    f"            notes = \"{spell.notes}\"",
-                    "        },"
-                ])
-
-        lines.extend([
-            "    }",
-            "}",
-            "",
-            "return rotationTable"
-        ])
-
-        return "\n".join(lines)
+        return RotationExporter._to_string(RotationExporter.write_lua, rotation)
+
+    @staticmethod
+    def write_binary(rotation: Rotation, f: BinaryIO) -> None:
+        """Write rotation in the compact binary format to a binary file object"""
+        binary.dump(rotation, f)
+
+    @staticmethod
+    def to_binary(rotation: Rotation) -> bytes:
+        """Export rotation to the compact binary format"""
+        return binary.dumps(rotation)
 
 class RotationImporter:
     """Handles importing rotations from different formats"""
@@ -153,57 +339,58 @@ class RotationImporter:
     def from_soe(content: str) -> Rotation:
         """Import rotation from SOE Engine format"""
         try:
-            # Extract spec ID
-            spec_match = re.search(r'register\((\d+)', content)
-            if not spec_match:
-                raise ValueError("Could not find spec ID in SOE code")
-            
-            spec_id = int(spec_match.group(1))
-            
-            # Find class and spec from spec ID
-            class_name = None
-            spec_name = None
-            for c, specs in spell_data.SPEC_IDS.items():
-                for s, sid in specs.items():
-                    if sid == spec_id:
-                        class_name = c
-                        spec_name = s
-                        break
-                if class_name:
-                    break
-            
-            if not class_name or not spec_name:
-                raise ValueError(f"Invalid spec ID: {spec_id}")
-            
-            # Create rotation
-            rotation = Rotation(class_name, spec_name)
-            
-            # Extract metadata from comments
-            author_match = re.search(r'--\s*Author:\s*(.+)', content)
-            if author_match:
-                rotation.metadata.author = author_match.group(1).strip()
-            
-            version_match = re.search(r'--\s*Version:\s*(.+)', content)
-            if version_match:
-                rotation.metadata.version = version_match.group(1).strip()
-            
-            description_match = re.search(r'--\s*Description:\s*(.+)', content)
-            if description_match:
-                rotation.metadata.description = description_match.group(1).strip()
-            
-            # Extract spells
-            spell_pattern = r'\{\s*"([^"]+)",\s*"([^"]+)"\s*\}'
-            spell_matches = re.finditer(spell_pattern, content)
-            
-            for i, match in enumerate(spell_matches, 1):
-                spell_name, condition = match.groups()
-                rotation.add_spell(spell_name, condition, i)
-            
-            return rotation
-            
+            return RotationImporter.read_soe(io.StringIO(content))
         except Exception as e:
             raise ValueError(f"Error parsing SOE Engine code: {str(e)}")
 
+    @staticmethod
+    def read_soe(f: TextIO) -> Rotation:
+        """Import the first rotation in SOE Engine format from a text file object"""
+        rotation = next(RotationImporter.iter_soe(f), None)
+        if rotation is None:
+            raise ValueError("Could not find spec ID in SOE code")
+        return rotation
+
+    @staticmethod
+    def iter_soe(f: TextIO) -> Iterator[Rotation]:
+        """
+        Import every rotation in SOE Engine format from a text file object
+        Reads the input in one streaming pass, so concatenated exports of any
+        size are parsed one rotation at a time.
+        """
+        reader = LuaReader(f)
+        while True:
+            token = reader.next()
+            if token.kind == 'eof':
+                return
+            if token.kind != 'name' or token.value != 'register' or not reader.accept('op', '('):
+                continue
+
+            comments = reader.take_comments()
+            spec_id = reader.expect('number').value
+            class_spec = spell_data.get_class_spec(spec_id)
+            if not class_spec:
+                raise ValueError(f"Invalid spec ID: {spec_id}")
+            reader.expect('op', ',')
+            entries = reader.read_table()
+            reader.expect('op', ')')
+            # Spell notes are comments inside the table; they are not imported
+            reader.take_comments()
+
+            if not isinstance(entries, list):
+                entries = [entries[key] for key in sorted(k for k in entries if isinstance(k, int))]
+            spells = []
+            for entry in entries:
+                if not (isinstance(entry, list) and len(entry) >= 2
+                        and isinstance(entry[0], str) and isinstance(entry[1], str)):
+                    raise ValueError(f"Malformed spell entry near line {token.line}: {entry!r}")
+                spells.append((entry[0], entry[1]))
+
+            rotation = Rotation(*class_spec)
+            _apply_header_comments(rotation, comments)
+            rotation.add_spells(spells)
+            yield rotation
+
     @staticmethod
     def from_json(content: str) -> Rotation:
         """Import rotation from JSON format"""
@@ -228,14 +415,16 @@ class RotationImporter:
             rotation.metadata.tags = data["metadata"]["tags"]
             
             # Add spells
-            for spell_data in data["spells"]:
-                spell = rotation.add_spell(
-                    spell_data["name"],
-                    spell_data["condition"],
-                    spell_data["priority"]
+            rotation.add_spells(
+                SpellEntry(
+                    name=spell["name"],
+                    condition=spell["condition"],
+                    priority=spell["priority"],
+                    enabled=spell["enabled"],
+                    notes=spell["notes"]
                 )
-                spell.enabled = spell_data["enabled"]
-                spell.notes = spell_data["notes"]
+                for spell in data["spells"]
+            )
             
             return rotation
             
@@ -273,16 +462,17 @@ class RotationImporter:
                 rotation.metadata.tags = [tag.text for tag in tags.findall("tag")]
             
             # Add spells
+            spells = []
             for spell_elem in root.find("spells").findall("spell"):
-                spell = rotation.add_spell(
-                    spell_elem.find("name").text,
-                    spell_elem.find("condition").text,
-                    int(spell_elem.find("priority").text)
-                )
-                spell.enabled = spell_elem.find("enabled").text == "true"
                 notes = spell_elem.find("notes")
-                if notes is not None:
-                    spell.notes = notes.text
+                spells.append(SpellEntry(
+                    name=spell_elem.find("name").text,
+                    condition=spell_elem.find("condition").text,
+                    priority=int(spell_elem.find("priority").text),
+                    enabled=spell_elem.find("enabled").text == "true",
+                    notes=(notes.text or "") if notes is not None else ""
+                ))
+            rotation.add_spells(spells)
             
             return rotation
             
@@ -293,76 +483,128 @@ class RotationImporter:
     def from_lua(content: str) -> Rotation:
         """Import rotation from Lua format"""
         try:
-            # Extract class and spec
-            class_match = re.search(r'class\s*=\s*"([^"]+)"', content)
-            spec_match = re.search(r'spec\s*=\s*"([^"]+)"', content)
-            
-            if not class_match or not spec_match:
-                raise ValueError("Could not find class or spec in Lua code")
-            
-            class_name = class_match.group(1)
-            spec_name = spec_match.group(1)
-            
-            # Create rotation
-            rotation = Rotation(class_name, spec_name)
-            
-            # Extract name
-            name_match = re.search(r'name\s*=\s*"([^"]+)"', content)
-            if name_match:
-                rotation.metadata.name = name_match.group(1)
-            
-            # Extract spells
-            spell_pattern = r'{\s*name\s*=\s*"([^"]+)",\s*condition\s*=\s*"([^"]+)",\s*priority\s*=\s*(\d+),\s*notes\s*=\s*"([^"]*)"'
-            spell_matches = re.finditer(spell_pattern, content)
-            
-            for match in spell_matches:
-                name, condition, priority, notes = match.groups()
-                spell = rotation.add_spell(name, condition, int(priority))
-                spell.notes = notes
-            
-            return rotation
-            
+            return RotationImporter.read_lua(io.StringIO(content))
         except Exception as e:
             raise ValueError(f"Error parsing Lua code: {str(e)}")
 
+    @staticmethod
+    def read_lua(f: TextIO) -> Rotation:
+        """Import the first rotation in Lua format from a text file object"""
+        rotation = next(RotationImporter.iter_lua(f), None)
+        if rotation is None:
+            raise ValueError("Could not find class or spec in Lua code")
+        return rotation
+
+    @staticmethod
+    def from_binary(content: bytes) -> Rotation:
+        """Import rotation from the compact binary format"""
+        try:
+            return binary.loads(content)
+        except Exception as e:
+            raise ValueError(f"Error parsing binary rotation: {str(e)}")
+
+    @staticmethod
+    def read_binary(f: BinaryIO) -> Rotation:
+        """Import rotation in the compact binary format from a binary file object"""
+        return RotationImporter.from_binary(f.read())
+
+    @staticmethod
+    def iter_lua(f: TextIO) -> Iterator[Rotation]:
+        """
+        Import every rotation table (one with class and spec fields) in Lua
+        format from a text file object, in one streaming pass
+        """
+        reader = LuaReader(f)
+        while True:
+            token = reader.peek()
+            if token.kind == 'eof':
+                return
+            if token.kind != 'op' or token.value != '{':
+                reader.next()
+                continue
+
+            comments = reader.take_comments()
+            table = reader.read_table()
+            reader.take_comments()
+            if not isinstance(table, dict) or "class" not in table or "spec" not in table:
+                continue
+
+            rotation = Rotation(table["class"], table["spec"])
+            _apply_header_comments(rotation, comments)
+            for key in ("name", "author", "version", "description"):
+                if isinstance(table.get(key), str):
+                    setattr(rotation.metadata, key, table[key])
+
+            entries = table.get("spells", [])
+            if isinstance(entries, dict):
+                entries = [entries[key] for key in sorted(k for k in entries if isinstance(k, int))]
+            spells = []
+            for entry in entries:
+                if not isinstance(entry, dict) or "name" not in entry:
+                    raise ValueError(f"Malformed spell entry in rotation on line {token.line}: {entry!r}")
+                spells.append(SpellEntry(
+                    name=entry["name"],
+                    condition=entry.get("condition", "true"),
+                    priority=entry.get("priority"),
+                    enabled=entry.get("enabled", True),
+                    notes=entry.get("notes", "")
+                ))
+            rotation.add_spells(spells)
+            yield rotation
+
 class RotationConverter:
     """Handles converting between different rotation formats"""
+
+    # Format name -> import/export function; formats are also file extensions
+    IMPORTERS = {
+        'soe': RotationImporter.from_soe,
+        'json': RotationImporter.from_json,
+        'xml': RotationImporter.from_xml,
+        'lua': RotationImporter.from_lua,
+        'rotb': RotationImporter.from_binary
+    }
+
+    EXPORTERS = {
+        'soe': RotationExporter.to_soe,
+        'json': RotationExporter.to_json,
+        'xml': RotationExporter.to_xml,
+        'lua': RotationExporter.to_lua,
+        'rotb': RotationExporter.to_binary
+    }
+
+    # Streaming variants of EXPORTERS: writer(rotation, file)
+    WRITERS = {
+        'soe': RotationExporter.write_soe,
+        'json': RotationExporter.write_json,
+        'xml': RotationExporter.write_xml,
+        'lua': RotationExporter.write_lua,
+        'rotb': RotationExporter.write_binary
+    }
+
+    # Formats read and written as bytes (and through binary file objects)
+    BINARY_FORMATS = {'rotb'}
     
     @classmethod
-    def convert(cls, content: str, from_format: str, to_format: str) -> str:
+    def convert(cls, content: Union[str, bytes], from_format: str, to_format: str) -> Union[str, bytes]:
         """
         Convert rotation between formats
         
         Args:
-            content: The rotation content to convert
-            from_format: Source format ('soe', 'json', 'xml', 'lua')
-            to_format: Target format ('soe', 'json', 'xml', 'lua')
+            content: The rotation content to convert (bytes for binary formats)
+            from_format: Source format ('soe', 'json', 'xml', 'lua', 'rotb')
+            to_format: Target format ('soe', 'json', 'xml', 'lua', 'rotb')
             
         Returns:
-            Converted rotation content
+            Converted rotation content (bytes for binary formats)
         """
         # Import rotation
-        importers = {
-            'soe': RotationImporter.from_soe,
-            'json': RotationImporter.from_json,
-            'xml': RotationImporter.from_xml,
-            'lua': RotationImporter.from_lua
-        }
-        
-        if from_format not in importers:
+        if from_format not in cls.IMPORTERS:
             raise ValueError(f"Unsupported source format: {from_format}")
             
-        rotation = importers[from_format](content)
+        rotation = cls.IMPORTERS[from_format](content)
         
         # Export rotation
-        exporters = {
-            'soe': RotationExporter.to_soe,
-            'json': RotationExporter.to_json,
-            'xml': RotationExporter.to_xml,
-            'lua': RotationExporter.to_lua
-        }
-        
-        if to_format not in exporters:
+        if to_format not in cls.EXPORTERS:
             raise ValueError(f"Unsupported target format: {to_format}")
             
-        return exporters[to_format](rotation)
\ No newline at end of file
+        return cls.EXPORTERS[to_format](rotation)
\ No newline at end of file
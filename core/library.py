@@ -0,0 +1,271 @@
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from dataclasses import dataclass, field
+import sqlite3
+from .rotation import Rotation, RotationMetadata, SpellEntry, LazyRotation
+
+DEFAULT_PATH = "library.db"
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rotations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    spec_name TEXT NOT NULL,
+    spec_id INTEGER,
+    author TEXT NOT NULL DEFAULT '',
+    version TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    modified_at REAL NOT NULL,
+    spell_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS spells (
+    rotation_id INTEGER NOT NULL REFERENCES rotations(id) ON DELETE CASCADE,
+    priority INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    condition TEXT NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    notes TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (rotation_id, priority)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tags (
+    rotation_id INTEGER NOT NULL REFERENCES rotations(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (rotation_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rotations_class_spec ON rotations(class_name, spec_name, modified_at);
+CREATE INDEX IF NOT EXISTS idx_rotations_modified ON rotations(modified_at);
+CREATE INDEX IF NOT EXISTS idx_rotations_author ON rotations(author);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag, rotation_id);
+"""
+
+# Full-text index over names, descriptions, spells, conditions and notes;
+# rowid is the rotation id
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS rotation_search USING fts5(
+    name, description, spells, conditions, notes
+);
+"""
+
+_SORT_COLUMNS = {
+    "modified": "r.modified_at DESC",
+    "created": "r.created_at DESC",
+    "name": "r.name COLLATE NOCASE",
+    "class": "r.class_name, r.spec_name, r.name COLLATE NOCASE"
+}
+
+@dataclass
+class LibraryEntry:
+    """Rotation summary returned by library queries; the spells are loaded on demand"""
+    id: int
+    name: str
+    class_name: str
+    spec_name: str
+    author: str
+    version: str
+    description: str
+    created_at: float
+    modified_at: float
+    spell_count: int
+    library: 'RotationLibrary' = field(repr=False, compare=False, default=None)
+
+    def load(self, lazy: bool = False) -> Rotation:
+        """Load the full rotation"""
+        return self.library.load(self.id, lazy)
+
+class RotationLibrary:
+    """
+    Persistent rotation store backed by SQLite (WAL mode)
+    Rotations are saved as rows in metadata, spell and tag tables and are
+    searched through indexes and an FTS5 index without loading their spells.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.has_fts = self._create_schema()
+
+    def _create_schema(self) -> bool:
+        """Create tables and indexes; returns whether full-text search is available"""
+        with self.connection:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise ValueError(f"Library {self.path} was written by a newer version ({version})")
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        try:
+            with self.connection:
+                self.connection.executescript(_FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; text search falls back to LIKE
+            return False
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'RotationLibrary':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def save(self, rotation: Rotation, rotation_id: Optional[int] = None) -> int:
+        """Save a rotation (replacing rotation_id if given) and return its library id"""
+        with self.connection:
+            return self._write(rotation, rotation_id)
+
+    def save_all(self, rotations: Iterable[Rotation]) -> List[int]:
+        """Save several new rotations in one transaction"""
+        with self.connection:
+            return [self._write(rotation, None) for rotation in rotations]
+
+    def _write(self, rotation: Rotation, rotation_id: Optional[int]) -> int:
+        metadata = rotation.metadata
+        spells = list(rotation.spells)
+        # Text columns are NOT NULL; XML imports read empty elements as None
+        row = (metadata.name or "", metadata.class_name, metadata.spec_name, rotation.spec_id,
+               metadata.author or "", metadata.version or "", metadata.description or "",
+               metadata.created_at, metadata.modified_at, len(spells))
+        cursor = self.connection.cursor()
+        if rotation_id is not None and self._exists(rotation_id):
+            cursor.execute(
+                "UPDATE rotations SET name = ?, class_name = ?, spec_name = ?, spec_id = ?, "
+                "author = ?, version = ?, description = ?, created_at = ?, modified_at = ?, "
+                "spell_count = ? WHERE id = ?", row + (rotation_id,))
+            cursor.execute("DELETE FROM spells WHERE rotation_id = ?", (rotation_id,))
+            cursor.execute("DELETE FROM tags WHERE rotation_id = ?", (rotation_id,))
+            if self.has_fts:
+                cursor.execute("DELETE FROM rotation_search WHERE rowid = ?", (rotation_id,))
+        else:
+            cursor.execute(
+                "INSERT INTO rotations (name, class_name, spec_name, spec_id, author, version, "
+                "description, created_at, modified_at, spell_count, id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row + (rotation_id,))
+            rotation_id = cursor.lastrowid
+
+        cursor.executemany(
+            "INSERT INTO spells (rotation_id, priority, name, condition, enabled, notes) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(rotation_id, spell.priority, spell.name, spell.condition or "", int(spell.enabled),
+              spell.notes or "") for spell in spells])
+        cursor.executemany(
+            "INSERT INTO tags (rotation_id, position, tag) VALUES (?, ?, ?)",
+            [(rotation_id, position, tag or "") for position, tag in enumerate(metadata.tags)])
+        if self.has_fts:
+            cursor.execute(
+                "INSERT INTO rotation_search (rowid, name, description, spells, conditions, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (rotation_id, metadata.name or "", metadata.description or "",
+                 " ".join(spell.name for spell in spells),
+                 " ".join(spell.condition or "" for spell in spells),
+                 " ".join(spell.notes for spell in spells if spell.notes)))
+        return rotation_id
+
+    def _exists(self, rotation_id: int) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM rotations WHERE id = ?", (rotation_id,)).fetchone() is not None
+
+    def load(self, rotation_id: int, lazy: bool = False) -> Rotation:
+        """Load a rotation by library id; a lazy rotation reads its spells on first use"""
+        row = self.connection.execute(
+            "SELECT name, class_name, spec_name, author, version, description, created_at, "
+            "modified_at FROM rotations WHERE id = ?", (rotation_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"No rotation with id {rotation_id} in library")
+        tags = [tag for tag, in self.connection.execute(
+            "SELECT tag FROM tags WHERE rotation_id = ? ORDER BY position", (rotation_id,))]
+
+        metadata = RotationMetadata(*row, tags=tags)
+        if lazy:
+            # Spells were validated when saved
+            return LazyRotation(metadata, lambda: self._load_spells(rotation_id), validate=False)
+        rotation = Rotation(row[1], row[2])
+        rotation.metadata = metadata
+        rotation.spells = self._load_spells(rotation_id)
+        return rotation
+
+    def _load_spells(self, rotation_id: int) -> List[SpellEntry]:
+        return [
+            SpellEntry(name=name, condition=condition, priority=priority,
+                       enabled=bool(enabled), notes=notes)
+            for priority, name, condition, enabled, notes in self.connection.execute(
+                "SELECT priority, name, condition, enabled, notes FROM spells "
+                "WHERE rotation_id = ? ORDER BY priority", (rotation_id,))
+        ]
+
+    def delete(self, rotation_id: int) -> bool:
+        """Delete a rotation; returns False if it was not in the library"""
+        with self.connection:
+            if self.has_fts:
+                self.connection.execute("DELETE FROM rotation_search WHERE rowid = ?", (rotation_id,))
+            cursor = self.connection.execute("DELETE FROM rotations WHERE id = ?", (rotation_id,))
+        return cursor.rowcount > 0
+
+    def _where(self, class_name: Optional[str], spec_name: Optional[str], tag: Optional[str],
+               author: Optional[str], text: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if class_name:
+            clauses.append("r.class_name = ?")
+            params.append(class_name)
+        if spec_name:
+            clauses.append("r.spec_name = ?")
+            params.append(spec_name)
+        if author is not None:
+            clauses.append("r.author = ?")
+            params.append(author)
+        if tag:
+            clauses.append("r.id IN (SELECT rotation_id FROM tags WHERE tag = ?)")
+            params.append(tag)
+        if text and text.strip():
+            if self.has_fts:
+                clauses.append("r.id IN (SELECT rowid FROM rotation_search WHERE rotation_search MATCH ?)")
+                params.append(self._match_expression(text))
+            else:
+                clauses.append("(r.name LIKE ? OR r.description LIKE ?)")
+                params.extend([f"%{text.strip()}%"] * 2)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def _match_expression(text: str) -> str:
+        """Quote each search word as a prefix term so user input is never FTS syntax"""
+        return " ".join('"{}"*'.format(word.replace('"', '""')) for word in text.split())
+
+    def query(self, class_name: Optional[str] = None, spec_name: Optional[str] = None,
+              tag: Optional[str] = None, author: Optional[str] = None, text: Optional[str] = None,
+              order: str = "modified", limit: int = 50, offset: int = 0) -> List[LibraryEntry]:
+        """One page of rotation summaries matching the filters"""
+        if order not in _SORT_COLUMNS:
+            raise ValueError(f"Unknown sort order: {order}")
+        where, params = self._where(class_name, spec_name, tag, author, text)
+        rows = self.connection.execute(
+            "SELECT r.id, r.name, r.class_name, r.spec_name, r.author, r.version, r.description, "
+            f"r.created_at, r.modified_at, r.spell_count FROM rotations r{where} "
+            f"ORDER BY {_SORT_COLUMNS[order]}, r.id LIMIT ? OFFSET ?",
+            params + [limit, offset])
+        return [LibraryEntry(*row, library=self) for row in rows]
+
+    def count(self, class_name: Optional[str] = None, spec_name: Optional[str] = None,
+              tag: Optional[str] = None, author: Optional[str] = None,
+              text: Optional[str] = None) -> int:
+        """Number of rotations matching the filters"""
+        where, params = self._where(class_name, spec_name, tag, author, text)
+        return self.connection.execute(f"SELECT COUNT(*) FROM rotations r{where}", params).fetchone()[0]
+
+    def get_tags(self) -> Dict[str, int]:
+        """Tags in use with their rotation counts"""
+        return dict(self.connection.execute(
+            "SELECT tag, COUNT(DISTINCT rotation_id) FROM tags GROUP BY tag ORDER BY tag"))
+
+    def get_classes(self) -> Dict[str, int]:
+        """Classes in the library with their rotation counts"""
+        return dict(self.connection.execute(
+            "SELECT class_name, COUNT(*) FROM rotations GROUP BY class_name ORDER BY class_name"))
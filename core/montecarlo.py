@@ -0,0 +1,280 @@
+from typing import Dict, Optional, Tuple, Any, Callable, Iterator, Type
+from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import random
+from .rotation import Rotation
+from .simulator import Simulator, GameState, SpellProfile, SimulationResult
+
+# Iterations per shard; shards are the unit of seeding, so results do not
+# depend on how many workers run them
+DEFAULT_CHUNK_SIZE = 1000
+
+@dataclass
+class Encounter:
+    """Randomized encounter parameters for each fight iteration"""
+    duration: float = 300.0
+    duration_jitter: float = 0.1            # +/- fraction of duration
+    enemies: Tuple[int, ...] = (1,)         # area.enemies drawn uniformly per fight
+
+class RunningStats:
+    """Streaming mean/variance/min/max (Welford) that can be merged"""
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: 'RunningStats') -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+class LogHistogram:
+    """
+    Mergeable histogram with logarithmic buckets
+    Percentiles are accurate to within the given relative precision and
+    memory depends only on the value range, not on the number of samples
+    """
+
+    __slots__ = ("precision", "_log_base", "buckets", "zeros", "count")
+
+    def __init__(self, precision: float = 0.005):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        bucket = math.floor(math.log(value) / self._log_base)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: 'LogHistogram') -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms with different precision")
+        self.count += other.count
+        self.zeros += other.zeros
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def percentile(self, p: float) -> float:
+        """Value at percentile p (0-100)"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # Geometric midpoint of the bucket
+                return math.exp((bucket + 0.5) * self._log_base)
+        return math.exp((max(self.buckets) + 0.5) * self._log_base)
+
+class FightAccumulator:
+    """Constant-memory summary of many fight iterations"""
+
+    def __init__(self):
+        self.damage = RunningStats()
+        self.dps = RunningStats()
+        self.idle_time = RunningStats()
+        self.histogram = LogHistogram()
+        self.score = RunningStats()     # objective per fight, when one is given
+        self.casts: Dict[str, int] = {}
+
+    @property
+    def iterations(self) -> int:
+        return self.damage.count
+
+    def add(self, damage: float, duration: float, idle_time: float, casts: Dict[str, int],
+            score: Optional[float] = None) -> None:
+        self.damage.add(damage)
+        if score is not None:
+            self.score.add(score)
+        self.dps.add(damage / duration if duration else 0.0)
+        self.idle_time.add(idle_time)
+        self.histogram.add(damage)
+        for name, count in casts.items():
+            self.casts[name] = self.casts.get(name, 0) + count
+
+    def merge(self, other: 'FightAccumulator') -> None:
+        self.damage.merge(other.damage)
+        self.dps.merge(other.dps)
+        self.idle_time.merge(other.idle_time)
+        self.histogram.merge(other.histogram)
+        self.score.merge(other.score)
+        for name, count in other.casts.items():
+            self.casts[name] = self.casts.get(name, 0) + count
+
+@dataclass
+class MonteCarloResult:
+    """Summary of a Monte Carlo simulation"""
+    iterations: int
+    mean_damage: float
+    stddev_damage: float
+    min_damage: float
+    max_damage: float
+    mean_dps: float
+    mean_idle_time: float
+    percentiles: Dict[int, float]
+    casts_per_fight: Dict[str, float] = field(default_factory=dict)
+    mean_score: float = 0.0     # mean objective per fight (mean damage without one)
+
+# Per-process simulator, built once by the pool initializer
+_worker_simulator: Optional[Simulator] = None
+
+def _init_worker(rotation_data: Dict[str, Any], state: Optional[GameState],
+                 profiles: Optional[Dict[str, SpellProfile]], tick: float,
+                 simulator_class: Type[Simulator] = Simulator) -> None:
+    """Build the simulator once per worker process"""
+    global _worker_simulator
+    rotation = Rotation.from_dict(rotation_data)
+    _worker_simulator = simulator_class(rotation, state=state, profiles=profiles, tick=tick)
+
+def _chunk_seed(seed: int, chunk: int) -> str:
+    """Deterministic, independent seed for a shard"""
+    return f"{seed}:{chunk}"
+
+def _run_chunk(seed: int, chunk: int, iterations: int, encounter: Encounter,
+               simulator: Optional[Simulator] = None,
+               objective: Optional[Callable[[SimulationResult], float]] = None) -> FightAccumulator:
+    """Run one shard of fight iterations with its own seed stream"""
+    simulator = simulator or _worker_simulator
+    rng = random.Random(_chunk_seed(seed, chunk))
+    base_enemies = simulator.state.area_enemies
+    accumulator = FightAccumulator()
+    try:
+        for _ in range(iterations):
+            duration = encounter.duration * (1.0 + rng.uniform(-encounter.duration_jitter,
+                                                               encounter.duration_jitter))
+            simulator.state.area_enemies = rng.choice(encounter.enemies)
+            result = simulator.run(duration, rng=rng)
+            accumulator.add(result.damage, result.duration, result.idle_time, result.casts,
+                            objective(result) if objective is not None else None)
+    finally:
+        simulator.state.area_enemies = base_enemies
+    return accumulator
+
+class MonteCarloSimulator:
+    """
+    Runs many randomized fights of a rotation across a process pool
+    An objective scores each fight for result.mean_score; with more than one
+    worker it is sent to the worker processes, so it must be picklable (a
+    module-level function, not a lambda).
+    """
+
+    def __init__(self, rotation: Rotation, encounter: Optional[Encounter] = None,
+                 state: Optional[GameState] = None,
+                 profiles: Optional[Dict[str, SpellProfile]] = None,
+                 tick: float = 0.1, seed: int = 0,
+                 workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 simulator_class: Type[Simulator] = Simulator,
+                 objective: Optional[Callable[[SimulationResult], float]] = None):
+        self.rotation = rotation
+        self.encounter = encounter or Encounter()
+        # None lets each simulator start from the class's resource pools
+        self.state = state
+        self.profiles = profiles or {}
+        self.tick = tick
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # Simulator or EventSimulator
+        self.simulator_class = simulator_class
+        self.objective = objective
+
+    def _chunks(self, iterations: int) -> Iterator[Tuple[int, int]]:
+        """Yield (chunk index, iteration count) shards"""
+        chunk = 0
+        remaining = iterations
+        while remaining > 0:
+            count = min(self.chunk_size, remaining)
+            yield chunk, count
+            chunk += 1
+            remaining -= count
+
+    def run(self, iterations: int = 10000) -> MonteCarloResult:
+        """Run the given number of fight iterations"""
+        total = FightAccumulator()
+
+        if self.workers <= 1:
+            simulator = self.simulator_class(self.rotation, state=self.state,
+                                             profiles=self.profiles, tick=self.tick)
+            for chunk, count in self._chunks(iterations):
+                total.merge(_run_chunk(self.seed, chunk, count, self.encounter, simulator,
+                                       self.objective))
+            return self._summarize(total)
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.rotation.to_dict(), self.state, self.profiles, self.tick,
+                      self.simulator_class)
+        ) as executor:
+            # Keep a bounded window of shards in flight and merge them in order,
+            # so memory stays constant and results are reproducible
+            pending = deque()
+            window = self.workers * 2
+            for chunk, count in self._chunks(iterations):
+                pending.append(executor.submit(_run_chunk, self.seed, chunk, count, self.encounter,
+                                               None, self.objective))
+                if len(pending) >= window:
+                    total.merge(pending.popleft().result())
+            while pending:
+                total.merge(pending.popleft().result())
+
+        return self._summarize(total)
+
+    @staticmethod
+    def _summarize(total: FightAccumulator) -> MonteCarloResult:
+        """Turn accumulated statistics into a result"""
+        iterations = total.iterations
+        return MonteCarloResult(
+            iterations=iterations,
+            mean_damage=total.damage.mean,
+            stddev_damage=total.damage.stddev,
+            min_damage=total.damage.minimum if iterations else 0.0,
+            max_damage=total.damage.maximum if iterations else 0.0,
+            mean_dps=total.dps.mean,
+            mean_idle_time=total.idle_time.mean,
+            percentiles={p: total.histogram.percentile(p) for p in (5, 25, 50, 75, 95, 99)},
+            casts_per_fight={name: count / iterations for name, count in total.casts.items()}
+            if iterations else {},
+            mean_score=total.score.mean if total.score.count else total.damage.mean
+        )
@@ -0,0 +1,216 @@
+from typing import Dict, List, Optional, Tuple, Any, Callable, Type
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import os
+import pickle
+import random
+from .rotation import Rotation
+from .simulator import Simulator, GameState, SpellProfile, SimulationResult
+from .montecarlo import MonteCarloSimulator, Encounter
+
+def damage_objective(result: SimulationResult) -> float:
+    """Default objective: total damage of a fight"""
+    return result.damage
+
+@dataclass
+class OptimizationStep:
+    """One round of the search"""
+    round: int
+    evaluations: int
+    best_score: float
+    move: str = ""
+
+@dataclass
+class OptimizationResult:
+    """Outcome of a rotation optimization"""
+    rotation: Rotation
+    score: float
+    initial_score: float
+    evaluations: int
+    cache_hits: int
+    trace: List[OptimizationStep] = field(default_factory=list)
+
+@dataclass
+class _EvaluationSettings:
+    """Everything a worker needs to score a candidate"""
+    state: Optional[GameState]
+    profiles: Optional[Dict[str, SpellProfile]]
+    duration: float
+    tick: float
+    objective: Callable[[SimulationResult], float]
+    iterations: int
+    encounter: Optional[Encounter]
+    seed: int
+    simulator_class: Type[Simulator] = Simulator
+
+# Per-process evaluation settings, set by the pool initializer
+_worker_settings: Optional[_EvaluationSettings] = None
+
+def _init_worker(settings: _EvaluationSettings) -> None:
+    global _worker_settings
+    _worker_settings = settings
+
+def _score(rotation_data: Dict[str, Any],
+           settings: Optional[_EvaluationSettings] = None) -> float:
+    """Score one candidate rotation"""
+    settings = settings or _worker_settings
+    rotation = Rotation.from_dict(rotation_data)
+    if settings.iterations > 0:
+        # Same seed for every candidate so scores are comparable; without an
+        # encounter the fights last the configured duration
+        result = MonteCarloSimulator(
+            rotation, encounter=settings.encounter or Encounter(duration=settings.duration),
+            state=settings.state, profiles=settings.profiles, tick=settings.tick,
+            seed=settings.seed, workers=1, simulator_class=settings.simulator_class,
+            objective=settings.objective
+        ).run(settings.iterations)
+        return result.mean_score
+    simulator = settings.simulator_class(rotation, state=settings.state,
+                                         profiles=settings.profiles, tick=settings.tick)
+    return settings.objective(simulator.run(settings.duration))
+
+class RotationOptimizer:
+    """
+    Searches spell priority orderings (and optionally enabled flags) of a
+    rotation for the best simulated score using local search
+    With iterations > 0 a candidate scores the mean objective over that many
+    Monte Carlo fights. With more than one worker the objective is sent to the
+    worker processes, so it must be picklable (a module-level function).
+    """
+
+    def __init__(self, rotation: Rotation, state: Optional[GameState] = None,
+                 profiles: Optional[Dict[str, SpellProfile]] = None,
+                 duration: float = 300.0, tick: float = 0.1,
+                 objective: Callable[[SimulationResult], float] = damage_objective,
+                 iterations: int = 0, encounter: Optional[Encounter] = None,
+                 allow_toggle: bool = False, workers: Optional[int] = None,
+                 neighborhood: int = 64, restarts: int = 2, max_rounds: int = 200,
+                 seed: int = 0, simulator_class: Type[Simulator] = Simulator):
+        self.rotation = rotation
+        self.settings = _EvaluationSettings(
+            state=state,
+            profiles=profiles,
+            duration=duration,
+            tick=tick,
+            objective=objective,
+            iterations=iterations,
+            encounter=encounter,
+            seed=seed,
+            simulator_class=simulator_class
+        )
+        self.allow_toggle = allow_toggle
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers > 1:
+            try:
+                pickle.dumps(objective)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                raise ValueError(f"Objective must be picklable to run with {self.workers} workers: {e}")
+        self.neighborhood = neighborhood
+        self.restarts = restarts
+        self.max_rounds = max_rounds
+        self.rng = random.Random(seed)
+        self.memo: Dict[str, float] = {}
+        self.cache_hits = 0
+
+    def _moves(self, size: int) -> List[Tuple[str, int, int]]:
+        """Candidate moves: ('move', from, to) by priority, or ('toggle', priority, 0)"""
+        moves = [('move', a, b) for a in range(1, size + 1)
+                 for b in range(1, size + 1) if a != b]
+        if self.allow_toggle:
+            moves.extend(('toggle', p, 0) for p in range(1, size + 1))
+        if len(moves) > self.neighborhood:
+            moves = self.rng.sample(moves, self.neighborhood)
+        return moves
+
+    @staticmethod
+    def _apply(rotation: Rotation, move: Tuple[str, int, int]) -> Rotation:
+        """Return a copy of the rotation with the move applied"""
+        candidate = copy.deepcopy(rotation)
+        kind, a, b = move
+        if kind == 'move':
+            candidate.move_spell(a, b)
+        else:
+            spell = candidate.spells[a - 1]
+            candidate.update_spell(a, enabled=not spell.enabled)
+        return candidate
+
+    def _evaluate(self, candidates: List[Rotation], executor) -> List[float]:
+        """Score candidates, using the memo and fanning the rest out to workers"""
+        fingerprints = [c.fingerprint() for c in candidates]
+        todo: Dict[str, Rotation] = {}
+        for fingerprint, candidate in zip(fingerprints, candidates):
+            if fingerprint in self.memo or fingerprint in todo:
+                self.cache_hits += 1
+            else:
+                todo[fingerprint] = candidate
+
+        if todo:
+            payloads = [c.to_dict() for c in todo.values()]
+            if executor is None:
+                scores = [_score(p, self.settings) for p in payloads]
+            else:
+                chunksize = max(1, len(payloads) // (self.workers * 4))
+                scores = list(executor.map(_score, payloads, chunksize=chunksize))
+            self.memo.update(zip(todo.keys(), scores))
+
+        return [self.memo[f] for f in fingerprints]
+
+    def optimize(self) -> OptimizationResult:
+        """Run the search and return the best rotation found"""
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers,
+                                           initializer=_init_worker,
+                                           initargs=(self.settings,))
+        try:
+            return self._search(executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _search(self, executor) -> OptimizationResult:
+        current = copy.deepcopy(self.rotation)
+        current_score = self._evaluate([current], executor)[0]
+        initial_score = current_score
+        best, best_score = current, current_score
+        trace = [OptimizationStep(0, len(self.memo), best_score, "initial")]
+        restarts_left = self.restarts
+        size = len(current.spells)
+
+        for round_number in range(1, self.max_rounds + 1):
+            if size < 2:
+                break
+            moves = self._moves(size)
+            candidates = [self._apply(current, move) for move in moves]
+            scores = self._evaluate(candidates, executor)
+            top = max(range(len(scores)), key=scores.__getitem__)
+
+            if scores[top] > current_score:
+                current, current_score = candidates[top], scores[top]
+                kind, a, b = moves[top]
+                description = f"move {a}->{b}" if kind == 'move' else f"toggle {a}"
+                if current_score > best_score:
+                    best, best_score = current, current_score
+            elif restarts_left > 0:
+                # Local optimum: kick the best ordering with a few random moves
+                restarts_left -= 1
+                current = best
+                kicks = self._moves(size)
+                for move in self.rng.sample(kicks, min(3, len(kicks))):
+                    current = self._apply(current, move)
+                current_score = self._evaluate([current], executor)[0]
+                description = "restart"
+            else:
+                trace.append(OptimizationStep(round_number, len(self.memo), best_score, "converged"))
+                break
+            trace.append(OptimizationStep(round_number, len(self.memo), best_score, description))
+
+        return OptimizationResult(
+            rotation=best,
+            score=best_score,
+            initial_score=initial_score,
+            evaluations=len(self.memo),
+            cache_hits=self.cache_hits,
+            trace=trace
+        )
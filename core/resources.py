@@ -0,0 +1,372 @@
+from typing import Dict, List, Optional, Tuple, Type
+from array import array
+import spell_data
+
+# Every resource pool the simulator tracks, in slot order
+RESOURCES = (
+    "mana", "rage", "energy", "focus", "runicpower", "holypower", "chi",
+    "soulshards", "eclipse", "combopoints", "runes", "embers", "demonicfury",
+    "mushrooms",
+)
+RESOURCE_SLOTS = {name: slot for slot, name in enumerate(RESOURCES)}
+
+# Delta meaning "spend everything in the pool" (finishers); requires at least 1
+SPEND_ALL = float('-inf')
+
+MAX_RUNES = 6
+
+# Condition paths stored directly in a resource slot (settable on a GameState)
+RESOURCE_PATHS = {f"player.{name}": RESOURCE_SLOTS[name] for name in RESOURCES[:10]}
+RESOURCE_PATHS.update({
+    "runes.count": RESOURCE_SLOTS["runes"],
+    "runes.frac": RESOURCE_SLOTS["runes"],
+    "embers": RESOURCE_SLOTS["embers"],
+    "demonicfury": RESOURCE_SLOTS["demonicfury"],
+    "eclipse": RESOURCE_SLOTS["eclipse"],
+    "mushrooms": RESOURCE_SLOTS["mushrooms"],
+})
+
+def default_resources() -> array:
+    """Resource slots of a fresh GameState: full mana, everything else empty"""
+    resources = array('d', [0.0] * len(RESOURCES))
+    resources[RESOURCE_SLOTS["mana"]] = 100.0
+    return resources
+
+def resource_source(path: str, resources: str = "s.resources") -> Optional[str]:
+    """
+    Python expression reading a resource condition from the slot array named
+    by resources, or None when path is not a resource condition
+    """
+    if path in ("runes.count", "embers"):
+        return f"({resources}[{RESOURCE_PATHS[path]}] // 1)"
+    if path == "runes.depleted":
+        return f"({MAX_RUNES} - {resources}[{RESOURCE_SLOTS['runes']}] // 1)"
+    eclipse = f"{resources}[{RESOURCE_SLOTS['eclipse']}]"
+    if path == "solar":
+        return f"({eclipse} if {eclipse} > 0 else 0.0)"
+    if path == "lunar":
+        return f"(-{eclipse} if {eclipse} < 0 else 0.0)"
+    if path == "balance.sun":
+        return f"({eclipse} >= 100)"
+    if path == "balance.moon":
+        return f"({eclipse} <= -100)"
+    if path in RESOURCE_PATHS:
+        return f"{resources}[{RESOURCE_PATHS[path]}]"
+    return None
+
+class CompiledResources:
+    """
+    A resource model resolved against one rotation's spell slots
+    Costs, effects and regeneration are flat tuples of slot indices, so
+    applying them never touches a dict
+    """
+
+    def __init__(self, costs: List[Tuple[Tuple[int, float], ...]],
+                 effects: List[Tuple[Tuple[int, float, float, float], ...]],
+                 regen: Tuple[Tuple[int, float, float], ...]):
+        # Per spell: (slot, amount) that must be available to cast it
+        self.costs = costs
+        # Per spell: (slot, delta, minimum, maximum) applied when it is cast
+        self.effects = effects
+        # (slot, amount per second, maximum)
+        self.regen = regen
+
+    def cost_source(self, index: int, resources: str = "s.resources") -> str:
+        """Python expression that is true when spell index is affordable"""
+        checks = [f"{resources}[{slot}] >= {amount!r}" for slot, amount in self.costs[index]]
+        return " and ".join(checks)
+
+    def apply(self, resources: array, index: int) -> None:
+        """Spend and generate resources for a cast of spell index"""
+        for slot, delta, minimum, maximum in self.effects[index]:
+            if delta == SPEND_ALL:
+                resources[slot] = minimum
+                continue
+            value = resources[slot] + delta
+            resources[slot] = maximum if value > maximum else minimum if value < minimum else value
+
+    def regenerate(self, resources: array, elapsed: float) -> None:
+        """Passive regeneration over elapsed seconds"""
+        for slot, rate, maximum in self.regen:
+            value = resources[slot] + rate * elapsed
+            resources[slot] = maximum if value > maximum else value
+
+class ResourceModel:
+    """
+    Resource pools and per-spell generate/spend rules for one class
+    Subclasses fill in the class attributes and register themselves with
+    @register_resource_model; classes without a model only use mana
+    """
+
+    # Resource name -> (starting value, minimum, maximum)
+    pools: Dict[str, Tuple[float, float, float]] = {"mana": (100.0, 0.0, 100.0)}
+    # Resource name -> passive regeneration per second
+    regen: Dict[str, float] = {"mana": 1.0}
+    # Spell name -> {resource name: delta}; negative deltas are costs
+    spells: Dict[str, Dict[str, float]] = {}
+
+    def initialize(self, resources: array) -> None:
+        """Set each pool the class uses to its starting value"""
+        for name, (start, _, _) in self.pools.items():
+            resources[RESOURCE_SLOTS[name]] = start
+
+    def compile(self, spell_names: List[str]) -> CompiledResources:
+        """Resolve the rules for the given spells (in simulator slot order)"""
+        costs = []
+        effects = []
+        for name in spell_names:
+            spell_costs = []
+            spell_effects = []
+            for resource, delta in self.spells.get(name, {}).items():
+                slot = self._slot(resource)
+                _, minimum, maximum = self.pools[resource]
+                if delta == SPEND_ALL:
+                    spell_costs.append((slot, 1.0))
+                elif delta < 0 and minimum >= 0:
+                    spell_costs.append((slot, -delta))
+                spell_effects.append((slot, delta, minimum, maximum))
+            costs.append(tuple(spell_costs))
+            effects.append(tuple(spell_effects))
+        regen = tuple((self._slot(name), rate, self.pools[name][2])
+                      for name, rate in self.regen.items() if rate)
+        return CompiledResources(costs, effects, regen)
+
+    def _slot(self, resource: str) -> int:
+        if resource not in RESOURCE_SLOTS:
+            raise ValueError(f"Unknown resource: {resource}")
+        if resource not in self.pools:
+            raise ValueError(f"{type(self).__name__} has no {resource} pool")
+        return RESOURCE_SLOTS[resource]
+
+RESOURCE_MODELS: Dict[str, Type[ResourceModel]] = {}
+
+def register_resource_model(class_name: str):
+    """Class decorator registering a resource model for a class in SPEC_IDS"""
+    if class_name not in spell_data.SPEC_IDS:
+        raise ValueError(f"Unknown class: {class_name}")
+
+    def decorator(model: Type[ResourceModel]) -> Type[ResourceModel]:
+        RESOURCE_MODELS[class_name] = model
+        return model
+    return decorator
+
+def get_resource_model(class_name: str) -> ResourceModel:
+    """Return the resource model for a class (mana only if none is registered)"""
+    return RESOURCE_MODELS.get(class_name, ResourceModel)()
+
+_MANA = {"mana": (100.0, 0.0, 100.0)}
+
+@register_resource_model("Warrior")
+class WarriorResources(ResourceModel):
+    pools = {"rage": (0.0, 0.0, 100.0)}
+    regen = {"rage": 6.0}           # auto attacks
+    spells = {
+        "Mortal Strike": {"rage": 10},
+        "Bloodthirst": {"rage": 10},
+        "Shield Slam": {"rage": 20},
+        "Revenge": {"rage": 15},
+        "Charge": {"rage": 20},
+        "Battle Shout": {"rage": 20},
+        "Commanding Shout": {"rage": 20},
+        "Overpower": {"rage": -10},
+        "Slam": {"rage": -25},
+        "Execute": {"rage": -30},
+        "Colossus Smash": {"rage": -20},
+        "Wild Strike": {"rage": -30},
+        "Raging Blow": {"rage": -10},
+        "Whirlwind": {"rage": -30},
+        "Thunder Clap": {"rage": -20},
+        "Sweeping Strikes": {"rage": -30},
+        "Hamstring": {"rage": -10},
+        "Shield Block": {"rage": -60},
+        "Shield Barrier": {"rage": -20},
+    }
+
+@register_resource_model("Rogue")
+class RogueResources(ResourceModel):
+    pools = {"energy": (100.0, 0.0, 100.0), "combopoints": (0.0, 0.0, 5.0)}
+    regen = {"energy": 10.0}
+    spells = {
+        "Sinister Strike": {"energy": -40, "combopoints": 1},
+        "Revealing Strike": {"energy": -40, "combopoints": 1},
+        "Mutilate": {"energy": -55, "combopoints": 2},
+        "Dispatch": {"energy": -30, "combopoints": 1},
+        "Backstab": {"energy": -35, "combopoints": 1},
+        "Hemorrhage": {"energy": -30, "combopoints": 1},
+        "Ambush": {"energy": -60, "combopoints": 2},
+        "Garrote": {"energy": -45, "combopoints": 1},
+        "Cheap Shot": {"energy": -40, "combopoints": 2},
+        "Fan of Knives": {"energy": -35, "combopoints": 1},
+        "Premeditation": {"combopoints": 2},
+        "Eviscerate": {"energy": -35, "combopoints": SPEND_ALL},
+        "Envenom": {"energy": -35, "combopoints": SPEND_ALL},
+        "Rupture": {"energy": -25, "combopoints": SPEND_ALL},
+        "Slice and Dice": {"energy": -25, "combopoints": SPEND_ALL},
+        "Crimson Tempest": {"energy": -35, "combopoints": SPEND_ALL},
+        "Recuperate": {"energy": -30, "combopoints": SPEND_ALL},
+        "Kidney Shot": {"energy": -25, "combopoints": SPEND_ALL},
+        "Kick": {"energy": -15},
+        "Feint": {"energy": -20},
+    }
+
+@register_resource_model("Druid")
+class DruidResources(ResourceModel):
+    pools = dict(_MANA, **{
+        "energy": (100.0, 0.0, 100.0),
+        "rage": (0.0, 0.0, 100.0),
+        "combopoints": (0.0, 0.0, 5.0),
+        "eclipse": (0.0, -100.0, 100.0),
+        "mushrooms": (0.0, 0.0, 3.0),
+    })
+    regen = {"mana": 1.0, "energy": 10.0, "rage": 5.0}
+    spells = {
+        "Wrath": {"eclipse": -15},
+        "Starfire": {"eclipse": 20},
+        "Starsurge": {"eclipse": 20},
+        "Wild Mushroom": {"mushrooms": 1},
+        "Wild Mushroom: Detonate": {"mushrooms": SPEND_ALL},
+        "Wild Mushroom: Bloom": {"mushrooms": SPEND_ALL},
+        "Shred": {"energy": -40, "combopoints": 1},
+        "Rake": {"energy": -35, "combopoints": 1},
+        "Tiger's Fury": {"energy": 60},
+        "Rip": {"energy": -30, "combopoints": SPEND_ALL},
+        "Ferocious Bite": {"energy": -25, "combopoints": SPEND_ALL},
+        "Savage Roar": {"energy": -25, "combopoints": SPEND_ALL},
+        "Maim": {"energy": -35, "combopoints": SPEND_ALL},
+        "Mangle": {"rage": 15},
+        "Maul": {"rage": -30},
+        "Savage Defense": {"rage": -60},
+        "Frenzied Regeneration": {"rage": -60},
+        "Innervate": {"mana": 20},
+    }
+
+@register_resource_model("Death Knight")
+class DeathKnightResources(ResourceModel):
+    pools = {"runes": (float(MAX_RUNES), 0.0, float(MAX_RUNES)), "runicpower": (0.0, 0.0, 100.0)}
+    regen = {"runes": 0.3}          # three rune pairs recharging every 10s
+    spells = {
+        "Obliterate": {"runes": -2, "runicpower": 20},
+        "Death Strike": {"runes": -2, "runicpower": 20},
+        "Festering Strike": {"runes": -2, "runicpower": 20},
+        "Howling Blast": {"runes": -1, "runicpower": 10},
+        "Heart Strike": {"runes": -1, "runicpower": 10},
+        "Blood Boil": {"runes": -1, "runicpower": 10},
+        "Scourge Strike": {"runes": -1, "runicpower": 10},
+        "Soul Reaper": {"runes": -1, "runicpower": 10},
+        "Pillar of Frost": {"runes": -1, "runicpower": 10},
+        "Rune Tap": {"runes": -1},
+        "Strangulate": {"runes": -1},
+        "Army of the Dead": {"runes": -3},
+        "Frost Strike": {"runicpower": -25},
+        "Death Coil": {"runicpower": -30},
+        "Horn of Winter": {"runicpower": 10},
+        "Empower Rune Weapon": {"runes": MAX_RUNES, "runicpower": 25},
+    }
+
+@register_resource_model("Paladin")
+class PaladinResources(ResourceModel):
+    pools = dict(_MANA, holypower=(0.0, 0.0, 5.0))
+    spells = {
+        "Crusader Strike": {"holypower": 1},
+        "Hammer of the Righteous": {"holypower": 1},
+        "Judgment": {"holypower": 1},
+        "Hammer of Wrath": {"holypower": 1},
+        "Exorcism": {"holypower": 1},
+        "Holy Shock": {"holypower": 1},
+        "Templar's Verdict": {"holypower": -3},
+        "Shield of the Righteous": {"holypower": -3},
+        "Inquisition": {"holypower": SPEND_ALL},
+        "Word of Glory": {"holypower": SPEND_ALL},
+        "Light of Dawn": {"holypower": SPEND_ALL},
+        "Divine Plea": {"mana": 12},
+    }
+
+@register_resource_model("Monk")
+class MonkResources(ResourceModel):
+    pools = dict(_MANA, energy=(100.0, 0.0, 100.0), chi=(0.0, 0.0, 4.0))
+    regen = {"mana": 1.0, "energy": 10.0}
+    spells = {
+        "Expel Harm": {"energy": -40, "chi": 1},
+        "Keg Smash": {"energy": -40, "chi": 2},
+        "Spinning Crane Kick": {"energy": -40, "chi": 1},
+        "Rushing Jade Wind": {"energy": -40, "chi": 1},
+        "Paralysis": {"energy": -20},
+        "Energizing Brew": {"energy": 60},
+        "Tiger Palm": {"chi": -1},
+        "Blackout Kick": {"chi": -2},
+        "Rising Sun Kick": {"chi": -2},
+        "Fists of Fury": {"chi": -3},
+        "Touch of Death": {"chi": -3},
+        "Breath of Fire": {"chi": -2},
+        "Guard": {"chi": -2},
+        "Purifying Brew": {"chi": -1},
+        "Enveloping Mist": {"chi": -3},
+        "Surging Mist": {"chi": 1},
+    }
+
+@register_resource_model("Hunter")
+class HunterResources(ResourceModel):
+    pools = {"focus": (100.0, 0.0, 100.0)}
+    regen = {"focus": 6.0}
+    spells = {
+        "Steady Shot": {"focus": 14},
+        "Cobra Shot": {"focus": 14},
+        "Arcane Shot": {"focus": -30},
+        "Kill Command": {"focus": -40},
+        "Multi-Shot": {"focus": -40},
+        "Chimera Shot": {"focus": -45},
+        "Aimed Shot": {"focus": -50},
+        "Explosive Shot": {"focus": -15},
+        "Black Arrow": {"focus": -35},
+        "Serpent Sting": {"focus": -15},
+        "Murder of Crows": {"focus": -60},
+    }
+
+@register_resource_model("Warlock")
+class WarlockResources(ResourceModel):
+    pools = dict(_MANA, soulshards=(3.0, 0.0, 4.0), embers=(1.0, 0.0, 4.0),
+                 demonicfury=(200.0, 0.0, 1000.0))
+    spells = {
+        "Life Tap": {"mana": 15},
+        "Haunt": {"soulshards": -1},
+        "Soulburn": {"soulshards": -1},
+        "Drain Soul": {"soulshards": 1},
+        "Incinerate": {"embers": 0.1},
+        "Immolate": {"embers": 0.1},
+        "Conflagrate": {"embers": 0.1},
+        "Chaos Bolt": {"embers": -1},
+        "Shadowburn": {"embers": -1},
+        "Shadow Bolt": {"demonicfury": 25},
+        "Soul Fire": {"demonicfury": 30},
+        "Touch of Chaos": {"demonicfury": -40},
+        "Doom": {"demonicfury": -60},
+        "Chaos Wave": {"demonicfury": -80},
+    }
+
+@register_resource_model("Mage")
+class MageResources(ResourceModel):
+    spells = {
+        "Arcane Blast": {"mana": -1.5},
+        "Arcane Explosion": {"mana": -3},
+        "Flamestrike": {"mana": -3},
+        "Blizzard": {"mana": -3},
+        "Evocation": {"mana": 60},
+    }
+
+@register_resource_model("Priest")
+class PriestResources(ResourceModel):
+    spells = {
+        "Flash Heal": {"mana": -3},
+        "Greater Heal": {"mana": -2},
+        "Prayer of Healing": {"mana": -4},
+        "Shadowfiend": {"mana": 30},
+    }
+
+@register_resource_model("Shaman")
+class ShamanResources(ResourceModel):
+    spells = {
+        "Chain Heal": {"mana": -3},
+        "Healing Surge": {"mana": -4},
+        "Healing Rain": {"mana": -4},
+        "Chain Lightning": {"mana": -2},
+    }
@@ -1,11 +1,22 @@
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, BinaryIO, Callable, Iterable, NamedTuple, Sequence, Tuple, Union
+from dataclasses import dataclass, asdict, replace
+from functools import partial
+import codecs
+import hashlib
 import json
+import os
+import re
+import sys
 import time
 from conditions import ConditionValidator
 import spell_data
+from .spell_list import SpellList
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    """sys.intern that passes None through (XML imports read empty elements as None)"""
+    return sys.intern(value) if value is not None else None
+
+@dataclass(slots=True)
 class SpellEntry:
     """Represents a spell in the rotation"""
     name: str
@@ -15,8 +26,54 @@ class SpellEntry:
     notes: str = ""
     id: Optional[int] = None
 
-@dataclass
-class RotationMetadata:
+    def __post_init__(self):
+        # Spell names and conditions repeat across every rotation; share one copy
+        self.name = _intern(self.name)
+        self.condition = _intern(self.condition)
+
+    def replace(self, **changes) -> 'SpellEntry':
+        """Copy of this entry with some fields changed"""
+        return replace(self, **changes)
+
+class _TagList(list):
+    """Tag list that reports in-place changes to the metadata holding it"""
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, tags: Iterable[Optional[str]] = (), owner: Optional['RotationMetadata'] = None):
+        super().__init__(_intern(tag) for tag in tags)
+        self._owner = owner
+
+    def __reduce__(self):
+        # Pickles and copies are plain lists; the metadata re-wraps them
+        return (list, (list(self),))
+
+def _tag_mutator(name: str) -> Callable:
+    method = getattr(list, name)
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self._owner is not None:
+            self._owner._notify('tags')
+        return result
+    mutate.__name__ = name
+    return mutate
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_TagList, _name, _tag_mutator(_name))
+del _name
+
+class _Observable:
+    # Observers live outside the dataclass fields, so they are never compared or serialized
+    __slots__ = ("_observers",)
+
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls)
+        object.__setattr__(self, '_observers', ())
+        return self
+
+@dataclass(slots=True)
+class RotationMetadata(_Observable):
     """Metadata for a rotation"""
     name: str
     class_name: str
@@ -28,8 +85,52 @@ class RotationMetadata:
     modified_at: float
     tags: List[str]
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # The constructor, importers and editors all assign through here
+        if name in _INTERNED_METADATA:
+            value = _intern(value)
+        elif name == 'tags':
+            value = _TagList(value if value is not None else (), self)
+        object.__setattr__(self, name, value)
+        self._notify(name)
+
+    def add_observer(self, observer: Callable[['RotationMetadata', str], None]) -> None:
+        """
+        Call observer(metadata, field) after each assignment to a field and
+        after each in-place change to tags (reported as the 'tags' field)
+        Observers are not pickled or copied with the metadata.
+        """
+        object.__setattr__(self, '_observers', self._observers + (observer,))
+
+    def remove_observer(self, observer: Callable[['RotationMetadata', str], None]) -> None:
+        object.__setattr__(self, '_observers', tuple(o for o in self._observers if o != observer))
+
+    def _notify(self, field: str) -> None:
+        for observer in self._observers:
+            observer(self, field)
+
+    def __getstate__(self):
+        return (None, {name: getattr(self, name) for name in self.__dataclass_fields__})
+
+_INTERNED_METADATA = frozenset(('class_name', 'spec_name', 'author', 'version'))
+# Fields RotationManager indexes rotations by
+_INDEXED_METADATA = frozenset(('class_name', 'spec_name', 'author', 'tags'))
+
+# A spell's priority is its position; move_spell changes it
+_UPDATABLE_FIELDS = frozenset(SpellEntry.__slots__) - {'priority'}
+
+class RotationChange(NamedTuple):
+    """A change to a rotation's spell list; indexes are 0-based positions in spells"""
+    kind: str               # inserted, removed, moved, updated or reset
+    index: int = -1
+    new_index: int = -1     # where a moved spell ended up
+    spell: Optional[SpellEntry] = None     # the inserted or updated spell
+
 class Rotation:
     """Main rotation class"""
+
+    # Callables notified as observer(rotation, change); see add_observer
+    _observers: Tuple[Callable[['Rotation', RotationChange], None], ...] = ()
     
     def __init__(self, class_name: str, spec_name: str):
         self.metadata = RotationMetadata(
@@ -43,34 +144,77 @@ class Rotation:
             modified_at=time.time(),
             tags=[]
         )
-        self.spells: List[SpellEntry] = []
+        self.spells = SpellList()
         self.spec_id = spell_data.get_spec_id(class_name, spec_name)
         self._validate_spec()
 
+    @property
+    def spells(self) -> SpellList:
+        """Spells in priority order; a spell's priority is its 1-based position"""
+        return self._spells
+
+    @spells.setter
+    def spells(self, spells: Iterable[SpellEntry]) -> None:
+        # A SpellList belongs to another rotation and stamps priorities onto its
+        # entries, so take copies instead of sharing them
+        if isinstance(spells, SpellList):
+            spells = [spell.replace() for spell in spells]
+        self._replace_spells(spells)
+        self._notify('reset')
+
+    def _replace_spells(self, spells: Iterable[SpellEntry]) -> None:
+        """Swap in a new spell list without notifying observers"""
+        self._spells = spells if isinstance(spells, SpellList) else SpellList(spells)
+
+    def add_observer(self, observer: Callable[['Rotation', RotationChange], None]) -> None:
+        """
+        Call observer(rotation, change) after each change to the spell list
+        Observers are not pickled or copied with the rotation.
+        """
+        self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer: Callable[['Rotation', RotationChange], None]) -> None:
+        self._observers = tuple(o for o in self._observers if o != observer)
+
+    def _notify(self, kind: str, index: int = -1, new_index: int = -1,
+                spell: Optional[SpellEntry] = None) -> None:
+        if self._observers:
+            change = RotationChange(kind, index, new_index, spell)
+            for observer in self._observers:
+                observer(self, change)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop('_observers', None)
+        return state
+
     def _validate_spec(self) -> None:
         """Validate the class/spec combination"""
         if not self.spec_id:
             raise ValueError(f"Invalid class/spec combination: {self.metadata.class_name}/{self.metadata.spec_name}")
 
-    def add_spell(self, spell_name: str, condition: str = "true", priority: Optional[int] = None) -> SpellEntry:
-        """Add a spell to the rotation"""
-        # Validate spell exists for class/spec
-        if spell_name not in spell_data.get_spells_for_spec(self.metadata.class_name, self.metadata.spec_name):
+    def _check_spell(self, spell_name: str) -> None:
+        """Validate that a spell exists for the rotation's class/spec"""
+        if not spell_data.spec_has_spell(self.metadata.class_name, self.metadata.spec_name, spell_name):
             raise ValueError(f"Spell {spell_name} not found for {self.metadata.class_name}/{self.metadata.spec_name}")
 
-        # Validate condition
+    @staticmethod
+    def _check_condition(condition: str) -> None:
+        """Validate a condition string"""
         is_valid, error = ConditionValidator.validate_condition(condition)
         if not is_valid:
             raise ValueError(f"Invalid condition: {error}")
 
-        # Set priority
+    def add_spell(self, spell_name: str, condition: str = "true", priority: Optional[int] = None) -> SpellEntry:
+        """Add a spell to the rotation"""
+        self._check_spell(spell_name)
+        self._check_condition(condition)
+
+        # Set priority; inserting shifts the spells below it down by one
         if priority is None:
             priority = len(self.spells) + 1
         else:
-            # Shift existing spells if needed
-            for spell in self.spells:
-                if spell.priority >= priority:
-                    spell.priority += 1
+            priority = min(max(priority, 1), len(self.spells) + 1)
 
         # Create spell entry
         entry = SpellEntry(
@@ -79,72 +223,132 @@ class Rotation:
             priority=priority
         )
         
-        self.spells.append(entry)
-        self._sort_spells()
+        self.spells.insert(priority - 1, entry)
         self.metadata.modified_at = time.time()
+        self._notify('inserted', priority - 1, spell=entry)
         return entry
 
+    def add_spells(self, spells: Iterable[Union[SpellEntry, Tuple]]) -> List[SpellEntry]:
+        """
+        Add several spells at once, as if add_spell were called for each in turn
+        Items are SpellEntry objects or (name, condition[, priority]) tuples; a
+        priority of None appends. SpellEntry items are copied, and the copies
+        are returned. Nothing is added if any spell is invalid.
+        """
+        entries = []
+        for item in spells:
+            if isinstance(item, SpellEntry):
+                item = item.replace()
+            else:
+                name, condition, *rest = item
+                item = SpellEntry(name=name, condition=condition,
+                                  priority=rest[0] if rest else None)
+            entries.append(item)
+        self._check_entries(entries)
+
+        spells_list = list(self.spells)
+        positions = []
+        for entry in entries:
+            if entry.priority is None or entry.priority > len(spells_list):
+                positions.append(len(spells_list))
+                spells_list.append(entry)
+            else:
+                positions.append(max(entry.priority, 1) - 1)
+                spells_list.insert(positions[-1], entry)
+        self._replace_spells(spells_list)
+        if entries:
+            self.metadata.modified_at = time.time()
+        # Replaying the inserts in order reproduces the new list
+        for entry, position in zip(entries, positions):
+            self._notify('inserted', position, spell=entry)
+        return entries
+
+    def _check_entries(self, entries: List[SpellEntry]) -> None:
+        """Validate each distinct spell and condition of a batch once"""
+        for name in {entry.name for entry in entries}:
+            self._check_spell(name)
+        for condition in {entry.condition for entry in entries}:
+            self._check_condition(condition)
+
+    def remove_spells(self, priorities: Iterable[int]) -> int:
+        """
+        Remove the spells at several priorities at once
+        Raises ValueError (removing nothing) if any priority is out of range
+        """
+        doomed = set(priorities)
+        count = len(self.spells)
+        invalid = sorted(p for p in doomed if not 1 <= p <= count)
+        if invalid:
+            raise ValueError(f"No spell at priority: {', '.join(map(str, invalid))}")
+        if doomed:
+            self._replace_spells([spell for spell in self.spells if spell.priority not in doomed])
+            self.metadata.modified_at = time.time()
+            # Bottom-up, so each index is still valid when its removal is applied
+            for priority in sorted(doomed, reverse=True):
+                self._notify('removed', priority - 1)
+        return len(doomed)
+
+    def reorder(self, permutation: Sequence[int]) -> None:
+        """
+        Reorder spells; permutation lists the current priorities in their new order
+        e.g. [2, 1, 3] swaps the first two spells
+        """
+        count = len(self.spells)
+        if sorted(permutation) != list(range(1, count + 1)):
+            raise ValueError(f"Not a permutation of priorities 1-{count}: {list(permutation)}")
+        spells = list(self.spells)
+        self._replace_spells([spells[priority - 1] for priority in permutation])
+        self.metadata.modified_at = time.time()
+        self._notify('reset')
+
     def remove_spell(self, priority: int) -> bool:
         """Remove a spell from the rotation"""
-        for i, spell in enumerate(self.spells):
-            if spell.priority == priority:
-                self.spells.pop(i)
-                # Update priorities
-                for s in self.spells:
-                    if s.priority > priority:
-                        s.priority -= 1
-                self.metadata.modified_at = time.time()
-                return True
-        return False
+        if not 1 <= priority <= len(self.spells):
+            return False
+        del self.spells[priority - 1]
+        self.metadata.modified_at = time.time()
+        self._notify('removed', priority - 1)
+        return True
 
     def move_spell(self, from_priority: int, to_priority: int) -> bool:
         """Move a spell to a new priority"""
+        if not 1 <= from_priority <= len(self.spells):
+            return False
         if from_priority == to_priority:
             return True
 
-        spell_to_move = None
-        for spell in self.spells:
-            if spell.priority == from_priority:
-                spell_to_move = spell
-                break
-
-        if not spell_to_move:
-            return False
-
-        # Update priorities
-        if from_priority < to_priority:
-            for spell in self.spells:
-                if from_priority < spell.priority <= to_priority:
-                    spell.priority -= 1
-        else:
-            for spell in self.spells:
-                if to_priority <= spell.priority < from_priority:
-                    spell.priority += 1
-
-        spell_to_move.priority = to_priority
-        self._sort_spells()
+        to_priority = min(max(to_priority, 1), len(self.spells))
+        self.spells.move(from_priority - 1, to_priority - 1)
         self.metadata.modified_at = time.time()
+        self._notify('moved', from_priority - 1, to_priority - 1)
         return True
 
-    def _sort_spells(self) -> None:
-        """Sort spells by priority"""
-        self.spells.sort(key=lambda x: x.priority)
-
     def update_spell(self, priority: int, **kwargs) -> bool:
         """Update spell properties"""
+        if not 1 <= priority <= len(self.spells):
+            return False
+        spell = self.spells[priority - 1]
+        for key in kwargs:
+            if key not in _UPDATABLE_FIELDS:
+                raise ValueError(f"Cannot update spell field: {key}")
+        if 'condition' in kwargs:
+            self._check_condition(kwargs['condition'])
+        
+        for key, value in kwargs.items():
+            if key in ('name', 'condition'):
+                value = _intern(value)
+            setattr(spell, key, value)
+        
+        self.metadata.modified_at = time.time()
+        self._notify('updated', priority - 1, spell=spell)
+        return True
+
+    def fingerprint(self) -> str:
+        """Hash of the class/spec and the ordered spell list (names, conditions, enabled)"""
+        digest = hashlib.sha1(f"{self.spec_id}".encode())
         for spell in self.spells:
-            if spell.priority == priority:
-                if 'condition' in kwargs:
-                    is_valid, error = ConditionValidator.validate_condition(kwargs['condition'])
-                    if not is_valid:
-                        raise ValueError(f"Invalid condition: {error}")
-                
-                for key, value in kwargs.items():
-                    setattr(spell, key, value)
-                
-                self.metadata.modified_at = time.time()
-                return True
-        return False
+            digest.update(f"\x1f{spell.name}\x1e{spell.condition}\x1e{int(spell.enabled)}".encode())
+        return digest.hexdigest()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert rotation to dictionary"""
@@ -179,7 +383,8 @@ class Rotation:
         """Create rotation from dictionary"""
         rotation = cls(data['metadata']['class_name'], data['metadata']['spec_name'])
         rotation.metadata = RotationMetadata(**data['metadata'])
-        rotation.spells = [SpellEntry(**spell) for spell in data['spells']]
+        rotation.spells = sorted((SpellEntry(**spell) for spell in data['spells']),
+                                 key=lambda spell: spell.priority)
         rotation.spec_id = data['spec_id']
         return rotation
 
@@ -196,64 +401,270 @@ class Rotation:
             spec_id = int(spec_id_match.group(1))
             
             # Find class and spec from spec ID
-            class_name = None
-            spec_name = None
-            for c, specs in spell_data.SPEC_IDS.items():
-                for s, sid in specs.items():
-                    if sid == spec_id:
-                        class_name = c
-                        spec_name = s
-                        break
-                if class_name:
-                    break
-            
-            if not class_name or not spec_name:
+            class_spec = spell_data.get_class_spec(spec_id)
+            if not class_spec:
                 raise ValueError(f"Invalid spec ID: {spec_id}")
             
             # Create rotation
-            rotation = cls(class_name, spec_name)
+            rotation = cls(*class_spec)
             
             # Extract spell entries
             spell_pattern = r'\{\s*"([^"]+)",\s*"([^"]+)"\s*\}'
             spell_matches = re.finditer(spell_pattern, soe_code)
-            
-            for i, match in enumerate(spell_matches, 1):
-                spell_name, condition = match.groups()
-                rotation.add_spell(spell_name, condition, i)
+            rotation.add_spells(match.groups() for match in spell_matches)
             
             return rotation
             
         except Exception as e:
             raise ValueError(f"Error parsing SOE Engine code: {str(e)}")
 
+_json_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'\s*')
+
+# Top-level members that may precede "metadata" and are cheap to decode
+_HEADER_KEYS = ("format_version", "spec_id", "metadata")
+
+def _read_json_header(f: BinaryIO, chunk_size: int = 1024) -> Optional[Dict[str, Any]]:
+    """
+    Decode the top-level members of a JSON rotation file up to and including
+    "metadata", reading only as much of the (unbuffered, binary) file as that needs
+    Returns None if other members come first.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    text = ""
+    header: Dict[str, Any] = {}
+    pos = 0
+    while True:
+        chunk = f.read(chunk_size)
+        text += decoder.decode(chunk, final=not chunk)
+        try:
+            if not header and pos == 0:
+                start = _whitespace.match(text).end()
+                if text[start] != "{":
+                    raise ValueError("Rotation file is not a JSON object")
+                pos = start + 1
+            while True:
+                # pos only advances past complete members, so a member cut off
+                # at the end of the chunk is decoded again once more is read
+                end = _whitespace.match(text, pos).end()
+                key, end = _json_decoder.raw_decode(text, end)
+                if key not in _HEADER_KEYS:
+                    return None
+                end = _whitespace.match(text, end).end()
+                if text[end] != ":":
+                    raise ValueError(f"Malformed JSON near {key!r}")
+                end = _whitespace.match(text, end + 1).end()
+                value, end = _json_decoder.raw_decode(text, end)
+                end = _whitespace.match(text, end).end()
+                if text[end] not in ",}":
+                    raise ValueError(f"Malformed JSON after {key!r}")
+                header[key] = value
+                pos = end + 1
+                if key == "metadata":
+                    return header
+        except (json.JSONDecodeError, IndexError) as e:
+            if not chunk:
+                raise ValueError(f"Error parsing JSON: {e}")
+
+def _spells_from_json(data: Dict[str, Any]) -> List[SpellEntry]:
+    return [
+        SpellEntry(
+            name=spell["name"],
+            condition=spell["condition"],
+            priority=spell["priority"],
+            enabled=spell.get("enabled", True),
+            notes=spell.get("notes", "")
+        )
+        for spell in data["spells"]
+    ]
+
+class LazyRotation(Rotation):
+    """
+    Rotation whose spells are decoded on first access
+    Only the metadata is loaded up front; load_spells is called for the spell
+    entries (validated unless validate is False) the first time spells is used.
+    """
+
+    def __init__(self, metadata: RotationMetadata, load_spells: Callable[[], Iterable[SpellEntry]],
+                 validate: bool = True):
+        self.metadata = metadata
+        self.spec_id = spell_data.get_spec_id(metadata.class_name, metadata.spec_name)
+        self._validate_spec()
+        self._spells: Optional[SpellList] = None
+        self._load_spells = load_spells
+        self._validate_spells = validate
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the spells have been decoded yet"""
+        return self._spells is not None
+
+    @property
+    def spells(self) -> SpellList:
+        if self._spells is None:
+            self._materialize()
+        return self._spells
+
+    @spells.setter
+    def spells(self, spells: Iterable[SpellEntry]) -> None:
+        self._load_spells = None
+        Rotation.spells.fset(self, spells)
+
+    def _materialize(self) -> None:
+        entries = list(self._load_spells())
+        if self._validate_spells:
+            self._check_entries(entries)
+        self._spells = SpellList(sorted(entries, key=lambda spell: spell.priority))
+        self._load_spells = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The loader may not be picklable, so decode the spells first
+        if self._spells is None:
+            self._materialize()
+        return super().__getstate__()
+
+    @classmethod
+    def from_json_file(cls, filename: str) -> 'LazyRotation':
+        """Open a JSON rotation (exported or saved by RotationManager) reading only its metadata"""
+        with open(filename, 'rb', buffering=0) as f:
+            header = _read_json_header(f)
+            data = None
+            if header is None:
+                f.seek(0)
+                data = header = json.load(f)
+        if header.get("format_version", "1.0") != "1.0":
+            raise ValueError("Unsupported JSON format version")
+
+        def load_spells() -> List[SpellEntry]:
+            if data is not None:
+                return _spells_from_json(data)
+            with open(filename, 'r', encoding='utf-8') as f:
+                return _spells_from_json(json.load(f))
+
+        return cls(RotationMetadata(**header["metadata"]), load_spells)
+
+# Files saved and loaded in the compact binary format (see core.binary)
+BINARY_EXTENSION = ".rotb"
+
 class RotationManager:
-    """Manages multiple rotations"""
+    """
+    Manages multiple rotations
+    Keeps secondary indexes (class, class/spec, tag, author) up to date as
+    rotations are added, removed and their metadata is edited; call
+    update_rotation after replacing a managed rotation's metadata object.
+    """
     
     def __init__(self):
         self.rotations: Dict[str, Rotation] = {}
+        self._key_counters: Dict[str, int] = {}
+        self._keys: Dict[int, str] = {}
+        self._index_values: Dict[str, Tuple[str, Tuple[str, str], Tuple[str, ...], str]] = {}
+        self._by_class: Dict[str, Dict[str, Rotation]] = {}
+        self._by_spec: Dict[Tuple[str, str], Dict[str, Rotation]] = {}
+        self._by_tag: Dict[str, Dict[str, Rotation]] = {}
+        self._by_author: Dict[str, Dict[str, Rotation]] = {}
+        # Metadata each key is subscribed to, with the observer to remove later
+        self._watched: Dict[str, Tuple[RotationMetadata, Callable]] = {}
+        # Open bundles that lazily loaded rotations still read from
+        self.bundles: List[Any] = []
 
     def create_rotation(self, class_name: str, spec_name: str, name: Optional[str] = None) -> Rotation:
         """Create a new rotation"""
         rotation = Rotation(class_name, spec_name)
         if name:
             rotation.metadata.name = name
+        self.add_rotation(rotation)
+        return rotation
+
+    def add_rotation(self, rotation: Rotation) -> str:
+        """Add a rotation under a newly generated key and return the key"""
+        key = self._keys.get(id(rotation))
+        if key is not None:
+            return key
         key = self._generate_key(rotation)
         self.rotations[key] = rotation
-        return rotation
+        self._keys[id(rotation)] = key
+        self._index(key, rotation)
+        self._watch(key, rotation)
+        return key
 
     def _generate_key(self, rotation: Rotation) -> str:
         """Generate unique key for rotation"""
         base_key = f"{rotation.metadata.name}_{rotation.metadata.class_name}_{rotation.metadata.spec_name}"
-        key = base_key
-        counter = 1
+        counter = self._key_counters.get(base_key, 0)
+        key = f"{base_key}_{counter}" if counter else base_key
+        # Only loops when a name itself ends in a counter suffix
         while key in self.rotations:
-            key = f"{base_key}_{counter}"
             counter += 1
+            key = f"{base_key}_{counter}"
+        self._key_counters[base_key] = counter + 1
         return key
 
+    def _index(self, key: str, rotation: Rotation) -> None:
+        metadata = rotation.metadata
+        values = (metadata.class_name, (metadata.class_name, metadata.spec_name),
+                  tuple(dict.fromkeys(metadata.tags)), metadata.author)
+        self._index_values[key] = values
+        class_name, spec, tags, author = values
+        self._by_class.setdefault(class_name, {})[key] = rotation
+        self._by_spec.setdefault(spec, {})[key] = rotation
+        for tag in tags:
+            self._by_tag.setdefault(tag, {})[key] = rotation
+        self._by_author.setdefault(author, {})[key] = rotation
+
+    def _unindex(self, key: str) -> None:
+        class_name, spec, tags, author = self._index_values.pop(key)
+        for index, value in ((self._by_class, class_name), (self._by_spec, spec),
+                             (self._by_author, author)):
+            self._discard(index, value, key)
+        for tag in tags:
+            self._discard(self._by_tag, tag, key)
+
+    def _watch(self, key: str, rotation: Rotation) -> None:
+        observer = partial(self._metadata_changed, key)
+        rotation.metadata.add_observer(observer)
+        self._watched[key] = (rotation.metadata, observer)
+
+    def _unwatch(self, key: str) -> None:
+        metadata, observer = self._watched.pop(key)
+        metadata.remove_observer(observer)
+
+    def _metadata_changed(self, key: str, metadata: RotationMetadata, field: str) -> None:
+        if field in _INDEXED_METADATA:
+            self._unindex(key)
+            self._index(key, self.rotations[key])
+
+    @staticmethod
+    def _discard(index: Dict, value: Any, key: str) -> None:
+        bucket = index[value]
+        del bucket[key]
+        if not bucket:
+            del index[value]
+
+    def get_key(self, rotation: Rotation) -> Optional[str]:
+        """Key a managed rotation is stored under"""
+        return self._keys.get(id(rotation))
+
+    def update_rotation(self, rotation: Rotation) -> bool:
+        """Refresh the indexes, e.g. after a managed rotation's metadata was replaced"""
+        key = self._keys.get(id(rotation))
+        if key is None:
+            return False
+        self._unindex(key)
+        self._index(key, rotation)
+        if self._watched[key][0] is not rotation.metadata:
+            self._unwatch(key)
+            self._watch(key, rotation)
+        return True
+
     def save_rotation(self, rotation: Rotation, filename: str) -> bool:
-        """Save rotation to file"""
+        """Save rotation to file (in the compact binary format for .rotb files)"""
         try:
+            if filename.lower().endswith(BINARY_EXTENSION):
+                from .binary import dump
+                with open(filename, 'wb') as f:
+                    dump(rotation, f)
+                return True
             with open(filename, 'w') as f:
                 json.dump(rotation.to_dict(), f, indent=2)
             return True
@@ -261,32 +672,116 @@ class RotationManager:
             print(f"Error saving rotation: {e}")
             return False
 
-    def load_rotation(self, filename: str) -> Optional[Rotation]:
-        """Load rotation from file"""
+    def load_rotation(self, filename: str, lazy: bool = False) -> Optional[Rotation]:
+        """
+        Load rotation from file (.rotb files in the compact binary format)
+        A lazy JSON rotation reads its spells on first use.
+        """
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-            rotation = Rotation.from_dict(data)
-            key = self._generate_key(rotation)
-            self.rotations[key] = rotation
+            if filename.lower().endswith(BINARY_EXTENSION):
+                from .binary import load
+                with open(filename, 'rb') as f:
+                    rotation = load(f)
+            elif lazy:
+                rotation = LazyRotation.from_json_file(filename)
+            else:
+                with open(filename, 'r') as f:
+                    data = json.load(f)
+                rotation = Rotation.from_dict(data)
+            self.add_rotation(rotation)
             return rotation
         except Exception as e:
             print(f"Error loading rotation: {e}")
             return None
 
-    def get_rotations(self, class_name: Optional[str] = None, spec_name: Optional[str] = None) -> List[Rotation]:
-        """Get rotations, optionally filtered by class/spec"""
-        rotations = list(self.rotations.values())
-        if class_name:
-            rotations = [r for r in rotations if r.metadata.class_name == class_name]
-        if spec_name:
-            rotations = [r for r in rotations if r.metadata.spec_name == spec_name]
+    def load_directory(self, directory: str, lazy: bool = True) -> List[Rotation]:
+        """
+        Load every .json and .rotb rotation in a directory
+        JSON rotations are loaded lazily by default; binary ones are cheap to
+        load in full.
+        """
+        rotations = []
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith((".json", BINARY_EXTENSION)):
+                rotation = self.load_rotation(os.path.join(directory, name), lazy=lazy)
+                if rotation is not None:
+                    rotations.append(rotation)
+        return rotations
+
+    def save_bundle(self, filename: str) -> bool:
+        """Save every rotation, under its key, to one bundle file"""
+        from .bundle import write_bundle
+        try:
+            write_bundle(filename, self.rotations)
+            return True
+        except Exception as e:
+            print(f"Error saving bundle: {e}")
+            return False
+
+    def open_bundle(self, filename: str, lazy: bool = True) -> List[Rotation]:
+        """
+        Add every rotation in a bundle, listing them from its table of contents
+        Lazy rotations read their spells from the bundle on first use.
+        """
+        from .bundle import RotationBundle
+        try:
+            bundle = RotationBundle(filename)
+        except Exception as e:
+            print(f"Error opening bundle: {e}")
+            return []
+        rotations = [bundle.load(key, lazy=lazy) for key in bundle.keys()]
+        for rotation in rotations:
+            self.add_rotation(rotation)
+        if lazy:
+            self.bundles.append(bundle)
+        else:
+            bundle.close()
         return rotations
 
+    def get_rotations(self, class_name: Optional[str] = None, spec_name: Optional[str] = None,
+                      tag: Optional[str] = None, author: Optional[str] = None) -> List[Rotation]:
+        """Get rotations, optionally filtered by class/spec, tag and author"""
+        if class_name and spec_name:
+            candidates = [self._by_spec.get((class_name, spec_name), {})]
+        elif class_name:
+            candidates = [self._by_class.get(class_name, {})]
+        else:
+            candidates = []
+        if tag:
+            candidates.append(self._by_tag.get(tag, {}))
+        if author is not None:
+            candidates.append(self._by_author.get(author, {}))
+
+        if not candidates:
+            rotations = self.rotations
+        else:
+            # Walk the smallest index and check membership of the others
+            candidates.sort(key=len)
+            rotations = candidates[0]
+            for other in candidates[1:]:
+                rotations = {key: r for key, r in rotations.items() if key in other}
+        if spec_name and not class_name:
+            return [r for r in rotations.values() if r.metadata.spec_name == spec_name]
+        return list(rotations.values())
+
+    def get_classes(self) -> List[str]:
+        """Classes that have at least one rotation"""
+        return list(self._by_class)
+
+    def get_tags(self) -> List[str]:
+        """Tags used by at least one rotation"""
+        return list(self._by_tag)
+
+    def get_authors(self) -> List[str]:
+        """Authors of at least one rotation"""
+        return list(self._by_author)
+
     def delete_rotation(self, rotation: Rotation) -> bool:
         """Delete a rotation"""
-        for key, r in self.rotations.items():
-            if r is rotation:
-                del self.rotations[key]
-                return True
-        return False
\ No newline at end of file
+        key = self._keys.pop(id(rotation), None)
+        if key is None:
+            return False
+        del self.rotations[key]
+        self._unindex(key)
+        self._unwatch(key)
+        return True
@@ -0,0 +1,467 @@
+from typing import Dict, List, Optional, Tuple, Any, Callable
+from dataclasses import dataclass, field
+import random
+from conditions import (
+    ConditionValidator, ConditionNode, Literal, Number, Reference, Not, Compare, Logical
+)
+from .rotation import Rotation
+import spell_mechanics
+from .resources import (
+    ResourceModel, CompiledResources, RESOURCE_PATHS, default_resources,
+    resource_source, get_resource_model
+)
+
+# How long after a cast spell.casted(Name) stays true
+RECENT_CAST_WINDOW = 3.0
+
+# Condition paths that take a name argument and read from a per-name table
+_AURA_TABLES = {
+    "player.buff": ("player_buffs", "player_buff_stacks"),
+    "player.debuff": ("player_debuffs", "player_debuff_stacks"),
+    "target.debuff": ("target_debuffs", "target_debuff_stacks"),
+}
+
+_NAME_SETS = {
+    "player.talent": "player_talents",
+    "player.glyph": "player_glyphs",
+    "toggle.custom": "custom_toggles",
+}
+
+def _slot_name(path: str) -> str:
+    """Map a condition path such as player.health.actual to a state attribute"""
+    return path.replace('.', '_')
+
+def _scalar_paths() -> List[str]:
+    """All condition paths that are stored as a plain value on the state"""
+    paths = []
+    for category, conditions in ConditionValidator.BASIC_CONDITIONS.items():
+        if category == "spell":
+            continue
+        for key in conditions:
+            path = f"{category}.{key}"
+            base = '.'.join(path.split('.')[:2])
+            if base in _AURA_TABLES or base in _NAME_SETS or path in RESOURCE_PATHS:
+                continue
+            paths.append(path)
+    return paths
+
+_SCALAR_PATHS = _scalar_paths()
+
+_STATE_DEFAULTS = {
+    "player.health": 100.0,
+    "player.health.actual": 100000.0,
+    "player.health.max": 100000.0,
+    "player.level": 90,
+    "target.health": 100.0,
+    "target.health.actual": 1000000.0,
+    "target.health.max": 1000000.0,
+    "target.exists": True,
+    "target.enemy": True,
+    "target.range": True,
+    "target.level": 93,
+    "area.enemies": 1,
+    "group.members": 1,
+    "group.avghealth": 100.0,
+    "toggle.cooldowns": True,
+    "toggle.aoe": True,
+    "toggle.interrupt": True,
+}
+
+class GameState:
+    """
+    Flat game-state model for the simulator
+    One attribute per condition in ConditionValidator.BASIC_CONDITIONS, a
+    fixed-slot array of class resources, and per-name tables for auras,
+    cooldowns, talents and custom toggles
+    """
+    __slots__ = tuple(_slot_name(p) for p in _SCALAR_PATHS) + (
+        "time", "resources",
+        "player_buffs", "player_buff_stacks",
+        "player_debuffs", "player_debuff_stacks",
+        "target_debuffs", "target_debuff_stacks",
+        "player_talents", "player_glyphs", "custom_toggles",
+        "spell_ready", "spell_charges", "cast_times", "known_spells",
+    )
+
+    def __init__(self, **values):
+        for path in _SCALAR_PATHS:
+            setattr(self, _slot_name(path), _STATE_DEFAULTS.get(path, 0))
+        self.player_lastcast = ""
+        self.player_spec = ""
+        self.target_name = ""
+        self.target_classification = "normal"
+        self.target_creatureType = ""
+        self.time = 0.0
+        # Indexed by core.resources.RESOURCE_SLOTS
+        self.resources = default_resources()
+        # Auras map name -> expiry time; stacks map name -> stack count
+        self.player_buffs: Dict[str, float] = {}
+        self.player_buff_stacks: Dict[str, int] = {}
+        self.player_debuffs: Dict[str, float] = {}
+        self.player_debuff_stacks: Dict[str, int] = {}
+        self.target_debuffs: Dict[str, float] = {}
+        self.target_debuff_stacks: Dict[str, int] = {}
+        self.player_talents = set()
+        self.player_glyphs = set()
+        self.custom_toggles = set()
+        # Per-spell tables are indexed by the spell's slot in the simulator
+        self.spell_ready: List[float] = []
+        self.spell_charges: List[int] = []
+        self.cast_times: Dict[str, float] = {}
+        self.known_spells = set()
+        for path, value in values.items():
+            self.set(path, value)
+
+    def set(self, path: str, value: Any) -> None:
+        """Set a scalar or resource condition value by its condition path"""
+        if path in RESOURCE_PATHS:
+            self.resources[RESOURCE_PATHS[path]] = value
+            return
+        slot = _slot_name(path)
+        if path not in _SCALAR_PATHS and slot not in self.__slots__:
+            raise KeyError(f"Unknown state value: {path}")
+        setattr(self, slot, value)
+
+    def get(self, path: str) -> Any:
+        """Get a scalar or resource condition value by its condition path"""
+        if path in RESOURCE_PATHS:
+            return self.resources[RESOURCE_PATHS[path]]
+        return getattr(self, _slot_name(path))
+
+    def apply_aura(self, path: str, name: str, duration: float, stacks: int = 1) -> None:
+        """Apply a buff/debuff (path is e.g. 'player.buff') lasting duration seconds"""
+        expiry_table, stack_table = _AURA_TABLES[path]
+        getattr(self, expiry_table)[name] = self.time + duration
+        getattr(self, stack_table)[name] = stacks
+
+    def copy(self) -> 'GameState':
+        """Return an independent copy of this state"""
+        clone = GameState.__new__(GameState)
+        for slot in self.__slots__:
+            value = getattr(self, slot)
+            if isinstance(value, (dict, list, set)):
+                value = value.copy()
+            elif slot == "resources":
+                value = value[:]
+            setattr(clone, slot, value)
+        return clone
+
+def condition_source(node: ConditionNode, spell_index: Optional[Dict[str, int]] = None,
+                     now: str = "s.time", resources: str = "s.resources") -> str:
+    """
+    Translate a condition AST into a Python expression over a GameState 's'
+    spell_index maps spell names to their slot in the per-spell state tables;
+    now and resources are the expressions used for the current time and the
+    resource array
+    """
+    spell_index = spell_index or {}
+
+    def source(child: ConditionNode) -> str:
+        return condition_source(child, spell_index, now, resources)
+
+    if isinstance(node, Literal):
+        return "True" if node.value else "False"
+    if isinstance(node, Number):
+        return repr(node.value)
+    if isinstance(node, Not):
+        return f"(not {source(node.operand)})"
+    if isinstance(node, Logical):
+        op = "and" if node.op == "&&" else "or"
+        return f"({source(node.left)} {op} {source(node.right)})"
+    if isinstance(node, Compare):
+        return f"({source(node.left)} {node.op} {source(node.right)})"
+    if isinstance(node, Reference):
+        return _reference_source(node, spell_index, now, resources)
+    raise TypeError(f"Unsupported condition node: {node!r}")
+
+def _reference_source(node: Reference, spell_index: Dict[str, int], now: str,
+                      resources: str) -> str:
+    """Translate a single condition reference"""
+    path = node.path
+    resource = resource_source(path, resources)
+    if resource is not None:
+        return resource
+    arg = node.argument
+    parts = path.split('.')
+    base = '.'.join(parts[:2])
+    suffix = parts[2] if len(parts) > 2 else ""
+
+    if base in _AURA_TABLES and arg is not None:
+        expiry_table, stack_table = _AURA_TABLES[base]
+        names = [name.strip() for name in arg.split(',') if name.strip()]
+        if suffix == "any":
+            active = " or ".join(f"s.{expiry_table}.get({n!r}, 0.0) > {now}" for n in names)
+            return f"({active or 'False'})"
+        name = names[0] if names else ""
+        if suffix == "count":
+            return (f"(s.{stack_table}.get({name!r}, 0) "
+                    f"if s.{expiry_table}.get({name!r}, 0.0) > {now} else 0)")
+        if suffix == "duration":
+            return f"max(0.0, s.{expiry_table}.get({name!r}, 0.0) - {now})"
+        return f"(s.{expiry_table}.get({name!r}, 0.0) > {now})"
+
+    if base in _NAME_SETS:
+        if arg is None:
+            return f"bool(s.{_NAME_SETS[base]})"
+        return f"({arg!r} in s.{_NAME_SETS[base]})"
+
+    if parts[0] == "spell":
+        index = spell_index.get(arg) if arg is not None else None
+        key = parts[1]
+        if key == "cooldown":
+            if index is None:
+                return "0.0"
+            ready = f"s.spell_ready[{index}]"
+            return f"({ready} - {now} if {ready} > {now} else 0.0)"
+        if key == "charges":
+            return "0" if index is None else f"s.spell_charges[{index}]"
+        if key == "usable":
+            return "False" if index is None else f"(s.spell_ready[{index}] <= {now})"
+        if key == "exists":
+            return f"({arg!r} in s.known_spells)"
+        if key == "range":
+            return "s.target_range"
+        if key == "casted":
+            return f"({now} - s.cast_times.get({arg!r}, -1e9) <= {RECENT_CAST_WINDOW!r})"
+
+    if path == "player.lastcast" and arg is not None:
+        return f"(s.player_lastcast == {arg!r})"
+
+    if path in _SCALAR_PATHS:
+        return f"s.{_slot_name(path)}"
+    # Deeper paths (e.g. player.health.actual.foo) fall back to their known prefix
+    return resource_source(base, resources) or f"s.{_slot_name(base)}"
+
+def referenced_paths(node: ConditionNode) -> set:
+    """Collect every condition path referenced by an AST"""
+    if isinstance(node, Reference):
+        return {node.path}
+    if isinstance(node, Not):
+        return referenced_paths(node.operand)
+    if isinstance(node, (Logical, Compare)):
+        return referenced_paths(node.left) | referenced_paths(node.right)
+    return set()
+
+def compile_condition(condition: str,
+                      spell_index: Optional[Dict[str, int]] = None) -> Callable[[GameState], bool]:
+    """Compile a condition string into a closure taking a GameState"""
+    source = condition_source(ConditionValidator.parse(condition), spell_index)
+    return eval(f"lambda s: {source}", {"__builtins__": {}, "max": max, "bool": bool})
+
+@dataclass
+class SpellProfile:
+    """Simulation properties of a single spell"""
+    cooldown: float = 0.0
+    gcd: float = 1.5
+    damage: float = 1.0
+    crit_chance: float = 0.0
+    crit_multiplier: float = 2.0
+    proc: Optional[str] = None          # Player buff this spell can trigger
+    proc_chance: float = 0.0
+    proc_duration: float = 0.0
+    cast_time: float = 0.0
+    dot: Optional[str] = None           # Target debuff applied as a damage-over-time effect
+    dot_duration: float = 0.0
+    dot_interval: float = 3.0
+    dot_damage: float = 0.0             # Damage per DoT tick
+
+def mechanics_profiles(class_name: str, spec_name: str) -> Dict[str, SpellProfile]:
+    """Default profiles (cooldown, GCD, cast time) from the spell mechanics database"""
+    return {
+        name: SpellProfile(cooldown=mechanics.cooldown, gcd=mechanics.gcd,
+                           cast_time=mechanics.cast_time)
+        for name, mechanics in spell_mechanics.get_spec_mechanics(class_name, spec_name).items()
+    }
+
+@dataclass
+class SimulationResult:
+    """Results of a simulated fight"""
+    duration: float
+    ticks: int
+    decisions: int
+    damage: float
+    idle_time: float
+    casts: Dict[str, int]
+    timeline: List[Tuple[float, str]] = field(default_factory=list)
+
+class Simulator:
+    """Fixed-tick fight simulator driven by a rotation's priority list"""
+
+    DEFAULT_PROFILE = SpellProfile()
+
+    def __init__(self, rotation: Rotation, state: Optional[GameState] = None,
+                 profiles: Optional[Dict[str, SpellProfile]] = None, tick: float = 0.1,
+                 resource_model: Optional[ResourceModel] = None):
+        self.rotation = rotation
+        self.resource_model = resource_model or get_resource_model(rotation.metadata.class_name)
+        if state is None:
+            # A given state is used as-is; a fresh one starts with the class's pools
+            state = GameState()
+            self.resource_model.initialize(state.resources)
+        self.state = state
+        # Given profiles override the mechanics database per spell
+        self.profiles = mechanics_profiles(rotation.metadata.class_name, rotation.metadata.spec_name)
+        self.profiles.update(profiles or {})
+        self.tick = tick
+
+        # Only enabled spells take part; keep them in priority order
+        self.spells = [spell for spell in rotation.spells if spell.enabled]
+        self.spell_names = [spell.name for spell in self.spells]
+        self.spell_index: Dict[str, int] = {}
+        for i, name in enumerate(self.spell_names):
+            self.spell_index.setdefault(name, i)
+
+        self.conditions = [compile_condition(spell.condition, self.spell_index)
+                           for spell in self.spells]
+        self.paths = set()
+        for spell in self.spells:
+            self.paths |= referenced_paths(ConditionValidator.parse(spell.condition))
+        self.resources: CompiledResources = self.resource_model.compile(self.spell_names)
+        self.decide = self._compile_decide()
+
+    def _compile_decide(self) -> Callable[[GameState], int]:
+        """
+        Fuse all spell conditions into one function returning the index of the
+        first castable (off cooldown and affordable) spell, or -1 when nothing
+        can be cast
+        """
+        lines = ["def decide(s):", "    ready = s.spell_ready", "    now = s.time",
+                 "    res = s.resources"]
+        for i, spell in enumerate(self.spells):
+            source = condition_source(ConditionValidator.parse(spell.condition),
+                                      self.spell_index, now="now", resources="res")
+            index = self.spell_index[spell.name]
+            cost = self.resources.cost_source(i, resources="res")
+            if cost:
+                source = f"{cost} and {source}"
+            lines.append(f"    if ready[{index}] <= now and {source}:")
+            lines.append(f"        return {i}")
+        lines.append("    return -1")
+        namespace = {"__builtins__": {}, "max": max, "bool": bool}
+        exec("\n".join(lines), namespace)
+        return namespace["decide"]
+
+    def _check_run(self, duration: float) -> None:
+        """Reject fight lengths and profiles that cannot be simulated"""
+        if not duration > 0:
+            raise ValueError(f"Fight duration must be positive, got {duration}")
+        for name in self.spell_names:
+            profile = self.profiles.get(name, self.DEFAULT_PROFILE)
+            if profile.dot and not profile.dot_interval > 0:
+                raise ValueError(f"DoT interval of {name} must be positive, got {profile.dot_interval}")
+
+    def _prepare_state(self) -> GameState:
+        """Copy the initial state and reset its per-spell tables"""
+        state = self.state.copy()
+        count = len(self.spells)
+        state.spell_ready = [0.0] * count
+        state.spell_charges = [1] * count
+        state.known_spells = set(self.spell_names)
+        state.cast_times = {}
+        state.time = 0.0
+        return state
+
+    @staticmethod
+    def _hit(state: GameState, profile: SpellProfile, now: float,
+             rng: Optional[random.Random]) -> float:
+        """Resolve the direct damage of a cast, rolling crits and procs when an rng is given"""
+        if rng is None:
+            return profile.damage
+        damage = profile.damage
+        if profile.crit_chance and rng.random() < profile.crit_chance:
+            damage *= profile.crit_multiplier
+        if profile.proc and rng.random() < profile.proc_chance:
+            state.player_buffs[profile.proc] = now + profile.proc_duration
+            state.player_buff_stacks[profile.proc] = 1
+        return damage
+
+    def run(self, duration: float = 300.0, record_timeline: bool = False,
+            rng: Optional[random.Random] = None) -> SimulationResult:
+        """
+        Simulate a fight of the given length in seconds
+        Crits and procs are only rolled when an rng is given
+        """
+        self._check_run(duration)
+        state = self._prepare_state()
+        decide = self.decide
+        tick = self.tick
+        names = self.spell_names
+        spell_index = self.spell_index
+        profiles = [self.profiles.get(name, self.DEFAULT_PROFILE) for name in names]
+        cooldowns = [p.cooldown for p in profiles]
+        busy = [max(p.gcd, p.cast_time) for p in profiles]
+        ready = state.spell_ready
+        cast_times = state.cast_times
+        casts = [0] * len(names)
+        timeline: List[Tuple[float, str]] = []
+        resources = state.resources
+        apply_resources = self.resources.apply
+        regenerate = self.resources.regenerate if self.resources.regen else None
+        spends = [bool(effects) for effects in self.resources.effects]
+        regen_time = 0.0
+
+        # The target dies linearly over the fight; only maintain what conditions read
+        track_health = "target.health" in self.paths
+        track_actual = "target.health.actual" in self.paths
+        start_health = state.target_health
+        health_rate = start_health / duration
+        actual_rate = state.target_health_max * health_rate / 100.0
+        start_actual = state.target_health_max * start_health / 100.0
+        steps = int(round(duration / tick))
+        gcd_ready = 0.0
+        idle = 0
+        damage = 0.0
+
+        for step in range(steps):
+            now = step * tick
+            if now < gcd_ready:
+                continue
+            state.time = now
+            if track_health:
+                state.target_health = start_health - health_rate * now
+            if track_actual:
+                state.target_health_actual = start_actual - actual_rate * now
+            if regenerate is not None:
+                regenerate(resources, now - regen_time)
+                regen_time = now
+
+            index = decide(state)
+            if index < 0:
+                idle += 1
+                continue
+
+            name = names[index]
+            slot = spell_index[name]
+            ready[slot] = now + cooldowns[index]
+            gcd_ready = now + busy[index]
+            cast_times[name] = now
+            state.player_lastcast = name
+            casts[index] += 1
+            if spends[index]:
+                apply_resources(resources, index)
+            profile = profiles[index]
+            damage += self._hit(state, profile, now, rng)
+            if profile.dot:
+                # Without events the whole DoT is credited when it is applied
+                state.target_debuffs[profile.dot] = now + profile.dot_duration
+                state.target_debuff_stacks[profile.dot] = 1
+                damage += profile.dot_damage * int(profile.dot_duration / profile.dot_interval)
+            if record_timeline:
+                timeline.append((now, name))
+
+        return SimulationResult(
+            duration=duration,
+            ticks=steps,
+            decisions=idle + sum(casts),
+            damage=damage,
+            idle_time=idle * tick,
+            casts=self._cast_counts(casts),
+            timeline=timeline
+        )
+
+    def _cast_counts(self, casts: List[int]) -> Dict[str, int]:
+        """Sum per-slot cast counts by spell name"""
+        cast_counts: Dict[str, int] = {}
+        for name, count in zip(self.spell_names, casts):
+            cast_counts[name] = cast_counts.get(name, 0) + count
+        return cast_counts
@@ -0,0 +1,132 @@
+from typing import Iterable, Iterator, List, Union
+from collections.abc import MutableSequence
+from bisect import bisect_right
+
+class SpellList(MutableSequence):
+    """
+    Rotation spell sequence stored as a list of blocks
+    A spell's priority is its 1-based position. Positions are implicit, so
+    inserting, removing or moving a spell only touches one block and the
+    block offsets instead of renumbering every entry. Entries are stamped
+    with their current priority whenever they are read.
+    """
+
+    # Blocks are split when they grow past twice this size
+    BLOCK_SIZE = 64
+
+    __slots__ = ("_blocks", "_starts", "_len")
+
+    def __init__(self, entries: Iterable = ()):
+        items = list(entries)
+        size = self.BLOCK_SIZE
+        self._blocks: List[list] = [items[i:i + size] for i in range(0, len(items), size)]
+        self._starts: List[int] = list(range(0, len(items), size))
+        self._len = len(items)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        priority = 1
+        for block in self._blocks:
+            for entry in block:
+                entry.priority = priority
+                priority += 1
+                yield entry
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("spell index out of range")
+        return index
+
+    def _locate(self, index: int):
+        """Block number and offset within it of a (normalized) position"""
+        block = bisect_right(self._starts, index) - 1
+        return block, index - self._starts[block]
+
+    def _shift(self, block: int, delta: int) -> None:
+        starts = self._starts
+        for i in range(block + 1, len(starts)):
+            starts[i] += delta
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self)[index]
+        index = self._normalize(index)
+        block, offset = self._locate(index)
+        entry = self._blocks[block][offset]
+        entry.priority = index + 1
+        return entry
+
+    def __setitem__(self, index: int, entry) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = entry
+            self.__init__(items)
+            return
+        block, offset = self._locate(self._normalize(index))
+        self._blocks[block][offset] = entry
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self.__init__(items)
+            return
+        block, offset = self._locate(self._normalize(index))
+        entries = self._blocks[block]
+        del entries[offset]
+        self._len -= 1
+        if entries:
+            self._shift(block, -1)
+        else:
+            del self._blocks[block]
+            del self._starts[block]
+            self._shift(block - 1, -1)
+
+    def insert(self, index: int, entry) -> None:
+        """Insert before position index (clamped like list.insert)"""
+        if index < 0:
+            index = max(0, index + self._len)
+        index = min(index, self._len)
+        if not self._blocks:
+            self._blocks.append([entry])
+            self._starts.append(0)
+            self._len = 1
+            return
+        if index == self._len:
+            block = len(self._blocks) - 1
+            offset = len(self._blocks[block])
+        else:
+            block, offset = self._locate(index)
+        entries = self._blocks[block]
+        entries.insert(offset, entry)
+        self._len += 1
+        self._shift(block, 1)
+        size = self.BLOCK_SIZE
+        if len(entries) > 2 * size:
+            self._blocks[block:block + 1] = [entries[:size], entries[size:]]
+            self._starts.insert(block + 1, self._starts[block] + size)
+
+    def move(self, from_index: int, to_index: int) -> None:
+        """Move the entry at from_index so that it ends up at to_index"""
+        entry = self.pop(from_index)
+        self.insert(to_index, entry)
+
+    def clear(self) -> None:
+        self._blocks = []
+        self._starts = []
+        self._len = 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (SpellList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SpellList({list(self)!r})"
+
+    def __reduce__(self):
+        return (SpellList, (list(self),))
@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional, Tuple, Any
+from heapq import heappush, heappop
+import itertools
+import random
+from .rotation import Rotation
+from .simulator import Simulator, GameState, SpellProfile, SimulationResult
+from .resources import ResourceModel
+
+# Event kinds, in the order they are handled when they share a timestamp
+CAST_COMPLETE = 0
+DOT_TICK = 1
+AURA_EXPIRE = 2
+COOLDOWN_READY = 3
+GCD_READY = 4
+RECHECK = 5
+
+class EventSimulator(Simulator):
+    """
+    Discrete-event fight simulator
+    Jumps straight from event to event (cast completion, GCD and cooldown
+    readiness, aura expiry, DoT ticks) and only evaluates the rotation's
+    conditions at decision points. Takes the same arguments and returns the
+    same result as the fixed-tick Simulator; result.ticks counts events.
+    """
+
+    def __init__(self, rotation: Rotation, state: Optional[GameState] = None,
+                 profiles: Optional[Dict[str, SpellProfile]] = None, tick: float = 0.1,
+                 resource_model: Optional[ResourceModel] = None,
+                 recheck_interval: float = 0.5):
+        super().__init__(rotation, state=state, profiles=profiles, tick=tick,
+                         resource_model=resource_model)
+        # When nothing is castable, conditions on continuously changing values
+        # (e.g. target.health, regenerating resources) are re-checked at this interval
+        self.recheck_interval = recheck_interval
+        # DoT debuff name -> spell that applies it
+        self.dot_sources: Dict[str, str] = {}
+        for name in self.spell_names:
+            profile = self.profiles.get(name, self.DEFAULT_PROFILE)
+            if profile.dot:
+                self.dot_sources.setdefault(profile.dot, name)
+
+    def run(self, duration: float = 300.0, record_timeline: bool = False,
+            rng: Optional[random.Random] = None) -> SimulationResult:
+        """Simulate a fight of the given length in seconds"""
+        self._check_run(duration)
+        state = self._prepare_state()
+        decide = self.decide
+        names = self.spell_names
+        spell_index = self.spell_index
+        profiles = [self.profiles.get(name, self.DEFAULT_PROFILE) for name in names]
+        ready = state.spell_ready
+        casts = [0] * len(names)
+        timeline: List[Tuple[float, str]] = []
+        resources = state.resources
+        regenerate = self.resources.regenerate if self.resources.regen else None
+        regen_time = 0.0
+
+        start_health = state.target_health
+        health_rate = start_health / duration
+        max_health = state.target_health_max
+
+        heap: List[Tuple[float, int, int, Any]] = []
+        sequence = itertools.count()
+
+        def schedule(time: float, kind: int, payload: Any = None) -> None:
+            if time <= duration:
+                heappush(heap, (time, kind, next(sequence), payload))
+
+        schedule(0.0, GCD_READY)
+        busy_until = 0.0
+        casting = False
+        idle_since: Optional[float] = None
+        idle_time = 0.0
+        damage = 0.0
+        events = 0
+        decisions = 0
+
+        while heap:
+            now, kind, _, payload = heappop(heap)
+            events += 1
+
+            if kind == CAST_COMPLETE:
+                casting = False
+                state.player_casting = False
+                damage += self._land(state, profiles[payload], now, rng, schedule)
+            elif kind == DOT_TICK:
+                name, expires = payload
+                # A refreshed DoT starts a new tick chain; drop the old one
+                if state.target_debuffs.get(name) == expires and now <= expires:
+                    profile = profiles[spell_index[self.dot_sources[name]]]
+                    damage += profile.dot_damage
+                    schedule(now + profile.dot_interval, DOT_TICK, payload)
+
+            # Handle everything at this timestamp before deciding
+            if heap and heap[0][0] == now:
+                continue
+            # Events at the very end of the fight still land, but nothing new starts
+            if casting or now < busy_until or now >= duration:
+                continue
+
+            state.time = now
+            state.target_health = start_health - health_rate * now
+            state.target_health_actual = max_health * state.target_health / 100.0
+            if regenerate is not None:
+                regenerate(resources, now - regen_time)
+                regen_time = now
+            decisions += 1
+
+            index = decide(state)
+            if index < 0:
+                if idle_since is None:
+                    idle_since = now
+                if not heap or heap[0][0] > now + self.recheck_interval:
+                    schedule(now + self.recheck_interval, RECHECK)
+                continue
+
+            if idle_since is not None:
+                idle_time += now - idle_since
+                idle_since = None
+
+            name = names[index]
+            profile = profiles[index]
+            casts[index] += 1
+            state.cast_times[name] = now
+            state.player_lastcast = name
+            self.resources.apply(resources, index)
+            if record_timeline:
+                timeline.append((now, name))
+
+            if profile.cooldown > 0:
+                ready[spell_index[name]] = now + profile.cooldown
+                schedule(now + profile.cooldown, COOLDOWN_READY)
+            busy_until = now + max(profile.gcd, profile.cast_time)
+            schedule(busy_until, GCD_READY)
+
+            if profile.cast_time > 0:
+                casting = True
+                state.player_casting = True
+                schedule(now + profile.cast_time, CAST_COMPLETE, index)
+            else:
+                damage += self._land(state, profile, now, rng, schedule)
+
+        if idle_since is not None:
+            idle_time += duration - idle_since
+
+        return SimulationResult(
+            duration=duration,
+            ticks=events,
+            decisions=decisions,
+            damage=damage,
+            idle_time=idle_time,
+            casts=self._cast_counts(casts),
+            timeline=timeline
+        )
+
+    def _land(self, state: GameState, profile: SpellProfile, now: float,
+              rng: Optional[random.Random], schedule) -> float:
+        """Apply a finished cast: direct damage, procs and DoTs"""
+        damage = self._hit(state, profile, now, rng)
+        if profile.proc and state.player_buffs.get(profile.proc) == now + profile.proc_duration:
+            schedule(now + profile.proc_duration, AURA_EXPIRE, profile.proc)
+        if profile.dot:
+            expires = now + profile.dot_duration
+            state.target_debuffs[profile.dot] = expires
+            state.target_debuff_stacks[profile.dot] = 1
+            schedule(now + profile.dot_interval, DOT_TICK, (profile.dot, expires))
+            schedule(expires, AURA_EXPIRE, profile.dot)
+        return damage
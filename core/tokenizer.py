@@ -0,0 +1,214 @@
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, TextIO, Union
+import re
+
+class Token(NamedTuple):
+    kind: str       # name, string, number, op, comment or eof
+    value: Any
+    line: int
+
+# Leading whitespace is skipped as part of each token
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<block_comment>--\[(?P<comment_level>=*)\[.*?\](?P=comment_level)\])
+  | (?P<comment>--[^\n]*)
+  | (?P<long_string>\[(?P<string_level>=*)\[.*?\](?P=string_level)\])
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>\.\.\.|\.\.|==|~=|<=|>=|::|[{}()\[\],;=.+\-*/%^#<>:])
+)''', re.S | re.X)
+
+# Tokens ending this close to the end of the buffer may be longer once more is
+# read (0 -> 0x1F, 2.5 -> 2.5e1, . -> ..)
+_LOOKAHEAD = 8
+
+# Start of a long bracket; if the full comment/string did not match, more input is needed
+_LONG_OPEN = re.compile(r'(?:--)?\[=*\[')
+
+_ESCAPE = re.compile(r'\\(?:(\d{1,3})|x([0-9a-fA-F]{2})|u\{([0-9a-fA-F]+)\}|z\s*|(.))', re.S)
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v',
+            '\\': '\\', '"': '"', "'": "'", '\n': '\n'}
+
+def _unescape(match: re.Match) -> str:
+    decimal, hexadecimal, codepoint, char = match.groups()
+    if decimal:
+        return chr(int(decimal))
+    if hexadecimal:
+        return chr(int(hexadecimal, 16))
+    if codepoint:
+        return chr(int(codepoint, 16))
+    if char is None:
+        return ''   # \z skips following whitespace
+    if char not in _ESCAPES:
+        raise ValueError(f"Invalid escape sequence \\{char}")
+    return _ESCAPES[char]
+
+def _long_bracket_body(text: str) -> str:
+    """Contents of [[...]] / [==[...]==], dropping a leading newline like Lua does"""
+    level = text.index('[', 1) + 1
+    body = text[level:-level]
+    return body[1:] if body.startswith('\n') else body
+
+def tokenize(f: TextIO, chunk_size: int = 65536) -> Iterator[Token]:
+    """
+    Tokenize Lua source read from a text file object in chunks
+    Only a chunk or so (plus the longest single token) is held in memory.
+    """
+    buffer = ""
+    pos = 0
+    limit = -1
+    eof = False
+    line = 1
+    counted = 0     # newlines before this buffer position are included in line
+    match_token = _TOKEN.match
+    while True:
+        match = match_token(buffer, pos)
+        if match is not None:
+            kind = match.lastgroup
+            text = match.group(kind)
+            end = match.end()
+            start = end - len(text)
+            if not eof and (end > limit or (
+                    (text == '[' or kind == 'comment' and text.startswith('--['))
+                    and _LONG_OPEN.match(buffer, start))):
+                # The token may continue in the next chunk (or a long bracket
+                # has not been closed yet)
+                match = None
+        if match is None:
+            if eof:
+                rest = buffer[pos:]
+                if rest.strip():
+                    line += buffer.count('\n', counted, pos) + rest[:len(rest) - len(rest.lstrip())].count('\n')
+                    raise ValueError(f"Unexpected character {rest.strip()[0]!r} on line {line}")
+                yield Token('eof', None, line + buffer.count('\n', counted))
+                return
+            chunk = f.read(chunk_size)
+            line += buffer.count('\n', counted, pos)
+            buffer = buffer[pos:] + chunk
+            pos = counted = 0
+            limit = len(buffer) - _LOOKAHEAD
+            eof = not chunk
+            continue
+
+        line += buffer.count('\n', counted, start)
+        counted = start
+        pos = end
+        if kind == 'name' or kind == 'op':
+            yield Token(kind, text, line)
+        elif kind == 'string':
+            if '\\' in text:
+                yield Token('string', _ESCAPE.sub(_unescape, text[1:-1]), line)
+            else:
+                yield Token('string', text[1:-1], line)
+        elif kind == 'number':
+            if text[:2] in ('0x', '0X'):
+                value = int(text, 16)
+            elif text.isdigit():
+                value = int(text)
+            else:
+                value = float(text)
+            yield Token('number', value, line)
+        elif kind == 'comment':
+            yield Token('comment', text[2:].strip(), line)
+        elif kind == 'block_comment':
+            yield Token('comment', _long_bracket_body(text[2:]).strip(), line)
+        else:
+            yield Token('string', _long_bracket_body(text), line)
+
+class LuaReader:
+    """
+    Reads values from a Lua token stream in a single pass
+    Comments are skipped but collected until take_comments is called.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = 65536):
+        self._tokens = tokenize(f, chunk_size)
+        self._peeked: Optional[Token] = None
+        self.comments: List[str] = []
+
+    def peek(self) -> Token:
+        """Next non-comment token without consuming it"""
+        if self._peeked is None:
+            token = next(self._tokens)
+            while token.kind == 'comment':
+                self.comments.append(token.value)
+                token = next(self._tokens)
+            self._peeked = token
+        return self._peeked
+
+    def next(self) -> Token:
+        """Consume and return the next non-comment token"""
+        token = self.peek()
+        if token.kind != 'eof':
+            self._peeked = None
+        return token
+
+    def take_comments(self) -> List[str]:
+        """Return and forget the comments seen so far"""
+        comments, self.comments = self.comments, []
+        return comments
+
+    def accept(self, kind: str, value: Any = None) -> Optional[Token]:
+        """Consume the next token if it matches"""
+        token = self.peek()
+        if token.kind == kind and (value is None or token.value == value):
+            return self.next()
+        return None
+
+    def expect(self, kind: str, value: Any = None) -> Token:
+        """Consume the next token, which must match"""
+        token = self.accept(kind, value)
+        if token is None:
+            found = self.peek()
+            wanted = repr(value) if value is not None else kind
+            got = "end of input" if found.kind == 'eof' else repr(found.value)
+            raise ValueError(f"Expected {wanted} but found {got} on line {found.line}")
+        return token
+
+    def read_value(self) -> Any:
+        """Read a literal: string, number, boolean, nil or table constructor"""
+        token = self.peek()
+        if token.kind in ('string', 'number'):
+            return self.next().value
+        if token.kind == 'op' and token.value == '-':
+            self.next()
+            return -self.expect('number').value
+        if token.kind == 'op' and token.value == '{':
+            return self.read_table()
+        if token.kind == 'name' and token.value in ('true', 'false', 'nil'):
+            self.next()
+            return {'true': True, 'false': False, 'nil': None}[token.value]
+        got = "end of input" if token.kind == 'eof' else repr(token.value)
+        raise ValueError(f"Unsupported Lua value {got} on line {token.line}")
+
+    def read_table(self) -> Union[List[Any], Dict[Any, Any]]:
+        """
+        Read a table constructor
+        Returns a list if every field is positional, otherwise a dict (with
+        positional fields under 1, 2, ...).
+        """
+        self.expect('op', '{')
+        items: List[Any] = []
+        fields: Dict[Any, Any] = {}
+        while not self.accept('op', '}'):
+            token = self.peek()
+            if token.kind == 'op' and token.value == '[':
+                self.next()
+                key = self.read_value()
+                self.expect('op', ']')
+                self.expect('op', '=')
+                fields[key] = self.read_value()
+            elif token.kind == 'name' and token.value not in ('true', 'false', 'nil'):
+                self.next()
+                self.expect('op', '=')
+                fields[token.value] = self.read_value()
+            else:
+                items.append(self.read_value())
+            if not (self.accept('op', ',') or self.accept('op', ';')):
+                self.expect('op', '}')
+                break
+        if not fields:
+            return items
+        for index, item in enumerate(items, 1):
+            fields[index] = item
+        return fields
@@ -2,6 +2,7 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from .rotation import Rotation, SpellEntry
 import spell_data
+import spell_mechanics
 
 @dataclass
 class ValidationResult:
@@ -232,11 +233,14 @@ class RotationValidator:
         """Calculate AOE rotation coverage"""
         has_aoe_condition = False
         has_aoe_spells = False
+        mechanics = spell_mechanics.get_spec_mechanics(rotation.metadata.class_name,
+                                                       rotation.metadata.spec_name)
         
         for spell in rotation.spells:
             if "area.enemies" in spell.condition:
                 has_aoe_condition = True
-            # Add class-specific AOE spells check here
+            if spell.name in mechanics and mechanics[spell.name].aoe:
+                has_aoe_spells = True
             
         return 1.0 if has_aoe_condition and has_aoe_spells else 0.0
 
@@ -0,0 +1,144 @@
+from typing import Dict, List, Any, Callable, Sequence
+from conditions import (
+    ConditionValidator, ConditionNode, Literal, Number, Reference, Not, Compare, Logical
+)
+from .rotation import Rotation
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch evaluation
+    np = None
+
+_COMPARISONS = {
+    '>': lambda a, b: a > b,
+    '<': lambda a, b: a < b,
+    '>=': lambda a, b: a >= b,
+    '<=': lambda a, b: a <= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+def column_key(node: Reference) -> str:
+    """Column name for a reference, e.g. 'player.health' or 'player.buff(Name)'"""
+    if node.argument is None:
+        return node.path
+    return f"{node.path}({node.argument})"
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("NumPy is required for vectorized rotation evaluation")
+
+def _compile_values(node: ConditionNode) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a node into a function returning its raw column values"""
+    if isinstance(node, Number):
+        value = node.value
+        return lambda columns: value
+    if isinstance(node, Reference):
+        key = column_key(node)
+
+        def read(columns):
+            try:
+                return columns[key]
+            except KeyError:
+                raise KeyError(f"Missing state column: {key}") from None
+        return read
+    return _compile_mask(node)
+
+def _compile_mask(node: ConditionNode) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a node into a function returning a boolean mask (or scalar bool)"""
+    if isinstance(node, Literal):
+        value = node.value
+        return lambda columns: value
+    if isinstance(node, Reference):
+        read = _compile_values(node)
+        return lambda columns: np.asarray(read(columns)) != 0
+    if isinstance(node, Not):
+        operand = _compile_mask(node.operand)
+        return lambda columns: np.logical_not(operand(columns))
+    if isinstance(node, Logical):
+        left = _compile_mask(node.left)
+        right = _compile_mask(node.right)
+        combine = np.logical_and if node.op == '&&' else np.logical_or
+        return lambda columns: combine(left(columns), right(columns))
+    if isinstance(node, Compare):
+        left = _compile_values(node.left)
+        right = _compile_values(node.right)
+        compare = _COMPARISONS[node.op]
+        return lambda columns: compare(left(columns), right(columns))
+    raise TypeError(f"Unsupported condition node: {node!r}")
+
+def state_grid(axes: Dict[str, Sequence[Any]]) -> Dict[str, Any]:
+    """
+    Build columnar states covering every combination of the given axes
+    e.g. {'target.health': range(101), 'area.enemies': range(1, 11)}
+    """
+    _require_numpy()
+    keys = list(axes)
+    grids = np.meshgrid(*[np.asarray(axes[key]) for key in keys], indexing='ij')
+    return {key: grid.ravel() for key, grid in zip(keys, grids)}
+
+class BatchEvaluator:
+    """Evaluates a rotation's priority list over columnar batches of game states"""
+
+    def __init__(self, rotation: Rotation):
+        _require_numpy()
+        self.rotation = rotation
+        self.spells = [spell for spell in rotation.spells if spell.enabled]
+        self.masks = [_compile_mask(ConditionValidator.parse(spell.condition))
+                      for spell in self.spells]
+
+    def columns_required(self) -> List[str]:
+        """List the state columns referenced by the rotation's conditions"""
+        keys: List[str] = []
+
+        def walk(node):
+            if isinstance(node, Reference):
+                key = column_key(node)
+                if key not in keys:
+                    keys.append(key)
+            elif isinstance(node, Not):
+                walk(node.operand)
+            elif isinstance(node, (Logical, Compare)):
+                walk(node.left)
+                walk(node.right)
+
+        for spell in self.spells:
+            walk(ConditionValidator.parse(spell.condition))
+        return keys
+
+    def evaluate(self, columns: Dict[str, Any]) -> List[Any]:
+        """Return one boolean mask per enabled spell, in priority order"""
+        size = self._batch_size(columns)
+        arrays = {key: np.asarray(value) for key, value in columns.items()}
+        return [np.broadcast_to(mask(arrays), (size,)) for mask in self.masks]
+
+    def select(self, columns: Dict[str, Any]) -> Any:
+        """
+        Return, for each state, the index into self.spells of the spell the
+        priority list picks, or -1 where no condition holds
+        """
+        size = self._batch_size(columns)
+        arrays = {key: np.asarray(value) for key, value in columns.items()}
+        chosen = np.full(size, -1, dtype=np.int32)
+        undecided = np.ones(size, dtype=bool)
+
+        for index, mask in enumerate(self.masks):
+            hit = np.broadcast_to(mask(arrays), (size,)) & undecided
+            chosen[hit] = index
+            undecided &= ~hit
+            if not undecided.any():
+                break
+        return chosen
+
+    def select_names(self, columns: Dict[str, Any]) -> Any:
+        """Like select() but returns spell names (None where nothing is picked)"""
+        names = np.array([spell.name for spell in self.spells] + [None], dtype=object)
+        return names[self.select(columns)]
+
+    @staticmethod
+    def _batch_size(columns: Dict[str, Any]) -> int:
+        """Determine the number of states in a batch"""
+        sizes = {np.size(value) for value in columns.values() if np.ndim(value) > 0}
+        if len(sizes) > 1:
+            raise ValueError(f"State columns have different lengths: {sorted(sizes)}")
+        return sizes.pop() if sizes else 1
@@ -6,6 +6,7 @@ This module provides class, specialization, and spell data for World of Warcraft
 
 import os
 import json
+from types import MappingProxyType
 
 # Class to Spec ID mapping (from SOE Engine documentation)
 SPEC_IDS = {
@@ -327,15 +328,32 @@ SPELL_DATA = {
     }
 }
 
+# Lookup tables built once from SPEC_IDS and SPELL_DATA at import time
+SPEC_BY_ID = MappingProxyType({
+    spec_id: (class_name, spec_name)
+    for class_name, specs in SPEC_IDS.items()
+    for spec_name, spec_id in specs.items()
+})
+_CLASSES = tuple(sorted(SPEC_IDS))
+_SPECS = MappingProxyType({
+    class_name: tuple(sorted(specs)) for class_name, specs in SPEC_IDS.items()
+})
+_SPELL_SETS = MappingProxyType({
+    (class_name, spec_name): frozenset(spells)
+    for class_name, specs in SPELL_DATA.items()
+    for spec_name, spells in specs.items()
+})
+_SORTED_SPELLS = MappingProxyType({
+    key: tuple(sorted(spells)) for key, spells in _SPELL_SETS.items()
+})
+
 def get_available_classes():
-    """Get a list of available classes."""
-    return sorted(SPEC_IDS.keys())
+    """Get a sorted tuple of available classes."""
+    return _CLASSES
 
 def get_specs_for_class(class_name):
-    """Get a list of specializations for a given class."""
-    if class_name in SPEC_IDS:
-        return sorted(SPEC_IDS[class_name].keys())
-    return []
+    """Get a sorted tuple of specializations for a given class."""
+    return _SPECS.get(class_name, ())
 
 def get_spec_id(class_name, spec_name):
     """Get the specialization ID for a given class and spec."""
@@ -343,11 +361,18 @@ def get_spec_id(class_name, spec_name):
         return SPEC_IDS[class_name][spec_name]
     return None
 
+def get_class_spec(spec_id):
+    """Get the (class, spec) pair for a specialization ID, or None if unknown."""
+    return SPEC_BY_ID.get(spec_id)
+
 def get_spells_for_spec(class_name, spec_name):
-    """Get a list of spells for a given class and spec."""
-    if class_name in SPELL_DATA and spec_name in SPELL_DATA[class_name]:
-        return sorted(SPELL_DATA[class_name][spec_name])
-    return []
+    """Get a sorted tuple of spells for a given class and spec."""
+    return _SORTED_SPELLS.get((class_name, spec_name), ())
+
+def spec_has_spell(class_name, spec_name, spell_name):
+    """Check whether a spell is available to a given class and spec."""
+    spells = _SPELL_SETS.get((class_name, spec_name))
+    return spells is not None and spell_name in spells
 
 def save_user_spell_data(spell_data, filename="user_spell_data.json"):
     """Save custom user spell data."""
@@ -0,0 +1,506 @@
+"""
+Spell mechanics database for SOE Engine Rotation Creator.
+
+Cooldowns, cast times, costs and other mechanics are stored in a compact
+binary file with a per-spec offset index. The file is memory-mapped and only
+the records of the specs that are actually used are decoded.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import spell_data
+import core.resources
+from core.resources import RESOURCES, RESOURCE_MODELS, SPEND_ALL
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spell_mechanics.bin")
+
+SCHOOLS = ("Physical", "Holy", "Fire", "Nature", "Frost", "Shadow", "Arcane")
+SPELL_TYPES = ("Damage", "Healing", "Defense", "Cooldown", "Utility")
+# Stored as an index into this tuple; "" means the spell is free
+COST_RESOURCES = ("",) + RESOURCES
+
+_MAGIC = b"SOEM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHH")            # magic, version, spec count
+_INDEX_ENTRY = struct.Struct("<HIIH")       # spec id, offset, byte length, record count
+# cooldown, cast time, gcd, cost, cost resource, charges, school, type, flags
+_RECORD = struct.Struct("<ffffBBBBB")
+_FLAG_AOE = 0x01
+
+@dataclass(frozen=True)
+class SpellMechanics:
+    """Mechanics of a single spell"""
+    name: str
+    cooldown: float = 0.0
+    cast_time: float = 0.0
+    gcd: float = 1.5
+    cost: float = 0.0
+    resource: str = ""
+    charges: int = 1
+    school: str = "Physical"
+    spell_type: str = "Utility"
+    aoe: bool = False
+
+def _encode(spell: SpellMechanics) -> bytes:
+    name = spell.name.encode('utf-8')
+    if len(name) > 255:
+        raise ValueError(f"Spell name too long: {spell.name}")
+    flags = _FLAG_AOE if spell.aoe else 0
+    return bytes((len(name),)) + name + _RECORD.pack(
+        spell.cooldown, spell.cast_time, spell.gcd, spell.cost,
+        COST_RESOURCES.index(spell.resource), spell.charges,
+        SCHOOLS.index(spell.school), SPELL_TYPES.index(spell.spell_type), flags
+    )
+
+def write_database(path: str, specs: Dict[int, List[SpellMechanics]]) -> None:
+    """Write spell mechanics, grouped by spec ID, to a binary database file"""
+    blocks = []
+    for spec_id in sorted(specs):
+        blocks.append((spec_id, b"".join(_encode(spell) for spell in specs[spec_id]),
+                       len(specs[spec_id])))
+
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(blocks)
+    index = []
+    for spec_id, block, count in blocks:
+        index.append(_INDEX_ENTRY.pack(spec_id, offset, len(block), count))
+        offset += len(block)
+
+    # A unique temp file, so processes rebuilding the database at once do not
+    # replace each other's half-written files
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path), suffix=".tmp",
+                                     dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(blocks)))
+            f.write(b"".join(index))
+            for _, block, _ in blocks:
+                f.write(block)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+class SpellMechanicsDB:
+    """
+    Read-only view of a spell mechanics database file
+    Opening only reads the header and index; a spec's records are decoded
+    the first time they are requested
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"Not a spell mechanics database: {path}")
+        self._index: Dict[int, tuple] = {}
+        for i in range(count):
+            spec_id, offset, length, records = _INDEX_ENTRY.unpack_from(
+                self._map, _HEADER.size + i * _INDEX_ENTRY.size)
+            self._index[spec_id] = (offset, length, records)
+        self._specs: Dict[int, Dict[str, SpellMechanics]] = {}
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'SpellMechanicsDB':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def spec_ids(self) -> List[int]:
+        """Spec IDs present in the database"""
+        return sorted(self._index)
+
+    def get_spec(self, class_name: str, spec_name: str) -> Dict[str, SpellMechanics]:
+        """Mechanics of every spell of a spec, keyed by spell name"""
+        spec_id = spell_data.get_spec_id(class_name, spec_name)
+        if spec_id is None:
+            return {}
+        return self.get_spec_by_id(spec_id)
+
+    def get_spec_by_id(self, spec_id: int) -> Dict[str, SpellMechanics]:
+        """Mechanics of every spell of a spec ID, decoding it on first use"""
+        spells = self._specs.get(spec_id)
+        if spells is None:
+            spells = self._decode(spec_id)
+            self._specs[spec_id] = spells
+        return spells
+
+    def get(self, class_name: str, spec_name: str, spell_name: str) -> Optional[SpellMechanics]:
+        """Mechanics of one spell, or None if it is unknown"""
+        return self.get_spec(class_name, spec_name).get(spell_name)
+
+    def _decode(self, spec_id: int) -> Dict[str, SpellMechanics]:
+        if spec_id not in self._index:
+            return {}
+        offset, length, count = self._index[spec_id]
+        data = self._map
+        position = offset
+        spells: Dict[str, SpellMechanics] = {}
+        for _ in range(count):
+            name_length = data[position]
+            name = data[position + 1:position + 1 + name_length].decode('utf-8')
+            position += 1 + name_length
+            (cooldown, cast_time, gcd, cost, resource, charges,
+             school, spell_type, flags) = _RECORD.unpack_from(data, position)
+            position += _RECORD.size
+            spells[name] = SpellMechanics(
+                name=name,
+                cooldown=round(cooldown, 3),
+                cast_time=round(cast_time, 3),
+                gcd=round(gcd, 3),
+                cost=round(cost, 3),
+                resource=COST_RESOURCES[resource],
+                charges=charges,
+                school=SCHOOLS[school],
+                spell_type=SPELL_TYPES[spell_type],
+                aoe=bool(flags & _FLAG_AOE)
+            )
+        if position != offset + length:
+            raise ValueError(f"Corrupt spell mechanics block for spec {spec_id}")
+        return spells
+
+# Default mechanics for WoW 5.4.8; anything not listed uses the SpellMechanics defaults
+_COOLDOWNS = {
+    # Mage
+    "Arcane Power": 90, "Evocation": 120, "Blink": 15, "Frost Nova": 25, "Presence of Mind": 90,
+    "Time Warp": 300, "Mirror Image": 180, "Invisibility": 300, "Counterspell": 24,
+    "Ice Block": 300, "Fire Blast": 8, "Combustion": 45, "Dragon's Breath": 20,
+    "Blast Wave": 25, "Frozen Orb": 60, "Icy Veins": 180, "Cone of Cold": 10,
+    "Ice Barrier": 25, "Cold Snap": 180,
+    # Paladin
+    "Holy Shock": 6, "Divine Shield": 300, "Divine Protection": 60, "Lay on Hands": 600,
+    "Hand of Protection": 300, "Hand of Freedom": 25, "Hand of Sacrifice": 120,
+    "Hand of Salvation": 120, "Holy Prism": 20, "Judgment": 6, "Hammer of Justice": 60,
+    "Turn Evil": 15, "Divine Plea": 120, "Avenger's Shield": 15, "Consecration": 9,
+    "Hammer of the Righteous": 4.5, "Holy Wrath": 9, "Guardian of Ancient Kings": 180,
+    "Ardent Defender": 180, "Light's Hammer": 60, "Crusader Strike": 4.5,
+    "Hammer of Wrath": 6, "Exorcism": 15, "Execution Sentence": 60, "Avenging Wrath": 180,
+    "Shield of the Righteous": 1.5,
+    # Warrior
+    "Mortal Strike": 6, "Colossus Smash": 20, "Sweeping Strikes": 10, "Bladestorm": 60,
+    "Die by the Sword": 120, "Battle Shout": 60, "Commanding Shout": 60, "Charge": 20,
+    "Heroic Leap": 45, "Rallying Cry": 180, "Intervene": 30, "Spell Reflection": 25,
+    "Shield Wall": 300, "Pummel": 15, "Intimidating Shout": 90, "Berserker Rage": 30,
+    "Bloodthirst": 4.5, "Recklessness": 300, "Shield Slam": 6, "Revenge": 9,
+    "Thunder Clap": 6, "Shield Block": 9, "Demoralizing Shout": 60, "Last Stand": 180,
+    # Druid
+    "Starsurge": 15, "Starfall": 90, "Wild Mushroom: Detonate": 10, "Celestial Alignment": 180,
+    "Force of Nature": 60, "Barkskin": 60, "Innervate": 180, "Rebirth": 600,
+    "Tranquility": 480, "Solar Beam": 60, "Typhoon": 30, "Nature's Swiftness": 60,
+    "Tiger's Fury": 30, "Berserk": 180, "Maim": 10, "Skull Bash": 15, "Mangle": 6,
+    "Thrash": 6, "Savage Defense": 9, "Frenzied Regeneration": 1.5,
+    "Survival Instincts": 180, "Incarnation: Son of Ursoc": 180, "Swiftmend": 15,
+    "Wild Growth": 8, "Ironbark": 60,
+    # Death Knight
+    "Outbreak": 60, "Soul Reaper": 6, "Dancing Rune Weapon": 90, "Rune Tap": 30,
+    "Vampiric Blood": 60, "Icebound Fortitude": 180, "Anti-Magic Shell": 45,
+    "Death Grip": 25, "Mind Freeze": 15, "Strangulate": 60, "Army of the Dead": 600,
+    "Raise Dead": 120, "Dark Command": 8, "Death's Advance": 30,
+    "Empower Rune Weapon": 300, "Horn of Winter": 20, "Pillar of Frost": 60,
+    "Remorseless Winter": 60, "Summon Gargoyle": 180,
+    # Hunter
+    "Kill Command": 6, "Focus Fire": 15, "Bestial Wrath": 60, "Dire Beast": 30,
+    "Rapid Fire": 180, "Disengage": 20, "Deterrence": 180, "Freezing Trap": 30,
+    "Snake Trap": 30, "Explosive Trap": 30, "Ice Trap": 30, "Flare": 20, "Feign Death": 30,
+    "Misdirection": 30, "Counter Shot": 24, "Chimera Shot": 9, "Murder of Crows": 60,
+    "Explosive Shot": 6, "Black Arrow": 30,
+    # Priest
+    "Penance": 9, "Prayer of Mending": 10, "Power Word: Barrier": 180,
+    "Pain Suppression": 180, "Inner Focus": 45, "Archangel": 30, "Mass Dispel": 15,
+    "Purify": 8, "Leap of Faith": 90, "Fear Ward": 180, "Fade": 30, "Psychic Scream": 30,
+    "Divine Hymn": 180, "Holy Fire": 10, "Circle of Healing": 10,
+    "Holy Word: Sanctuary": 40, "Guardian Spirit": 180, "Chakra": 30, "Mind Blast": 8,
+    "Shadow Word: Death": 8, "Shadowfiend": 180, "Dispersion": 120, "Psychic Horror": 45,
+    # Rogue
+    "Vendetta": 120, "Sprint": 60, "Vanish": 120, "Cloak of Shadows": 60, "Evasion": 120,
+    "Combat Readiness": 120, "Shadow Step": 20, "Feint": 10, "Kick": 15, "Blind": 90,
+    "Tricks of the Trade": 30, "Kidney Shot": 20, "Adrenaline Rush": 180,
+    "Killing Spree": 120, "Blade Flurry": 10, "Shadow Dance": 60, "Premeditation": 20,
+    # Shaman
+    "Flame Shock": 6, "Earth Shock": 6, "Lava Burst": 8, "Earthquake": 10,
+    "Elemental Blast": 12, "Thunderstorm": 45, "Ascendance": 180,
+    "Spiritwalker's Grace": 120, "Fire Elemental Totem": 300, "Earth Elemental Totem": 300,
+    "Healing Stream Totem": 30, "Healing Tide Totem": 180, "Grounding Totem": 25,
+    "Capacitor Totem": 45, "Wind Shear": 12, "Stormstrike": 8, "Lava Lash": 10,
+    "Feral Spirit": 120, "Riptide": 6, "Healing Rain": 10, "Spirit Link Totem": 180,
+    "Chain Lightning": 3,
+    # Warlock
+    "Haunt": 8, "Soulburn": 1, "Dark Soul: Misery": 120, "Howl of Terror": 40,
+    "Mortal Coil": 45, "Unending Resolve": 180, "Dark Bargain": 180, "Soulshatter": 120,
+    "Summon Doomguard": 600, "Summon Infernal": 600, "Hand of Gul'dan": 15,
+    "Metamorphosis": 10, "Chaos Wave": 15, "Dark Soul: Knowledge": 120,
+    "Conflagrate": 12, "Shadowburn": 1, "Havoc": 25, "Dark Soul: Instability": 120,
+    # Monk
+    "Keg Smash": 8, "Guard": 30, "Purifying Brew": 1,
+    "Fortifying Brew": 180, "Zen Sphere": 10, "Chi Wave": 15, "Leg Sweep": 45,
+    "Rushing Jade Wind": 6, "Spear Hand Strike": 15, "Elusive Brew": 9, "Expel Harm": 15,
+    "Roll": 20, "Flying Serpent Kick": 25, "Touch of Death": 90, "Paralysis": 15,
+    "Rising Sun Kick": 8, "Fists of Fury": 25, "Energizing Brew": 60,
+    "Tiger's Lust": 30, "Touch of Karma": 90, "Chi Burst": 30, "Life Cocoon": 120,
+    "Revival": 180, "Thunder Focus Tea": 45,
+}
+
+_CAST_TIMES = {
+    "Arcane Blast": 2.0, "Arcane Missiles": 2.0, "Fireball": 2.25, "Pyroblast": 3.5,
+    "Frostbolt": 2.0, "Frostfire Bolt": 2.75, "Scorch": 1.5, "Polymorph": 1.5,
+    "Evocation": 6.0, "Flamestrike": 2.0, "Blizzard": 8.0,
+    "Holy Light": 2.5, "Divine Light": 2.5, "Holy Radiance": 2.5,
+    "Wrath": 2.0, "Starfire": 2.7, "Starsurge": 2.0, "Hurricane": 10.0,
+    "Healing Touch": 2.5, "Regrowth": 1.5, "Rebirth": 2.0, "Cyclone": 1.5,
+    "Entangling Roots": 1.7, "Hibernate": 1.5,
+    "Steady Shot": 2.0, "Cobra Shot": 2.0, "Aimed Shot": 2.5, "Rapid Fire": 3.0,
+    "Flash Heal": 1.5, "Greater Heal": 2.5, "Heal": 2.5, "Binding Heal": 1.5,
+    "Prayer of Healing": 2.5, "Smite": 1.5, "Holy Fire": 1.5, "Mind Blast": 1.5,
+    "Mind Flay": 3.0, "Vampiric Touch": 1.5, "Mind Spike": 1.5, "Penance": 2.0,
+    "Divine Hymn": 8.0,
+    "Lightning Bolt": 2.5, "Chain Lightning": 2.0, "Lava Burst": 2.0,
+    "Elemental Blast": 2.0, "Healing Wave": 2.5, "Healing Surge": 1.5,
+    "Greater Healing Wave": 2.5, "Chain Heal": 2.5, "Healing Rain": 2.0,
+    "Malefic Grasp": 4.0, "Haunt": 1.5, "Drain Soul": 6.0, "Unstable Affliction": 1.5,
+    "Seed of Corruption": 2.0, "Fear": 1.7, "Shadow Bolt": 1.7, "Soul Fire": 4.0,
+    "Hellfire": 14.0, "Incinerate": 2.0, "Immolate": 1.5,
+    "Chaos Bolt": 2.5, "Rain of Fire": 6.0, "Create Healthstone": 3.0,
+    "Summon Felhunter": 6.0, "Summon Voidwalker": 6.0, "Summon Imp": 6.0,
+    "Summon Succubus": 6.0, "Summon Felguard": 6.0, "Health Funnel": 3.0,
+    "Soothing Mist": 8.0, "Enveloping Mist": 2.0, "Surging Mist": 1.5,
+    "Fists of Fury": 4.0, "Spinning Crane Kick": 2.0,
+}
+
+_CHARGES = {"Fire Blast": 1, "Roll": 2, "Wild Mushroom": 3, "Charge": 1, "Holy Shock": 1}
+
+# Spells that are not on the global cooldown
+_OFF_GCD = {
+    "Arcane Power", "Presence of Mind", "Combustion", "Icy Veins", "Cold Snap",
+    "Counterspell", "Time Warp", "Ice Block", "Divine Protection", "Avenging Wrath",
+    "Shield of the Righteous", "Guardian of Ancient Kings", "Ardent Defender", "Divine Plea",
+    "Bloodthirst", "Colossus Smash", "Recklessness", "Berserker Rage", "Die by the Sword",
+    "Shield Block", "Shield Barrier", "Shield Wall", "Last Stand", "Pummel", "Heroic Leap",
+    "Spell Reflection", "Intervene", "Rallying Cry", "Sweeping Strikes",
+    "Barkskin", "Tiger's Fury", "Berserk", "Savage Defense", "Survival Instincts",
+    "Skull Bash", "Nature's Swiftness", "Ironbark", "Celestial Alignment",
+    "Rune Tap", "Vampiric Blood", "Icebound Fortitude", "Anti-Magic Shell", "Mind Freeze",
+    "Empower Rune Weapon", "Pillar of Frost", "Dancing Rune Weapon",
+    "Bestial Wrath", "Rapid Fire", "Deterrence", "Counter Shot", "Feign Death",
+    "Misdirection", "Disengage", "Pain Suppression", "Inner Focus", "Fade",
+    "Guardian Spirit", "Chakra", "Dispersion", "Vendetta", "Sprint", "Vanish",
+    "Cloak of Shadows", "Evasion", "Combat Readiness", "Kick", "Tricks of the Trade",
+    "Adrenaline Rush", "Blade Flurry", "Shadow Dance", "Premeditation",
+    "Wind Shear", "Ascendance", "Spiritwalker's Grace", "Soulburn",
+    "Dark Soul: Misery", "Dark Soul: Knowledge", "Dark Soul: Instability",
+    "Unending Resolve", "Dark Bargain", "Soulshatter", "Guard", "Purifying Brew",
+    "Fortifying Brew", "Spear Hand Strike", "Elusive Brew", "Energizing Brew",
+    "Touch of Karma", "Life Cocoon", "Thunder Focus Tea", "Metamorphosis",
+}
+
+_AOE_SPELLS = {
+    "Arcane Explosion", "Flamestrike", "Blizzard", "Frozen Orb", "Cone of Cold",
+    "Dragon's Breath", "Blast Wave", "Frost Nova", "Living Bomb",
+    "Holy Radiance", "Light of Dawn", "Consecration", "Hammer of the Righteous",
+    "Holy Wrath", "Light's Hammer", "Avenger's Shield", "Holy Prism",
+    "Thunder Clap", "Whirlwind", "Sweeping Strikes", "Bladestorm",
+    "Hurricane", "Starfall", "Wild Mushroom: Detonate", "Thrash", "Typhoon",
+    "Wild Growth", "Wild Mushroom: Bloom", "Tranquility",
+    "Blood Boil", "Howling Blast", "Remorseless Winter", "Army of the Dead",
+    "Multi-Shot", "Explosive Trap",
+    "Prayer of Healing", "Circle of Healing", "Holy Word: Sanctuary", "Divine Hymn",
+    "Psychic Scream", "Mind Sear",
+    "Fan of Knives", "Crimson Tempest", "Blade Flurry", "Killing Spree",
+    "Chain Lightning", "Earthquake", "Thunderstorm", "Chain Heal", "Healing Rain",
+    "Healing Tide Totem",
+    "Seed of Corruption", "Hellfire", "Chaos Wave", "Rain of Fire", "Howl of Terror",
+    "Havoc",
+    "Spinning Crane Kick", "Rushing Jade Wind", "Breath of Fire", "Keg Smash",
+    "Fists of Fury", "Leg Sweep", "Chi Burst", "Revival",
+}
+
+_TYPES = {
+    "Cooldown": {
+        "Arcane Power", "Presence of Mind", "Time Warp", "Mirror Image", "Combustion",
+        "Icy Veins", "Cold Snap", "Evocation", "Avenging Wrath", "Divine Plea",
+        "Guardian of Ancient Kings", "Bladestorm", "Recklessness", "Berserker Rage",
+        "Sweeping Strikes", "Celestial Alignment", "Force of Nature", "Tiger's Fury",
+        "Berserk", "Nature's Swiftness", "Incarnation: Son of Ursoc", "Innervate",
+        "Dancing Rune Weapon", "Pillar of Frost", "Empower Rune Weapon", "Summon Gargoyle",
+        "Dark Transformation", "Army of the Dead", "Raise Dead", "Bestial Wrath",
+        "Focus Fire", "Rapid Fire", "Dire Beast", "Inner Focus", "Archangel",
+        "Shadowfiend", "Chakra", "Vendetta", "Adrenaline Rush", "Killing Spree",
+        "Shadow Dance", "Ascendance", "Fire Elemental Totem", "Earth Elemental Totem",
+        "Feral Spirit", "Dark Soul: Misery", "Dark Soul: Knowledge",
+        "Dark Soul: Instability", "Summon Doomguard", "Summon Infernal", "Metamorphosis",
+        "Storm, Earth, and Fire", "Energizing Brew", "Thunder Focus Tea", "Soulburn",
+    },
+    "Defense": {
+        "Ice Block", "Ice Barrier", "Divine Shield", "Divine Protection", "Ardent Defender",
+        "Die by the Sword", "Shield Wall", "Shield Block", "Shield Barrier", "Last Stand",
+        "Rallying Cry", "Spell Reflection", "Barkskin", "Savage Defense",
+        "Frenzied Regeneration", "Survival Instincts", "Ironbark", "Icebound Fortitude",
+        "Anti-Magic Shell", "Vampiric Blood", "Rune Tap", "Deterrence", "Power Word: Shield",
+        "Power Word: Barrier", "Pain Suppression", "Dispersion", "Guardian Spirit",
+        "Cloak of Shadows", "Evasion", "Combat Readiness", "Feint", "Unending Resolve",
+        "Dark Bargain", "Guard", "Purifying Brew", "Fortifying Brew", "Elusive Brew",
+        "Touch of Karma", "Life Cocoon", "Spirit Link Totem", "Hand of Protection",
+        "Hand of Sacrifice", "Lay on Hands", "Spirit Shell", "Divine Aegis",
+    },
+    "Healing": {
+        "Holy Light", "Divine Light", "Holy Shock", "Word of Glory", "Holy Radiance",
+        "Light of Dawn", "Beacon of Light", "Rejuvenation", "Healing Touch", "Regrowth",
+        "Lifebloom", "Wild Growth", "Swiftmend", "Tranquility", "Wild Mushroom: Bloom",
+        "Penance", "Prayer of Mending", "Flash Heal", "Greater Heal", "Prayer of Healing",
+        "Divine Hymn", "Heal", "Binding Heal", "Circle of Healing", "Holy Word: Sanctuary",
+        "Renew", "Healing Wave", "Healing Surge", "Greater Healing Wave", "Chain Heal",
+        "Riptide", "Healing Rain", "Healing Stream Totem", "Healing Tide Totem",
+        "Earth Shield", "Soothing Mist", "Enveloping Mist", "Surging Mist",
+        "Renewing Mist", "Revival", "Expel Harm", "Recuperate", "Victory Rush",
+        "Death Strike", "Health Funnel", "Create Healthstone", "Zen Sphere", "Chi Wave",
+        "Chi Burst",
+    },
+    "Utility": {
+        "Blink", "Frost Nova", "Slow", "Arcane Brilliance", "Invisibility",
+        "Conjure Mana Gem", "Counterspell", "Spellsteal", "Remove Curse", "Polymorph",
+        "Molten Armor", "Frost Armor", "Blessing of Kings", "Blessing of Might",
+        "Hand of Freedom", "Hand of Salvation", "Devotion Aura", "Hammer of Justice",
+        "Turn Evil", "Battle Shout", "Commanding Shout", "Charge", "Heroic Leap",
+        "Hamstring", "Intervene", "Pummel", "Intimidating Shout", "Demoralizing Shout",
+        "Cat Form", "Bear Form", "Mark of the Wild", "Rebirth", "Cyclone",
+        "Entangling Roots", "Hibernate", "Solar Beam", "Skull Bash", "Symbiosis",
+        "Faerie Fire", "Death Grip", "Mind Freeze", "Strangulate", "Dark Command",
+        "Death's Advance", "Horn of Winter", "Disengage", "Concussive Shot",
+        "Freezing Trap", "Snake Trap", "Ice Trap", "Flare", "Feign Death", "Misdirection",
+        "Tranquilizing Shot", "Counter Shot", "Aspect of the Hawk", "Aspect of the Cheetah",
+        "Aspect of the Pack", "Dispel Magic", "Mass Dispel", "Purify", "Leap of Faith",
+        "Fear Ward", "Fade", "Psychic Scream", "Power Word: Fortitude", "Psychic Horror",
+        "Slice and Dice", "Sprint", "Vanish", "Shadow Step", "Kick", "Blind",
+        "Tricks of the Trade", "Kidney Shot", "Cheap Shot", "Sap", "Distract", "Stealth",
+        "Premeditation", "Spiritwalker's Grace", "Grounding Totem", "Capacitor Totem",
+        "Wind Shear", "Ghost Wolf", "Water Walking", "Water Breathing", "Water Shield",
+        "Thunderstorm", "Life Tap", "Fear", "Howl of Terror", "Mortal Coil",
+        "Demonic Circle: Teleport", "Soulshatter", "Fel Armor", "Summon Felhunter",
+        "Summon Voidwalker", "Summon Imp", "Summon Succubus", "Summon Felguard", "Havoc",
+        "Leg Sweep", "Spear Hand Strike", "Detox", "Roll", "Flying Serpent Kick",
+        "Tiger's Lust", "Paralysis", "Legacy of the Emperor", "Legacy of the White Tiger",
+        "Summon Black Ox Statue", "Savage Roar", "Inquisition", "Typhoon", "Maim",
+    },
+}
+
+# Default school per class, with per-spec overrides
+_CLASS_SCHOOLS = {
+    "Mage": "Arcane", "Paladin": "Holy", "Warrior": "Physical", "Druid": "Nature",
+    "Death Knight": "Frost", "Hunter": "Physical", "Priest": "Holy", "Rogue": "Physical",
+    "Shaman": "Nature", "Warlock": "Shadow", "Monk": "Physical",
+}
+_SPEC_SCHOOLS = {
+    ("Mage", "Fire"): "Fire", ("Mage", "Frost"): "Frost",
+    ("Paladin", "Protection"): "Physical", ("Paladin", "Retribution"): "Physical",
+    ("Druid", "Feral"): "Physical", ("Druid", "Guardian"): "Physical",
+    ("Death Knight", "Blood"): "Physical", ("Death Knight", "Unholy"): "Shadow",
+    ("Priest", "Shadow"): "Shadow", ("Warlock", "Destruction"): "Fire",
+}
+_SPELL_SCHOOLS = {
+    "Starfire": "Arcane", "Starsurge": "Arcane", "Moonfire": "Arcane", "Starfall": "Arcane",
+    "Flame Shock": "Fire", "Lava Burst": "Fire", "Lava Lash": "Fire", "Searing Totem": "Fire",
+    "Frost Nova": "Frost", "Blink": "Arcane", "Counterspell": "Arcane",
+    "Explosive Shot": "Fire", "Black Arrow": "Shadow", "Serpent Sting": "Nature",
+    "Arcane Shot": "Arcane", "Chimera Shot": "Nature", "Holy Fire": "Holy", "Smite": "Holy",
+    "Death Coil": "Shadow", "Outbreak": "Shadow", "Soul Reaper": "Shadow",
+    "Howling Blast": "Frost", "Frost Strike": "Frost", "Remorseless Winter": "Frost",
+    "Incinerate": "Fire", "Immolate": "Fire", "Conflagrate": "Fire", "Chaos Bolt": "Fire",
+    "Rain of Fire": "Fire", "Soul Fire": "Fire", "Hellfire": "Fire",
+    "Consecration": "Holy", "Holy Wrath": "Holy", "Avenger's Shield": "Holy",
+    "Exorcism": "Holy", "Judgment": "Holy", "Hammer of Wrath": "Holy",
+    "Templar's Verdict": "Holy", "Envenom": "Nature", "Rupture": "Physical",
+    "Chi Wave": "Nature", "Zen Sphere": "Nature", "Chi Burst": "Nature",
+    "Breath of Fire": "Fire",
+}
+
+def _spell_type(name: str) -> str:
+    for spell_type, names in _TYPES.items():
+        if name in names:
+            return spell_type
+    return "Damage"
+
+def _spell_cost(class_name: str, name: str):
+    """Primary cost from the class resource model (first resource the spell spends)"""
+    model = RESOURCE_MODELS.get(class_name)
+    if model is None:
+        return 0.0, ""
+    for resource, delta in model.spells.get(name, {}).items():
+        if delta == SPEND_ALL:
+            return 1.0, resource
+        if delta < 0:
+            return float(-delta), resource
+    return 0.0, ""
+
+def default_mechanics(class_name: str, spec_name: str, name: str) -> SpellMechanics:
+    """Built-in mechanics of a spell as used by the default database"""
+    cast_time = _CAST_TIMES.get(name, 0.0)
+    cost, resource = _spell_cost(class_name, name)
+    school = _SPELL_SCHOOLS.get(
+        name, _SPEC_SCHOOLS.get((class_name, spec_name), _CLASS_SCHOOLS.get(class_name, "Physical")))
+    return SpellMechanics(
+        name=name,
+        cooldown=float(_COOLDOWNS.get(name, 0.0)),
+        cast_time=cast_time,
+        gcd=0.0 if name in _OFF_GCD else (1.0 if class_name in ("Rogue", "Monk") else 1.5),
+        cost=cost,
+        resource=resource,
+        charges=_CHARGES.get(name, 1),
+        school=school,
+        spell_type=_spell_type(name),
+        aoe=name in _AOE_SPELLS
+    )
+
+def build_default_database(path: str = DEFAULT_PATH) -> None:
+    """Write the built-in mechanics of every spell in spell_data.SPELL_DATA"""
+    specs: Dict[int, List[SpellMechanics]] = {}
+    for class_name, class_specs in spell_data.SPELL_DATA.items():
+        for spec_name, spells in class_specs.items():
+            spec_id = spell_data.get_spec_id(class_name, spec_name)
+            specs[spec_id] = [default_mechanics(class_name, spec_name, name)
+                              for name in sorted(spells)]
+    write_database(path, specs)
+
+_default_db: Optional[SpellMechanicsDB] = None
+
+def _is_stale(path: str) -> bool:
+    """True if the database is missing or older than the data it is built from"""
+    if not os.path.exists(path):
+        return True
+    built = os.path.getmtime(path)
+    # Costs come from the resource models
+    sources = (spell_data.__file__, core.resources.__file__, __file__)
+    return any(os.path.getmtime(source) > built for source in sources)
+
+def get_database() -> SpellMechanicsDB:
+    """
+    Shared database at DEFAULT_PATH, (re)built on first use if it is missing
+    or out of date; falls back to the temp directory if DEFAULT_PATH is not writable
+    """
+    global _default_db
+    if _default_db is None:
+        path = DEFAULT_PATH
+        if _is_stale(path):
+            try:
+                build_default_database(path)
+            except OSError:
+                path = os.path.join(tempfile.gettempdir(), os.path.basename(DEFAULT_PATH))
+                if _is_stale(path):
+                    build_default_database(path)
+        _default_db = SpellMechanicsDB(path)
+    return _default_db
+
+def get_spell_mechanics(class_name: str, spec_name: str, spell_name: str) -> Optional[SpellMechanics]:
+    """Mechanics of a spell from the shared database"""
+    return get_database().get(class_name, spec_name, spell_name)
+
+def get_spec_mechanics(class_name: str, spec_name: str) -> Dict[str, SpellMechanics]:
+    """Mechanics of every spell of a spec from the shared database"""
+    return get_database().get_spec(class_name, spec_name)
@@ -0,0 +1,68 @@
+import io
+import random
+import pytest
+from core import binary
+from core.rotation import Rotation, SpellEntry
+from core.exporter import RotationExporter, RotationImporter
+
+def make_rotation():
+    rotation = Rotation("Mage", "Frost")
+    rotation.metadata.author = "Ünïcødé ✓"
+    rotation.metadata.description = "line one\nline two"
+    rotation.metadata.tags = ["aoe", "raid", "aoe"]
+    rotation.add_spells([
+        SpellEntry("Frostbolt", "true", 0, True, "", None),
+        SpellEntry("Ice Lance", "player.buff(Fingers of Frost)", 0, False, "procs 🙂", -5),
+        SpellEntry("Frozen Orb", "area.enemies >= 3", 0, True, "x" * 300, 1 << 40),
+    ])
+    return rotation
+
+def summary(rotation):
+    return (rotation.metadata, rotation.spec_id,
+            [(s.name, s.condition, s.priority, s.enabled, s.notes, s.id) for s in rotation.spells])
+
+def test_round_trip():
+    rotation = make_rotation()
+    data = binary.dumps(rotation)
+    assert summary(binary.loads(data)) == summary(rotation)
+    f = io.BytesIO()
+    binary.dump(rotation, f)
+    f.seek(0)
+    assert summary(binary.load(f)) == summary(rotation)
+    assert summary(RotationImporter.from_binary(RotationExporter.to_binary(rotation))) == summary(rotation)
+
+def test_none_fields_round_trip():
+    rotation = make_rotation()
+    rotation.metadata.author = None
+    rotation.spec_id = None
+    rotation.spells[0].condition = None
+    assert summary(binary.loads(binary.dumps(rotation))) == summary(rotation)
+
+def test_many_spells():
+    rotation = Rotation("Mage", "Frost")
+    rotation.add_spells([SpellEntry("Frostbolt", f"player.health > {i % 100}", 0) for i in range(1000)])
+    assert summary(binary.loads(binary.dumps(rotation))) == summary(rotation)
+
+def test_truncated_and_corrupt_input_raises_value_error():
+    data = binary.dumps(make_rotation())
+    for size in range(len(data)):
+        with pytest.raises(ValueError):
+            RotationImporter.from_binary(data[:size])
+    rng = random.Random(0)
+    for _ in range(500):
+        corrupt = bytearray(data)
+        for _ in range(rng.randint(1, 4)):
+            corrupt[rng.randrange(len(corrupt))] = rng.randrange(256)
+        try:
+            RotationImporter.from_binary(bytes(corrupt))
+        except ValueError:
+            pass
+
+def test_importer_wraps_unexpected_errors(monkeypatch):
+    def loads(data):
+        raise TypeError("intern() argument must be str, not None")
+    monkeypatch.setattr(binary, "loads", loads)
+    with pytest.raises(ValueError, match="Error parsing binary rotation"):
+        RotationImporter.from_binary(b"")
+    with pytest.raises(ValueError):
+        RotationImporter.read_binary(io.BytesIO(b""))
@@ -0,0 +1,100 @@
+import os
+import pytest
+from core.rotation import Rotation, SpellEntry
+from core.bundle import RotationBundle, write_bundle
+
+def make_rotation(spec="Blood", name=None, spells=3):
+    rotation = Rotation("Death Knight", spec)
+    if name:
+        rotation.metadata.name = name
+    rotation.metadata.author = "Alice"
+    rotation.metadata.tags = ["tank", "raid"]
+    rotation.add_spells([
+        SpellEntry("Death Grip", f"player.health < {50 + i}", 0, i % 2 == 0, f"note {i}", i - 1)
+        for i in range(spells)
+    ])
+    return rotation
+
+def summary(rotation):
+    return (rotation.metadata, rotation.spec_id,
+            [(s.name, s.condition, s.priority, s.enabled, s.notes, s.id) for s in rotation.spells])
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "rotations.soeb")
+    rotations = [make_rotation(), make_rotation("Frost", spells=0), make_rotation(), make_rotation("Unholy")]
+    assert write_bundle(path, rotations) == 4
+    with RotationBundle(path) as bundle:
+        # Duplicate names get RotationManager-style suffixes
+        base = "Death Knight Blood Rotation_Death Knight_Blood"
+        assert bundle.keys()[:3] == [base, "Death Knight Frost Rotation_Death Knight_Frost", f"{base}_1"]
+        assert len(bundle) == 4 and base in bundle
+        for key, rotation in zip(bundle.keys(), rotations):
+            assert summary(bundle.load(key)) == summary(rotation)
+            lazy = bundle.load(key, lazy=True)
+            assert not lazy.is_loaded
+            assert summary(lazy) == summary(rotation)
+        with pytest.raises(KeyError):
+            bundle.load("missing")
+
+def test_entries_carry_metadata_without_loading(tmp_path):
+    path = str(tmp_path / "rotations.soeb")
+    write_bundle(path, {"a": make_rotation(name="Tank"), "b": make_rotation("Frost", name="DPS")})
+    with RotationBundle(path) as bundle:
+        assert [(entry.key, entry.spec_name, entry.metadata.name) for entry in bundle] == [
+            ("a", "Blood", "Tank"), ("b", "Frost", "DPS")]
+
+def test_checksum_mismatch(tmp_path):
+    path = tmp_path / "rotations.soeb"
+    write_bundle(str(path), {"a": make_rotation()})
+    with RotationBundle(str(path)) as bundle:
+        offset = bundle.entries["a"].offset
+    data = bytearray(path.read_bytes())
+    data[offset] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with RotationBundle(str(path)) as bundle:
+        with pytest.raises(ValueError):
+            bundle.load("a")
+
+@pytest.mark.parametrize("data", [b"", b"SOER" + bytes(28), b"SOEB\x01\x00\x00\x00\x01\x00\x00\x00" + bytes(16)])
+def test_rejects_corrupt_files(tmp_path, data):
+    path = tmp_path / "broken.soeb"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        RotationBundle(str(path))
+
+def test_failed_write_leaves_existing_bundle(tmp_path):
+    path = str(tmp_path / "rotations.soeb")
+    write_bundle(path, {"a": make_rotation()})
+    before = open(path, "rb").read()
+
+    def rotations():
+        yield make_rotation()
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        write_bundle(path, rotations())
+    assert os.listdir(tmp_path) == ["rotations.soeb"]
+    assert open(path, "rb").read() == before
+
+def test_payload_spec_must_match_table_of_contents(tmp_path):
+    path = str(tmp_path / "rotations.soeb")
+    rotation = make_rotation()
+    rotation.spec_id = make_rotation("Frost").spec_id
+    write_bundle(path, {"a": rotation})
+    with RotationBundle(path) as bundle:
+        with pytest.raises(ValueError, match="does not match Death Knight/Blood"):
+            bundle.load("a")
+        lazy = bundle.load("a", lazy=True)
+        with pytest.raises(ValueError):
+            lazy.spells
+
+def test_leftover_temp_files_are_not_reused(tmp_path):
+    path = tmp_path / "rotations.soeb"
+    stale = tmp_path / "rotations.soeb.tmp"
+    stale.write_bytes(b"left over")
+    rotation = make_rotation()
+    write_bundle(str(path), {"a": rotation})
+    assert stale.read_bytes() == b"left over"
+    assert sorted(os.listdir(tmp_path)) == ["rotations.soeb", "rotations.soeb.tmp"]
+    with RotationBundle(str(path)) as bundle:
+        assert summary(bundle.load("a")) == summary(rotation)
@@ -0,0 +1,93 @@
+import json
+import pytest
+import cli
+from core.rotation import Rotation
+from core.exporter import RotationExporter, RotationConverter
+
+def make_rotation():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Death Strike", "player.health < 50")
+    rotation.add_spell("Blood Boil", "area.enemies >= 3")
+    rotation.add_spell("Heart Strike", "true")
+    return rotation
+
+def run(capsys, *argv):
+    code = cli.main([*argv, "--quiet"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return code, {record["file"].rsplit("/", 1)[-1]: record for record in records}
+
+@pytest.fixture
+def rotations(tmp_path):
+    (tmp_path / "good.json").write_text(RotationExporter.to_json(make_rotation()), encoding="utf-8")
+    (tmp_path / "good.rotb").write_bytes(RotationExporter.to_binary(make_rotation()))
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    (tmp_path / "broken.rotb").write_bytes(b"SOER\x01\x00" + bytes(5))
+    return tmp_path
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_bad_files_are_reported_per_file(capsys, rotations, workers):
+    code, records = run(capsys, str(rotations), "--workers", workers)
+    assert code == cli.EXIT_FAILED
+    assert records["good.json"]["status"] == "valid"
+    assert records["good.rotb"]["status"] == "valid"
+    assert records["broken.json"]["status"] == "error"
+    assert records["broken.rotb"]["status"] == "error"
+
+def test_unexpected_importer_errors_do_not_abort_the_batch(capsys, rotations, monkeypatch):
+    def explode(content):
+        raise KeyError("metadata")
+    monkeypatch.setitem(RotationConverter.IMPORTERS, "json", explode)
+    code, records = run(capsys, str(rotations), "--workers", "1")
+    assert code == cli.EXIT_FAILED
+    assert records["good.json"] == {"file": str(rotations / "good.json"), "format": "json",
+                                    "status": "error", "error": "KeyError: 'metadata'"}
+    assert records["good.rotb"]["status"] == "valid"
+
+def test_convert(capsys, rotations, tmp_path_factory):
+    out = tmp_path_factory.mktemp("out")
+    for name in ("broken.json", "broken.rotb", "good.rotb"):
+        (rotations / name).unlink()
+    code, records = run(capsys, str(rotations), "--to", "lua", "--out", str(out), "--workers", "1")
+    assert code == cli.EXIT_OK
+    assert sorted(path.name for path in out.iterdir()) == ["good.lua"]
+    converted = RotationConverter.IMPORTERS["lua"]((out / "good.lua").read_text(encoding="utf-8"))
+    assert [spell.name for spell in converted.spells] == ["Death Strike", "Blood Boil", "Heart Strike"]
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_duplicate_outputs_are_errors(capsys, tmp_path, workers):
+    sources = []
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        sources.append(tmp_path / directory / "x.json")
+        sources[-1].write_text(RotationExporter.to_json(make_rotation()), encoding="utf-8")
+    out = tmp_path / "out"
+    code = cli.main([*map(str, sources), "--to", "lua", "--out", str(out), "--workers", workers, "--quiet"])
+    first, second = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == cli.EXIT_FAILED
+    assert first["status"] == "valid" and first["output"] == str(out / "x.lua")
+    assert second["status"] == "error" and "output" not in second
+    assert second["error"] == f"Export failed: {out / 'x.lua'} is also the output of {sources[0]}"
+    assert sorted(path.name for path in out.iterdir()) == ["x.lua"]
+
+def test_output_never_overwrites_its_input(tmp_path, monkeypatch):
+    source = tmp_path / "x.json"
+    content = RotationExporter.to_json(make_rotation())
+    source.write_text(content, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    record = cli.process_file("x.json", to_format="json")
+    assert record["status"] == "error"
+    assert "would overwrite its own input" in record["error"]
+    assert source.read_text(encoding="utf-8") == content
+
+def test_failed_export_leaves_no_partial_output(tmp_path, monkeypatch):
+    source = tmp_path / "x.json"
+    source.write_text(RotationExporter.to_json(make_rotation()), encoding="utf-8")
+    (tmp_path / "x.lua").write_text("previous", encoding="utf-8")
+    def broken(rotation, f):
+        f.write("partial")
+        raise OSError("disk full")
+    monkeypatch.setitem(RotationConverter.WRITERS, "lua", broken)
+    record = cli.process_file(str(source), to_format="lua", output_dir=str(tmp_path))
+    assert record["status"] == "error" and record["error"] == "Export failed: disk full"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["x.json", "x.lua"]
+    assert (tmp_path / "x.lua").read_text(encoding="utf-8") == "previous"
@@ -0,0 +1,60 @@
+import pytest
+from conditions import (ConditionValidator, ConditionSyntaxError, Compare, Logical, Literal, Not,
+                        Number, Reference, COMPONENT_ERROR, OPERATOR_ERROR, PARENTHESES_ERROR,
+                        SYNTAX_ERROR)
+
+def test_parse_builds_ast():
+    node = ConditionValidator.parse("player.health < 30 && !player.moving || target.debuff(Rip)")
+    assert node == Logical(
+        '||',
+        Logical('&&',
+                Compare('<', Reference('player.health', None, 0), Number(30.0, 16), 14),
+                Not(Reference('player.moving', None, 23), 22),
+                19),
+        Reference('target.debuff', 'Rip', 40),
+        37)
+
+def test_empty_and_true_are_always_true():
+    assert ConditionValidator.parse("") == Literal(True)
+    assert ConditionValidator.parse("  true ") == Literal(True)
+
+def test_class_conditions_are_unprefixed():
+    assert ConditionValidator.validate_condition("solar > 50")[0]
+    assert not ConditionValidator.validate_condition("Druid.solar > 50")[0]
+
+@pytest.mark.parametrize("condition, message, position, length", [
+    ("player.health > 50 &&", OPERATOR_ERROR, 21, 1),
+    ("player.health >> 5", OPERATOR_ERROR, 15, 1),
+    ("(player.moving", PARENTHESES_ERROR, 0, 1),
+    ("player.moving)", PARENTHESES_ERROR, 13, 1),
+    ("player.bogus", COMPONENT_ERROR, 0, 12),
+    ("player.moving $", SYNTAX_ERROR, 14, 1),
+    ("5 && player.moving", COMPONENT_ERROR, 0, 1),
+])
+def test_errors_carry_positions(condition, message, position, length):
+    with pytest.raises(ConditionSyntaxError) as info:
+        ConditionValidator.parse(condition)
+    assert (info.value.message, info.value.position, info.value.length) == (message, position, length)
+    assert ConditionValidator.validate_condition(condition) == (False, message)
+
+def test_parse_is_cached():
+    condition = "player.health > 40"
+    assert ConditionValidator.parse(condition) is ConditionValidator.parse(condition)
+
+def test_cached_errors_do_not_grow_their_traceback():
+    depths = []
+    for _ in range(3):
+        try:
+            ConditionValidator.parse("player.moving &&")
+        except ConditionSyntaxError as e:
+            depth = 0
+            tb = e.__traceback__
+            while tb is not None:
+                depth += 1
+                tb = tb.tb_next
+            depths.append(depth)
+    assert depths[0] == depths[1] == depths[2]
+
+def test_deep_nesting_is_an_error_not_a_crash():
+    condition = "(" * 5000 + "player.moving" + ")" * 5000
+    assert not ConditionValidator.validate_condition(condition)[0]
@@ -0,0 +1,45 @@
+from core.rotation import Rotation
+from core.exporter import RotationExporter, RotationImporter
+from core.library import RotationLibrary
+
+def make_rotation(name="Blood Tank", author="Alice", tags=("tank",)):
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.metadata.name = name
+    rotation.metadata.author = author
+    rotation.metadata.tags = list(tags)
+    rotation.add_spell("Death Strike", "player.health < 50")
+    rotation.add_spell("Heart Strike", "true")
+    return rotation
+
+def test_save_load_and_query():
+    with RotationLibrary(":memory:") as library:
+        first = library.save(make_rotation())
+        library.save(make_rotation("Blood Leveling", "Bob", ()))
+        loaded = library.load(first)
+        assert [(spell.name, spell.condition) for spell in loaded.spells] == [
+            ("Death Strike", "player.health < 50"), ("Heart Strike", "true")]
+        assert loaded.metadata.tags == ["tank"]
+        assert [entry.name for entry in library.query(author="Bob")] == ["Blood Leveling"]
+        assert [entry.name for entry in library.query(tag="tank")] == ["Blood Tank"]
+        assert library.count(text="leveling") == 1
+        assert library.load(first, lazy=True).spells[0].name == "Death Strike"
+
+def test_save_replaces_existing():
+    with RotationLibrary(":memory:") as library:
+        rotation_id = library.save(make_rotation())
+        rotation = make_rotation("Renamed")
+        rotation.remove_spell(1)
+        assert library.save(rotation, rotation_id) == rotation_id
+        assert library.count() == 1
+        assert [spell.name for spell in library.load(rotation_id).spells] == ["Heart Strike"]
+        assert library.count(text="Renamed") == 1
+
+def test_xml_import_with_empty_elements_can_be_saved():
+    rotation = make_rotation(author="")
+    rotation.add_spell("Blood Boil", "")
+    imported = RotationImporter.from_xml(RotationExporter.to_xml(rotation))
+    assert imported.metadata.author is None
+    with RotationLibrary(":memory:") as library:
+        loaded = library.load(library.save(imported))
+        assert loaded.metadata.author == ""
+        assert loaded.spells[2].condition == ""
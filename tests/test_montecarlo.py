@@ -0,0 +1,54 @@
+import random
+import statistics
+import pytest
+from core.rotation import Rotation
+from core.simulator import SpellProfile
+from core.montecarlo import MonteCarloSimulator, Encounter, RunningStats, LogHistogram
+
+def make_rotation():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Blood Boil", "area.enemies >= 3")
+    rotation.add_spell("Heart Strike", "true")
+    return rotation
+
+PROFILES = {
+    "Heart Strike": SpellProfile(cooldown=3, damage=10, crit_chance=0.3),
+    "Blood Boil": SpellProfile(cooldown=4, damage=4, crit_chance=0.2),
+}
+
+def run(workers, chunk_size=25, seed=3):
+    return MonteCarloSimulator(make_rotation(), encounter=Encounter(duration=60, enemies=(1, 3)),
+                               profiles=PROFILES, seed=seed, workers=workers,
+                               chunk_size=chunk_size).run(200)
+
+def test_results_do_not_depend_on_worker_count():
+    single = run(1)
+    assert single.iterations == 200
+    assert run(3) == single
+
+def test_seed_changes_results():
+    assert run(1, seed=4).mean_damage != run(1).mean_damage
+
+def test_running_stats_merge_matches_sequential():
+    rng = random.Random(1)
+    values = [rng.gauss(50, 10) for _ in range(500)]
+    merged = RunningStats()
+    for start in range(0, len(values), 64):
+        part = RunningStats()
+        for value in values[start:start + 64]:
+            part.add(value)
+        merged.merge(part)
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(statistics.mean(values))
+    assert merged.stddev == pytest.approx(statistics.stdev(values))
+    assert (merged.minimum, merged.maximum) == (min(values), max(values))
+
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(5)
+    values = sorted(rng.lognormvariate(8, 0.5) for _ in range(5000))
+    histogram = LogHistogram(precision=0.01)
+    for value in values:
+        histogram.add(value)
+    for p in (5, 50, 95):
+        exact = values[int(p / 100 * len(values)) - 1]
+        assert histogram.percentile(p) == pytest.approx(exact, rel=0.02)
@@ -0,0 +1,50 @@
+import pytest
+from core.rotation import Rotation
+from core.simulator import SpellProfile
+from core.optimizer import RotationOptimizer
+from core.montecarlo import MonteCarloSimulator, Encounter
+
+def make_rotation():
+    # The filler is listed first, so the big cooldown is never cast
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Blood Boil", "true")
+    rotation.add_spell("Heart Strike", "true")
+    return rotation
+
+PROFILES = {
+    "Blood Boil": SpellProfile(cooldown=0, gcd=1.5, damage=1),
+    "Heart Strike": SpellProfile(cooldown=6, gcd=1.5, damage=20),
+}
+
+def length_objective(result):
+    return result.duration
+
+def test_finds_better_ordering():
+    result = RotationOptimizer(make_rotation(), profiles=PROFILES, duration=30, workers=1).optimize()
+    assert [spell.name for spell in result.rotation.spells] == ["Heart Strike", "Blood Boil"]
+    assert result.score > result.initial_score
+
+def test_worker_count_does_not_change_result():
+    single = RotationOptimizer(make_rotation(), profiles=PROFILES, duration=30, workers=1).optimize()
+    pooled = RotationOptimizer(make_rotation(), profiles=PROFILES, duration=30, workers=2).optimize()
+    assert pooled.score == single.score
+    assert pooled.rotation.fingerprint() == single.rotation.fingerprint()
+
+def test_monte_carlo_uses_duration_and_objective():
+    rotation = make_rotation()
+    short = RotationOptimizer(rotation, profiles=PROFILES, duration=30, iterations=4, workers=1)
+    long = RotationOptimizer(rotation, profiles=PROFILES, duration=120, iterations=4, workers=1)
+    assert short.optimize().initial_score < long.optimize().initial_score
+
+    counted = RotationOptimizer(rotation, profiles=PROFILES, duration=30, iterations=4, workers=1,
+                                objective=length_objective, max_rounds=0).optimize()
+    expected = MonteCarloSimulator(rotation, encounter=Encounter(duration=30), profiles=PROFILES,
+                                   workers=1, objective=length_objective).run(4)
+    assert counted.initial_score == expected.mean_score
+    # Fights last the configured 30s, +/- the encounter's 10% jitter
+    assert 27 <= counted.initial_score <= 33
+
+def test_unpicklable_objective_is_rejected_for_workers():
+    with pytest.raises(ValueError):
+        RotationOptimizer(make_rotation(), objective=lambda result: result.damage, workers=2)
+    RotationOptimizer(make_rotation(), objective=lambda result: result.damage, workers=1)
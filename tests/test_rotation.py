@@ -0,0 +1,80 @@
+import sys
+import pytest
+import copy
+import pickle
+from core.rotation import Rotation, RotationManager, RotationMetadata
+from core.exporter import RotationExporter, RotationImporter
+
+def make_rotation():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Death Strike", "player.health < 50")
+    rotation.add_spell("Heart Strike", "true")
+    return rotation
+
+@pytest.mark.parametrize("changes", [{"colour": "red"}, {"enabled": False, "bogus": 1}])
+def test_update_spell_rejects_unknown_fields(changes):
+    rotation = make_rotation()
+    before = rotation.to_dict()["spells"]
+    with pytest.raises(ValueError, match="Cannot update spell field"):
+        rotation.update_spell(2, **changes)
+    assert rotation.to_dict()["spells"] == before
+
+def test_update_spell_interns_names():
+    rotation = make_rotation()
+    assert rotation.update_spell(1, condition="".join(["player.health ", "< 40"]), notes="heal")
+    assert rotation.spells[0].condition is sys.intern("player.health < 40")
+    assert rotation.spells[0].notes == "heal"
+
+def test_metadata_without_tags():
+    metadata = RotationMetadata("Blood", "Death Knight", "Blood", None, None, "", 0.0, 0.0, None)
+    assert metadata.tags == []
+
+def test_metadata_assignments_are_normalised():
+    rotation = make_rotation()
+    rotation.metadata.author = "".join(["Some ", "Author"])
+    rotation.metadata.tags = ["".join(["p", "ve"]), None]
+    assert rotation.metadata.author is sys.intern("Some Author")
+    assert rotation.metadata.tags[0] is sys.intern("pve")
+    imported = RotationImporter.from_json(RotationExporter.to_json(rotation))
+    assert imported.metadata.author is sys.intern("Some Author")
+    assert imported.metadata.tags == ["pve", None]
+    assert imported.metadata.tags[0] is sys.intern("pve")
+
+def test_manager_indexes_follow_metadata_edits():
+    manager = RotationManager()
+    rotation = manager.create_rotation("Death Knight", "Blood", "Tank")
+    rotation.metadata.tags.append("pve")
+    rotation.metadata.author = "Someone"
+    assert manager.get_rotations(tag="pve") == [rotation]
+    assert manager.get_rotations(author="Someone") == [rotation]
+    rotation.metadata.tags = ["pvp"]
+    rotation.metadata.tags += ["raid"]
+    assert manager.get_tags() == ["pvp", "raid"]
+    rotation.metadata.tags.clear()
+    assert manager.get_tags() == []
+
+def test_manager_follows_replaced_metadata_after_update():
+    manager = RotationManager()
+    rotation = manager.create_rotation("Death Knight", "Blood", "Tank")
+    old = rotation.metadata
+    rotation.metadata = copy.deepcopy(old)
+    assert manager.update_rotation(rotation)
+    old.tags.append("stale")
+    rotation.metadata.tags.append("fresh")
+    assert manager.get_tags() == ["fresh"]
+    manager.delete_rotation(rotation)
+    rotation.metadata.tags.append("gone")
+    assert manager.get_tags() == []
+
+def test_metadata_observers_are_not_copied():
+    metadata = RotationMetadata("Tank", "Death Knight", "Blood", "a", "1", "", 0.0, 0.0, ["pve"])
+    changes = []
+    metadata.add_observer(lambda changed, field: changes.append(field))
+    for clone in (copy.deepcopy(metadata), pickle.loads(pickle.dumps(metadata))):
+        assert clone == metadata
+        clone.tags.append("pvp")
+        clone.author = "b"
+    assert changes == []
+    metadata.tags.append("pvp")
+    metadata.modified_at = 1.0
+    assert changes == ["tags", "modified_at"]
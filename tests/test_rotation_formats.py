@@ -0,0 +1,44 @@
+from core import binary
+from core.rotation import Rotation, LazyRotation
+from core.exporter import RotationExporter, RotationImporter
+from core.bundle import RotationBundle, write_bundle
+
+def xml_rotation():
+    """Rotation imported from XML with empty elements, which read back as None"""
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Death Strike", "player.health < 50")
+    rotation.add_spell("Heart Strike", "")
+    rotation.metadata.description = ""
+    imported = RotationImporter.from_xml(RotationExporter.to_xml(rotation))
+    assert imported.metadata.author is None
+    assert imported.spells[1].condition is None
+    return imported
+
+def summary(rotation):
+    metadata = rotation.metadata
+    return ((metadata.name, metadata.class_name, metadata.spec_name, metadata.author,
+             metadata.version, metadata.description, metadata.tags),
+            [(spell.name, spell.condition, spell.priority, spell.enabled) for spell in rotation.spells])
+
+def test_xml_with_empty_elements_round_trips_through_json(tmp_path):
+    rotation = xml_rotation()
+    assert summary(RotationImporter.from_json(RotationExporter.to_json(rotation))) == summary(rotation)
+    assert summary(Rotation.from_dict(rotation.to_dict())) == summary(rotation)
+
+    path = tmp_path / "rotation.json"
+    path.write_text(RotationExporter.to_json(rotation), encoding="utf-8")
+    lazy = LazyRotation.from_json_file(str(path))
+    assert summary(lazy) == summary(rotation)
+
+def test_xml_with_empty_elements_round_trips_through_binary():
+    rotation = xml_rotation()
+    assert summary(binary.loads(binary.dumps(rotation))) == summary(rotation)
+
+def test_xml_with_empty_elements_round_trips_through_bundle(tmp_path):
+    rotation = xml_rotation()
+    path = str(tmp_path / "rotations.soeb")
+    write_bundle(path, [rotation])
+    with RotationBundle(path) as bundle:
+        key, = bundle.keys()
+        assert summary(bundle.load(key)) == summary(rotation)
+        assert summary(bundle.load(key, lazy=True)) == summary(rotation)
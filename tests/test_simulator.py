@@ -0,0 +1,71 @@
+import random
+import pytest
+from core.rotation import Rotation
+from core.simulator import Simulator, GameState, SpellProfile, compile_condition
+from core.resources import get_resource_model
+
+def make_rotation():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Death Strike", "player.health < 50")
+    rotation.add_spell("Heart Strike", "true")
+    rotation.add_spell("Blood Boil", "area.enemies >= 3")
+    return rotation
+
+PROFILES = {
+    "Death Strike": SpellProfile(cooldown=0, gcd=1.5, damage=5),
+    "Heart Strike": SpellProfile(cooldown=6, gcd=1.5, damage=3),
+    "Blood Boil": SpellProfile(cooldown=0, gcd=1.0, damage=1),
+}
+
+@pytest.mark.parametrize("condition, values, expected", [
+    ("player.health < 50 && !player.moving", {"player.health": 40}, True),
+    ("player.health < 50 && !player.moving", {"player.health": 40, "player.moving": True}, False),
+    ("area.enemies >= 3 || player.health <= 20", {"area.enemies": 2, "player.health": 20}, True),
+    ("(area.enemies >= 3 || player.health <= 20) && target.exists", {"area.enemies": 3}, True),
+    ("true", {}, True),
+])
+def test_compiled_conditions(condition, values, expected):
+    assert compile_condition(condition)(GameState(**values)) is expected
+
+def test_cooldowns_and_priority():
+    result = Simulator(make_rotation(), profiles=PROFILES).run(60, record_timeline=True)
+    # Heart Strike is the only castable spell and is gated by its 6s cooldown
+    assert [time for time, _ in result.timeline] == [6.0 * i for i in range(10)]
+    assert result.casts == {"Death Strike": 0, "Heart Strike": 10, "Blood Boil": 0}
+    assert result.damage == 30.0
+
+def test_state_drives_decisions():
+    state = GameState(**{"area.enemies": 3})
+    get_resource_model("Death Knight").initialize(state.resources)
+    result = Simulator(make_rotation(), state=state, profiles=PROFILES).run(12, record_timeline=True)
+    # Blood Boil fills the GCDs Heart Strike leaves free, until runes run out
+    assert result.timeline[:4] == [(0.0, "Heart Strike"), (1.5, "Blood Boil"),
+                                   (2.5, "Blood Boil"), (3.5, "Blood Boil")]
+    assert result.casts["Heart Strike"] == 2
+
+def test_disabled_spells_are_skipped():
+    rotation = make_rotation()
+    rotation.update_spell(2, enabled=False)
+    result = Simulator(rotation, profiles=PROFILES).run(30)
+    assert "Heart Strike" not in result.casts
+    assert sum(result.casts.values()) == 0
+    assert result.idle_time == pytest.approx(30.0)
+
+def test_rng_runs_are_reproducible():
+    profiles = dict(PROFILES, **{"Heart Strike": SpellProfile(cooldown=6, damage=3, crit_chance=0.5)})
+    simulator = Simulator(make_rotation(), profiles=profiles)
+    first = simulator.run(120, rng=random.Random(7))
+    second = simulator.run(120, rng=random.Random(7))
+    assert first.damage == second.damage
+    assert simulator.run(120).damage == 60.0
+
+@pytest.mark.parametrize("duration", [0, -5, float("nan")])
+def test_rejects_non_positive_duration(duration):
+    with pytest.raises(ValueError):
+        Simulator(make_rotation(), profiles=PROFILES).run(duration)
+
+def test_rejects_zero_dot_interval():
+    profiles = dict(PROFILES, **{"Heart Strike": SpellProfile(dot="Blood Plague", dot_duration=9,
+                                                              dot_interval=0)})
+    with pytest.raises(ValueError):
+        Simulator(make_rotation(), profiles=profiles).run(30)
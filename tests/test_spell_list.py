@@ -0,0 +1,90 @@
+import copy
+import pickle
+import random
+import pytest
+from core.rotation import Rotation, SpellEntry
+from core.spell_list import SpellList
+
+class SmallSpellList(SpellList):
+    """Tiny blocks so a short test splits and empties blocks often"""
+    BLOCK_SIZE = 2
+    __slots__ = ()
+
+def entry(i):
+    return SpellEntry(f"Spell {i}", "true", 0)
+
+def check(spells, expected):
+    assert len(spells) == len(expected)
+    assert list(spells) == expected
+    assert all(spell.priority == i for i, spell in enumerate(spells, 1))
+    for i in random.Random(len(expected)).sample(range(len(expected)), min(5, len(expected))):
+        assert spells[i] is expected[i]
+        assert spells[i - len(expected)] is expected[i]
+
+@pytest.mark.parametrize("cls", [SpellList, SmallSpellList])
+def test_matches_plain_list(cls):
+    rng = random.Random(42)
+    initial = [entry(i) for i in range(150)]
+    spells, expected = cls(initial), list(initial)
+    for step in range(3000):
+        op = rng.random()
+        if op < 0.35 or not expected:
+            index = rng.randint(-len(expected) - 2, len(expected) + 2)
+            new = entry(1000 + step)
+            spells.insert(index, new)
+            expected.insert(index, new)
+        elif op < 0.65:
+            index = rng.randrange(-len(expected), len(expected))
+            assert spells.pop(index) is expected.pop(index)
+        elif op < 0.85:
+            a, b = rng.randrange(len(expected)), rng.randrange(len(expected))
+            spells.move(a, b)
+            expected.insert(b, expected.pop(a))
+        elif op < 0.95:
+            index = rng.randrange(len(expected))
+            new = entry(5000 + step)
+            spells[index] = new
+            expected[index] = new
+        else:
+            start = rng.randrange(len(expected))
+            stop = start + rng.randrange(4)
+            del spells[start:stop]
+            del expected[start:stop]
+        if step % 100 == 0:
+            check(spells, expected)
+    check(spells, expected)
+    assert spells[10:20] == expected[10:20]
+
+def test_index_errors():
+    spells = SpellList([entry(0)])
+    with pytest.raises(IndexError):
+        spells[1]
+    with pytest.raises(IndexError):
+        del spells[-2]
+    spells.clear()
+    with pytest.raises(IndexError):
+        spells.pop()
+
+def test_copy_and_pickle():
+    spells = SmallSpellList(entry(i) for i in range(9))
+    for clone in (copy.deepcopy(spells), pickle.loads(pickle.dumps(spells))):
+        assert isinstance(clone, SpellList)
+        assert clone == spells
+
+def test_rotations_do_not_share_entries():
+    source = Rotation("Death Knight", "Blood")
+    source.add_spell("Death Strike", "true")
+    source.add_spell("Heart Strike", "true")
+    heart_strike = source.spells[1]
+    added = Rotation("Death Knight", "Blood")
+    added.add_spell("Blood Boil", "true")
+    added.add_spells([heart_strike])
+    assigned = Rotation("Death Knight", "Blood")
+    assigned.spells = source.spells
+    assigned.remove_spell(1)
+    assert added.spells[1] is not heart_strike
+    assert assigned.spells[0] is not heart_strike
+    assert [spell["priority"] for spell in source.to_dict()["spells"]] == [1, 2]
+    assert added.to_dict()["spells"][1]["priority"] == 2
+    assert assigned.to_dict()["spells"][0]["priority"] == 1
+    assert heart_strike.priority == 2
@@ -0,0 +1,70 @@
+import os
+import threading
+import pytest
+import spell_data
+import spell_mechanics
+from spell_mechanics import SpellMechanics, SpellMechanicsDB, write_database, build_default_database
+
+SPECS = {
+    250: [SpellMechanics("Heart Strike", cooldown=6.0, cost=1.0, resource="runes", school="Physical",
+                         spell_type="Damage"),
+          SpellMechanics("Blood Boil", gcd=1.0, aoe=True, school="Shadow", spell_type="Damage")],
+    62: [SpellMechanics("Arcane Blast", cast_time=2.25, cost=1.5, resource="mana", school="Arcane",
+                        charges=2)],
+}
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "mechanics.bin")
+    write_database(path, SPECS)
+    with SpellMechanicsDB(path) as db:
+        assert db.spec_ids() == [62, 250]
+        for spec_id, spells in SPECS.items():
+            assert db.get_spec_by_id(spec_id) == {spell.name: spell for spell in spells}
+        assert db.get_spec_by_id(1) == {}
+
+def test_default_database_covers_spell_data(tmp_path):
+    path = str(tmp_path / "mechanics.bin")
+    build_default_database(path)
+    with SpellMechanicsDB(path) as db:
+        for class_name, specs in spell_data.SPELL_DATA.items():
+            for spec_name, spells in specs.items():
+                assert set(db.get_spec(class_name, spec_name)) == set(spells)
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"SOER" + bytes(16))
+    with pytest.raises(ValueError):
+        SpellMechanicsDB(str(path))
+
+def test_concurrent_writes_leave_a_complete_file(tmp_path):
+    path = str(tmp_path / "mechanics.bin")
+    errors = []
+
+    def write():
+        try:
+            for _ in range(20):
+                write_database(path, SPECS)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert os.listdir(tmp_path) == ["mechanics.bin"]
+    with SpellMechanicsDB(path) as db:
+        assert db.spec_ids() == [62, 250]
+
+def test_editing_resource_models_makes_the_database_stale(tmp_path, monkeypatch):
+    path = str(tmp_path / "mechanics.bin")
+    build_default_database(path)
+    built = os.path.getmtime(path)
+    mtimes = {source: built - 10 for source in (spell_data.__file__, spell_mechanics.__file__,
+                                                spell_mechanics.core.resources.__file__)}
+    mtimes[path] = built
+    monkeypatch.setattr(os.path, "getmtime", mtimes.__getitem__)
+    assert not spell_mechanics._is_stale(path)
+    mtimes[spell_mechanics.core.resources.__file__] = built + 10
+    assert spell_mechanics._is_stale(path)
@@ -0,0 +1,63 @@
+import random
+import pytest
+from core.rotation import Rotation
+from core.simulator import Simulator, SpellProfile
+from core.timeline import EventSimulator
+from core.resources import ResourceModel
+
+def make_rotation():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Death Strike", "target.health < 30")
+    rotation.add_spell("Heart Strike", "true")
+    rotation.add_spell("Blood Boil", "!target.debuff(Blood Plague)")
+    return rotation
+
+# Every timing is a multiple of the 0.1s tick and no resources gate casts, so both
+# simulators see the same decision points
+PROFILES = {
+    "Death Strike": SpellProfile(cooldown=0, gcd=1.5, damage=8),
+    "Heart Strike": SpellProfile(cooldown=6, gcd=1.5, damage=5),
+    "Blood Boil": SpellProfile(cooldown=0, gcd=1.0, damage=1),
+}
+
+@pytest.mark.parametrize("duration", [30, 60, 61.5])
+def test_matches_fixed_tick_simulator(duration):
+    rotation = make_rotation()
+    ticked = Simulator(rotation, profiles=PROFILES,
+                       resource_model=ResourceModel()).run(duration, record_timeline=True)
+    evented = EventSimulator(rotation, profiles=PROFILES,
+                             resource_model=ResourceModel()).run(duration, record_timeline=True)
+    assert [name for _, name in evented.timeline] == [name for _, name in ticked.timeline]
+    assert [time for time, _ in evented.timeline] == pytest.approx([time for time, _ in ticked.timeline])
+    assert evented.casts == ticked.casts
+    assert evented.damage == ticked.damage
+
+def test_nothing_is_cast_at_the_end_of_the_fight():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Heart Strike", "true")
+    result = EventSimulator(rotation, profiles={"Heart Strike": SpellProfile(cooldown=6)}).run(60)
+    assert result.casts == {"Heart Strike": 10}
+
+def test_dots_tick_until_they_expire():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Blood Boil", "!target.debuff(Blood Plague)")
+    profiles = {"Blood Boil": SpellProfile(damage=0, dot="Blood Plague", dot_duration=9,
+                                           dot_interval=3, dot_damage=2)}
+    result = EventSimulator(rotation, profiles=profiles).run(30)
+    # Reapplied every 9s: 0, 9, 18, 27; each application ticks at +3, +6 and +9 within the fight
+    assert result.casts == {"Blood Boil": 4}
+    assert result.damage == 2 * (3 + 3 + 3 + 1)
+
+def test_rng_runs_are_reproducible():
+    profiles = dict(PROFILES, **{"Heart Strike": SpellProfile(cooldown=6, damage=5, crit_chance=0.5)})
+    simulator = EventSimulator(make_rotation(), profiles=profiles)
+    assert simulator.run(120, rng=random.Random(2)).damage == simulator.run(120, rng=random.Random(2)).damage
+
+@pytest.mark.parametrize("engine", [Simulator, EventSimulator])
+def test_both_engines_reject_bad_input(engine):
+    with pytest.raises(ValueError):
+        engine(make_rotation(), profiles=PROFILES).run(0)
+    profiles = dict(PROFILES, **{"Blood Boil": SpellProfile(dot="Blood Plague", dot_duration=9,
+                                                            dot_interval=0)})
+    with pytest.raises(ValueError):
+        engine(make_rotation(), profiles=profiles).run(30)
@@ -0,0 +1,80 @@
+import io
+import pytest
+from core.rotation import Rotation
+from core.tokenizer import tokenize, LuaReader
+from core.exporter import RotationExporter, RotationImporter
+
+SOURCE = '''-- Rotation: Blood
+--[==[ block
+comment ]] still ]==]
+local rotation = {
+    name = "Tank \\"Blood\\"\\n\\x41\\65\\u{42}",
+    long = [=[
+first line
+second ]] line]=],
+    numbers = { 0x1F, 2.5e1, .5, 10, -3, 1e-2 },
+    ["key with spaces"] = true, nested = { a = nil; b = false },
+}
+ops = a .. b ... c == d ~= e <= f >= g :: h
+'''
+
+class TrickleIO(io.StringIO):
+    """Returns at most `limit` characters per read, however many were asked for"""
+
+    def __init__(self, text, limit):
+        super().__init__(text)
+        self.limit = limit
+
+    def read(self, size=-1):
+        return super().read(self.limit if size < 0 else min(size, self.limit))
+
+def tokens(text, chunk_size):
+    return list(tokenize(io.StringIO(text), chunk_size))
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13, 64])
+def test_tokens_do_not_depend_on_chunk_size(chunk_size):
+    assert tokens(SOURCE, chunk_size) == tokens(SOURCE, 1 << 16)
+
+def test_token_values_and_lines():
+    result = tokens(SOURCE, 1 << 16)
+    assert result[0] == ("comment", "Rotation: Blood", 1)
+    assert result[1] == ("comment", "block\ncomment ]] still", 2)
+    values = {token.value for token in result}
+    assert 'Tank "Blood"\nAAB' in values
+    assert "first line\nsecond ]] line" in values
+    assert {31, 25.0, 0.5, 10, 0.01} <= values
+    assert {"..", "...", "==", "~=", "<=", ">=", "::"} <= values
+    assert result[-1].kind == "eof" and result[-1].line == 13
+
+def test_read_table():
+    reader = LuaReader(io.StringIO(SOURCE.split("local rotation =", 1)[1]), chunk_size=4)
+    table = reader.read_table()
+    assert table["numbers"] == [31, 25.0, 0.5, 10, -3, 0.01]
+    assert table["key with spaces"] is True
+    assert table["nested"] == {"a": None, "b": False}
+
+@pytest.mark.parametrize("text", ['"unterminated', "x = @", "'line\nbreak'"])
+def test_errors(text):
+    with pytest.raises(ValueError):
+        tokens(text, 4)
+
+def make_rotation(spec):
+    rotation = Rotation("Death Knight", spec)
+    rotation.metadata.author = "Alice"
+    rotation.add_spell("Death Strike" if spec == "Blood" else "Obliterate", "player.health < 50")
+    rotation.add_spell("Death Grip", 'target.distance > 10 && !player.buff(Icy Talons)')
+    return rotation
+
+def summary(rotation):
+    return (rotation.metadata.class_name, rotation.metadata.spec_name, rotation.metadata.author,
+            [(spell.name, spell.condition, spell.enabled) for spell in rotation.spells])
+
+@pytest.mark.parametrize("limit", [1, 7, 4096])
+def test_streaming_imports_do_not_depend_on_read_size(limit):
+    rotations = [make_rotation("Blood"), make_rotation("Frost")]
+    lua = "\n".join(RotationExporter.to_lua(rotation) for rotation in rotations)
+    soe = "\n".join(RotationExporter.to_soe(rotation) for rotation in rotations)
+    expected = [summary(rotation) for rotation in rotations]
+    assert [summary(r) for r in RotationImporter.iter_lua(TrickleIO(lua, limit))] == expected
+    soe_summaries = [summary(r)[::3] for r in RotationImporter.iter_soe(TrickleIO(soe, limit))]
+    assert soe_summaries == [summary(rotation)[::3] for rotation in rotations]
@@ -0,0 +1,40 @@
+import pytest
+from core.rotation import Rotation
+from core.simulator import GameState, compile_condition
+
+np = pytest.importorskip("numpy")
+from core.vectorized import BatchEvaluator, state_grid
+
+def make_rotation():
+    rotation = Rotation("Death Knight", "Blood")
+    rotation.add_spell("Death Strike", "player.health < 35 && !player.moving")
+    rotation.add_spell("Blood Boil", "area.enemies >= 3 || (target.health <= 20 && area.enemies > 1)")
+    rotation.add_spell("Heart Strike", "target.health > 50")
+    return rotation
+
+def test_select_matches_per_state_evaluation():
+    rotation = make_rotation()
+    columns = state_grid({
+        "player.health": range(0, 101, 5),
+        "player.moving": [False, True],
+        "area.enemies": range(1, 6),
+        "target.health": range(0, 101, 10),
+    })
+    chosen = BatchEvaluator(rotation).select(columns)
+    conditions = [compile_condition(spell.condition) for spell in rotation.spells]
+    for row in range(len(chosen)):
+        state = GameState(**{key: column[row].item() for key, column in columns.items()})
+        expected = next((i for i, condition in enumerate(conditions) if condition(state)), -1)
+        assert chosen[row] == expected
+
+def test_columns_required_and_names():
+    evaluator = BatchEvaluator(make_rotation())
+    assert evaluator.columns_required() == ["player.health", "player.moving", "area.enemies",
+                                            "target.health"]
+    names = evaluator.select_names({"player.health": [20, 90], "player.moving": False,
+                                    "area.enemies": 1, "target.health": [40, 40]})
+    assert list(names) == ["Death Strike", None]
+
+def test_mismatched_columns_are_rejected():
+    with pytest.raises(ValueError):
+        BatchEvaluator(make_rotation()).select({"player.health": [1, 2], "target.health": [1, 2, 3]})
@@ -2,13 +2,15 @@ from .main_window import MainWindow
 from .spell_panel import SpellPanel
 from .condition_panel import ConditionPanel
 from .rotation_panel import RotationPanel
+from .library_dialog import LibraryDialog
 from .widgets import (
     ModernFrame,
     ModernButton,
     ModernLabel,
     ModernCombobox,
     SearchEntry,
-    ModernTreeview
+    ModernTreeview,
+    VirtualTreeview
 )
 
 __all__ = [
@@ -16,10 +18,12 @@ __all__ = [
     'SpellPanel',
     'ConditionPanel',
     'RotationPanel',
+    'LibraryDialog',
     'ModernFrame',
     'ModernButton',
     'ModernLabel',
     'ModernCombobox',
     'SearchEntry',
-    'ModernTreeview'
+    'ModernTreeview',
+    'VirtualTreeview'
 ]
\ No newline at end of file
@@ -1,16 +1,41 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Optional, Callable, Dict, Any, Tuple
-from conditions import ConditionBuilder, ConditionValidator
+import re
+from conditions import ConditionBuilder, ConditionValidator, ConditionSyntaxError
 from .widgets import ModernFrame, ModernLabel, ModernButton, ModernCombobox
 
+# Identifier being typed just before the cursor, e.g. "player.hea"
+_WORD_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_.]*$')
+
+def _check_condition(condition: str) -> Optional[ConditionSyntaxError]:
+    """Parse error for a condition, or None if it is valid (parses are cached)"""
+    try:
+        ConditionValidator.parse(condition)
+    except ConditionSyntaxError as e:
+        return e
+    return None
+
 class ConditionPanel(ModernFrame):
+    # Milliseconds to wait after the last edit before validating, and between
+    # checks for a finished validation
+    VALIDATE_DELAY = 250
+    POLL_INTERVAL = 20
+
+    # Conditions longer than this are validated on the worker thread
+    THREAD_THRESHOLD = 256
+
     def __init__(self, parent):
         super().__init__(parent)
         
         self.condition_builder = ConditionBuilder()
         self.current_spell: Optional[str] = None
         self.on_condition_created: Optional[Callable[[str], None]] = None
+        self._validate_job = None
+        self._validation_generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="condition-validation")
+        self._suggesting = False
         
         self._setup_variables()
         self._create_widgets()
@@ -159,9 +184,20 @@ class ConditionPanel(ModernFrame):
             font=("Consolas", 10)
         )
         self.condition_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
-        
-        # Make text widget read-only
-        self.condition_text.bind("<Key>", lambda e: "break")
+        self.condition_text.tag_configure("error", underline=True, foreground="#dc3545", background="#f8d7da")
+
+        # Completions for the identifier at the cursor; shown while there are any
+        self.suggestion_list = tk.Listbox(
+            condition_frame,
+            height=4,
+            font=("Consolas", 10),
+            activestyle="none",
+            exportselection=False
+        )
+
+        # Live validation result
+        self.validation_label = ModernLabel(condition_frame, text="", wraplength=300)
+        self.validation_label.pack(anchor=tk.W, pady=(2, 0))
 
         # Final buttons frame
         final_button_frame = ModernFrame(self)
@@ -216,6 +252,15 @@ class ConditionPanel(ModernFrame):
         self.subcategory_combo.bind('<<ComboboxSelected>>', self._on_subcategory_selected)
         self.template_combo.bind('<<ComboboxSelected>>', self._on_template_selected)
 
+        # The condition can be edited directly; edits are validated as they happen
+        self.condition_text.bind("<<Modified>>", self._on_condition_modified)
+        self.condition_text.bind("<KeyRelease>", self._on_condition_key)
+        self.condition_text.bind("<Tab>", lambda e: self._accept_suggestion())
+        self.condition_text.bind("<Down>", lambda e: self._move_suggestion(1))
+        self.condition_text.bind("<Up>", lambda e: self._move_suggestion(-1))
+        self.condition_text.bind("<Escape>", lambda e: self._hide_suggestions())
+        self.suggestion_list.bind("<Double-1>", lambda e: self._accept_suggestion())
+
     def set_class(self, class_name: str):
         """Set the current class and update available conditions"""
         self.condition_builder.set_class(class_name)
@@ -275,8 +320,11 @@ class ConditionPanel(ModernFrame):
         operator = self.operator_var.get()
         value = self.value_var.get()
 
-        # Build condition part
-        condition_part = f"{category}.{subcategory}"
+        # Build condition part; class conditions (e.g. runes.count) have no category prefix
+        if category in ConditionValidator.CLASS_CONDITIONS:
+            condition_part = subcategory
+        else:
+            condition_part = f"{category}.{subcategory}"
         if value:
             condition_part += f" {operator} {value}"
 
@@ -301,15 +349,127 @@ class ConditionPanel(ModernFrame):
         self.condition_text.delete('1.0', tk.END)
         self.value_var.set("")
 
+    def _on_condition_modified(self, event):
+        """Track edits to the condition and schedule validation"""
+        if not self.condition_text.edit_modified():
+            return
+        self.condition_text.edit_modified(False)
+        condition = self.condition_text.get('1.0', 'end-1c')
+        self.condition_parts = [condition] if condition.strip() else []
+
+        if self._validate_job is not None:
+            self.after_cancel(self._validate_job)
+        self._validate_job = self.after(self.VALIDATE_DELAY, self._start_validation)
+
+    def _start_validation(self):
+        """Validate the condition now; long ones are parsed on the worker thread"""
+        if self._validate_job is not None:
+            self.after_cancel(self._validate_job)
+            self._validate_job = None
+        self._validation_generation += 1
+        condition = self.condition_text.get('1.0', 'end-1c')
+        if len(condition) <= self.THREAD_THRESHOLD:
+            self._show_validation(condition, _check_condition(condition))
+            return
+        self.validation_label.configure(text="Validating...", foreground="#666666")
+        future = self._executor.submit(_check_condition, condition)
+        self._poll_validation(future, condition, self._validation_generation)
+
+    def _poll_validation(self, future: Future, condition: str, generation: int):
+        """Show a validation result once done, unless the condition changed since"""
+        if not future.done():
+            self.after(self.POLL_INTERVAL, self._poll_validation, future, condition, generation)
+            return
+        if generation == self._validation_generation:
+            self._show_validation(condition, future.result())
+
+    def _show_validation(self, condition: str, error: Optional[ConditionSyntaxError]):
+        """Report the result below the condition and highlight the offending token"""
+        self.condition_text.tag_remove("error", '1.0', tk.END)
+        if error is None:
+            self.validation_label.configure(text="✓ Valid condition", foreground="#28a745")
+            return
+
+        # Errors at the end of the condition mark its last character
+        start = min(error.position, max(len(condition) - 1, 0))
+        end = max(error.position + error.length, start + 1)
+        self.condition_text.tag_add("error", f"1.0 + {start} chars", f"1.0 + {end} chars")
+        message = f"{error.message}: {error.detail}" if error.detail else error.message
+        self.validation_label.configure(text=f"✗ {message} (column {error.position + 1})",
+                                        foreground="#dc3545")
+
     def _validate_condition(self):
         """Validate the current condition"""
-        condition = self.condition_text.get('1.0', 'end-1c')
-        is_valid, error = ConditionValidator.validate_condition(condition)
-        
-        if is_valid:
-            messagebox.showinfo("Validation", "Condition is valid!")
+        self._start_validation()
+
+    def _on_condition_key(self, event):
+        """Refresh completions as the condition is typed"""
+        if event.keysym not in ("Tab", "Up", "Down", "Escape", "Return"):
+            self._update_suggestions()
+
+    def _word_at_cursor(self) -> str:
+        match = _WORD_RE.search(self.condition_text.get("insert linestart", "insert"))
+        return match.group() if match else ""
+
+    def _completions(self, word: str) -> List[str]:
+        """Conditions (or categories) that complete the identifier being typed"""
+        if not word:
+            return []
+        builder = self.condition_builder
+        if "." in word:
+            category = word.split(".", 1)[0]
+            options = ([f"{category}.{name}" for name in builder.get_conditions_for_category(category)]
+                       if category in ConditionValidator.BASIC_CONDITIONS else [])
         else:
-            messagebox.showerror("Validation Error", f"Invalid condition: {error}")
+            options = [f"{category}." for category in builder.get_available_categories()
+                       if category in ConditionValidator.BASIC_CONDITIONS]
+        # Class conditions are written without their category
+        if builder.current_class:
+            options.extend(builder.get_conditions_for_category(builder.current_class))
+        return [option for option in options if option.startswith(word) and option != word]
+
+    def _update_suggestions(self):
+        """Show the completions for the identifier at the cursor"""
+        completions = self._completions(self._word_at_cursor())
+        if not completions:
+            self._hide_suggestions()
+            return
+        self.suggestion_list.delete(0, tk.END)
+        self.suggestion_list.insert(tk.END, *completions)
+        self.suggestion_list.selection_set(0)
+        if not self._suggesting:
+            self.suggestion_list.pack(fill=tk.X, after=self.condition_text)
+            self._suggesting = True
+
+    def _hide_suggestions(self):
+        if self._suggesting:
+            self.suggestion_list.pack_forget()
+            self._suggesting = False
+
+    def _move_suggestion(self, step: int):
+        """Move the highlighted completion; keys act normally without completions"""
+        if not self._suggesting:
+            return None
+        selection = self.suggestion_list.curselection()
+        index = min(max((selection[0] if selection else 0) + step, 0), self.suggestion_list.size() - 1)
+        self.suggestion_list.selection_clear(0, tk.END)
+        self.suggestion_list.selection_set(index)
+        self.suggestion_list.see(index)
+        return "break"
+
+    def _accept_suggestion(self):
+        """Replace the identifier at the cursor with the highlighted completion"""
+        if not self._suggesting:
+            return None
+        selection = self.suggestion_list.curselection()
+        completion = self.suggestion_list.get(selection[0] if selection else 0)
+        word = self._word_at_cursor()
+        self.condition_text.delete(f"insert - {len(word)} chars", "insert")
+        self.condition_text.insert("insert", completion)
+        self.condition_text.focus_set()
+        # A completed category ("player.") offers its conditions next
+        self._update_suggestions()
+        return "break"
 
     def _create_condition(self):
         """Create and emit the condition"""
@@ -321,10 +481,10 @@ class ConditionPanel(ModernFrame):
         if not condition:
             condition = "true"
 
-        # Validate condition
-        is_valid, error = ConditionValidator.validate_condition(condition)
-        if not is_valid:
-            messagebox.showerror("Error", f"Invalid condition: {error}")
+        # Validate condition; errors are shown inline
+        error = _check_condition(condition)
+        if error is not None:
+            self._show_validation(condition, error)
             return
 
         # Emit condition
@@ -339,4 +499,9 @@ class ConditionPanel(ModernFrame):
         self.current_spell = None
         self.spell_label.configure(text="No spell selected")
         self._clear_condition()
-        self.create_button.configure(state=tk.DISABLED)
\ No newline at end of file
+        self.create_button.configure(state=tk.DISABLED)
+
+    def destroy(self):
+        """Stop the validation worker with the panel"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
\ No newline at end of file
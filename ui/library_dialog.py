@@ -0,0 +1,151 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from core.library import RotationLibrary, LibraryEntry
+from .widgets import ModernFrame, ModernLabel, ModernButton, ModernCombobox
+
+class LibraryDialog(tk.Toplevel):
+    """Browse and search the rotation library"""
+
+    # Rows fetched per query; more are fetched as the list is scrolled
+    PAGE_SIZE = 100
+
+    def __init__(self, parent, library: RotationLibrary, on_open: Optional[Callable[[int], None]] = None):
+        super().__init__(parent)
+        self.title("Rotation Library")
+        self.geometry("800x500")
+        self.transient(parent)
+
+        self.library = library
+        self.on_open = on_open
+        self.entries: Dict[str, LibraryEntry] = {}
+        self.total = 0
+        self._search_job = None
+
+        self._create_widgets()
+        self.refresh()
+
+    def _create_widgets(self):
+        """Create and setup widgets"""
+        # Filter bar
+        filter_frame = ModernFrame(self)
+        filter_frame.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        ModernLabel(filter_frame, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._on_search_changed)
+        search_entry = ttk.Entry(filter_frame, textvariable=self.search_var)
+        search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        search_entry.focus_set()
+
+        ModernLabel(filter_frame, text="Class:").pack(side=tk.LEFT, padx=(10, 5))
+        self.class_combo = ModernCombobox(filter_frame, state="readonly", width=15)
+        self.class_combo.pack(side=tk.LEFT)
+        self.class_combo.bind('<<ComboboxSelected>>', lambda event: self.refresh())
+
+        ModernLabel(filter_frame, text="Tag:").pack(side=tk.LEFT, padx=(10, 5))
+        self.tag_combo = ModernCombobox(filter_frame, state="readonly", width=12)
+        self.tag_combo.pack(side=tk.LEFT)
+        self.tag_combo.bind('<<ComboboxSelected>>', lambda event: self.refresh())
+
+        # Results list
+        list_frame = ModernFrame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.tree = ttk.Treeview(
+            list_frame,
+            columns=("name", "class", "spec", "author", "spells", "modified"),
+            show="headings",
+            selectmode="browse"
+        )
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda first, last: self._on_scroll(scrollbar, first, last))
+
+        for column, text, width in (("name", "Name", 220), ("class", "Class", 110),
+                                    ("spec", "Specialization", 110), ("author", "Author", 100),
+                                    ("spells", "Spells", 60), ("modified", "Modified", 130)):
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=width, anchor=tk.CENTER if column == "spells" else tk.W)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind("<Double-1>", lambda event: self._open_selected())
+        self.tree.bind("<Return>", lambda event: self._open_selected())
+
+        # Buttons
+        button_frame = ModernFrame(self)
+        button_frame.pack(fill=tk.X, padx=10, pady=(5, 10))
+
+        self.count_label = ModernLabel(button_frame, text="")
+        self.count_label.pack(side=tk.LEFT)
+
+        ModernButton(button_frame, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+        ModernButton(button_frame, text="Delete", command=self._delete_selected).pack(side=tk.RIGHT, padx=5)
+        ModernButton(button_frame, text="Open", command=self._open_selected).pack(side=tk.RIGHT)
+
+    def _filters(self) -> dict:
+        class_name = self.class_combo.get()
+        tag = self.tag_combo.get()
+        return {
+            "class_name": class_name if class_name not in ("", "All") else None,
+            "tag": tag if tag not in ("", "All") else None,
+            "text": self.search_var.get()
+        }
+
+    def refresh(self):
+        """Reload filter choices and the first page of results"""
+        self.class_combo.configure(values=["All"] + list(self.library.get_classes()))
+        self.tag_combo.configure(values=["All"] + list(self.library.get_tags()))
+        self.tree.delete(*self.tree.get_children())
+        self.entries.clear()
+        self.total = self.library.count(**self._filters())
+        self._load_page()
+
+    def _load_page(self):
+        """Append the next page of results"""
+        for entry in self.library.query(limit=self.PAGE_SIZE, offset=len(self.entries), **self._filters()):
+            item = self.tree.insert("", tk.END, values=(
+                entry.name, entry.class_name, entry.spec_name, entry.author, entry.spell_count,
+                datetime.fromtimestamp(entry.modified_at).strftime("%Y-%m-%d %H:%M")
+            ))
+            self.entries[item] = entry
+        self.count_label.config(text=f"{self.total} rotations")
+
+    def _on_scroll(self, scrollbar: ttk.Scrollbar, first: str, last: str):
+        """Fetch more rows when the end of the list comes into view"""
+        scrollbar.set(first, last)
+        if float(last) >= 0.95 and len(self.entries) < self.total:
+            self.after_idle(self._load_page)
+
+    def _on_search_changed(self, *args):
+        """Debounce typing before querying"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(200, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        self.refresh()
+
+    def _selected_entry(self) -> Optional[LibraryEntry]:
+        selection = self.tree.selection()
+        return self.entries.get(selection[0]) if selection else None
+
+    def _open_selected(self):
+        """Open the selected rotation"""
+        entry = self._selected_entry()
+        if entry is None:
+            return
+        if self.on_open:
+            self.on_open(entry.id)
+        self.destroy()
+
+    def _delete_selected(self):
+        """Delete the selected rotation from the library"""
+        entry = self._selected_entry()
+        if entry is None:
+            return
+        if messagebox.askyesno("Delete Rotation", f"Delete '{entry.name}' from the library?", parent=self):
+            self.library.delete(entry.id)
+            self.refresh()
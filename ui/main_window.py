@@ -9,10 +9,12 @@ from typing import Dict, List, Optional, Any, Tuple
 from ui.spell_panel import SpellPanel
 from ui.condition_panel import ConditionPanel
 from ui.rotation_panel import RotationPanel
+from ui.library_dialog import LibraryDialog
 from ui.widgets import ModernFrame, ModernButton, ModernLabel, ModernCombobox
 from core.rotation import Rotation, RotationManager
+from core.library import RotationLibrary
 from core.validator import RotationValidator
-from core.exporter import RotationExporter, RotationImporter
+from core.exporter import RotationExporter, RotationImporter, RotationConverter, write_file
 import spell_data
 
 class MainWindow(tk.Tk):
@@ -37,6 +39,8 @@ class MainWindow(tk.Tk):
         self.current_rotation: Optional[Rotation] = None
         self.rotation_manager = RotationManager()
         self.last_save_path: Optional[str] = None
+        self.library: Optional[RotationLibrary] = None
+        self.library_id: Optional[int] = None
 
         # Setup UI components
         self._create_menu()
@@ -107,6 +111,9 @@ class MainWindow(tk.Tk):
         self.file_menu.add_command(label="Save", command=self._save_rotation)
         self.file_menu.add_command(label="Save As...", command=self._save_rotation_as)
         self.file_menu.add_separator()
+        self.file_menu.add_command(label="Open from Library...", command=self._open_library)
+        self.file_menu.add_command(label="Save to Library", command=self._save_to_library)
+        self.file_menu.add_separator()
         
         # Recent files submenu
         self.recent_menu = tk.Menu(self.file_menu, tearoff=0)
@@ -223,7 +230,7 @@ class MainWindow(tk.Tk):
         if class_name and spec_name:
             # Update spell panel
             spells = spell_data.get_spells_for_spec(class_name, spec_name)
-            self.spell_panel.update_spells(spells)
+            self.spell_panel.update_spells(spells, class_name, spec_name)
             
             # Update condition panel
             self.condition_panel.set_class(class_name)
@@ -248,14 +255,13 @@ class MainWindow(tk.Tk):
     def _on_rotation_spell_moved(self, from_index: int, to_index: int):
         """Handle spell movement in rotation"""
         if self.current_rotation:
+            # The rotation panel applies the move itself
             self.current_rotation.move_spell(from_index, to_index)
-            self.rotation_panel.refresh()
 
     def _on_rotation_spell_removed(self, index: int):
         """Handle spell removal from rotation"""
         if self.current_rotation:
             self.current_rotation.remove_spell(index)
-            self.rotation_panel.refresh()
 
     def _new_rotation(self):
         """Create a new rotation"""
@@ -264,6 +270,7 @@ class MainWindow(tk.Tk):
 
         self.current_rotation = None
         self.last_save_path = None
+        self.library_id = None
         self.current_class.set('')
         self.current_spec.set('')
         self.spell_panel.clear()
@@ -297,14 +304,9 @@ class MainWindow(tk.Tk):
                 else:
                     raise ValueError("Unsupported file format")
 
-                # Update UI
-                self.current_class.set(self.current_rotation.metadata.class_name)
-                self._on_class_selected(None)
-                self.current_spec.set(self.current_rotation.metadata.spec_name)
-                self._on_spec_selected(None)
-                
-                self.rotation_panel.set_rotation(self.current_rotation)
+                self._show_rotation(self.current_rotation)
                 self.last_save_path = filename
+                self.library_id = None
                 
                 # Add to recent files
                 self._add_recent_file(filename)
@@ -314,6 +316,53 @@ class MainWindow(tk.Tk):
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open rotation: {str(e)}")
 
+    def _show_rotation(self, rotation: Rotation):
+        """Update the UI for a newly opened rotation"""
+        self.current_class.set(rotation.metadata.class_name)
+        self._on_class_selected(None)
+        self.current_spec.set(rotation.metadata.spec_name)
+        self._on_spec_selected(None)
+
+        self.rotation_panel.set_rotation(rotation)
+
+    def _get_library(self) -> RotationLibrary:
+        """Open the rotation library on first use"""
+        if self.library is None:
+            self.library = RotationLibrary()
+        return self.library
+
+    def _open_library(self):
+        """Browse the rotation library"""
+        if self.current_rotation and not self._confirm_discard_changes():
+            return
+        try:
+            LibraryDialog(self, self._get_library(), on_open=self._open_library_rotation)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open library: {str(e)}")
+
+    def _open_library_rotation(self, rotation_id: int):
+        """Open a rotation from the library"""
+        try:
+            self.current_rotation = self._get_library().load(rotation_id)
+            self._show_rotation(self.current_rotation)
+            self.last_save_path = None
+            self.library_id = rotation_id
+            self.status_label.config(text=f"Opened {self.current_rotation.metadata.name} from library")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open rotation: {str(e)}")
+
+    def _save_to_library(self):
+        """Save the current rotation to the library"""
+        if not self.current_rotation:
+            messagebox.showwarning("Warning", "No rotation to save")
+            return
+
+        try:
+            self.library_id = self._get_library().save(self.current_rotation, self.library_id)
+            self.status_label.config(text=f"Saved {self.current_rotation.metadata.name} to library")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save rotation: {str(e)}")
+
     def _save_rotation(self):
         """Save the current rotation"""
         if not self.current_rotation:
@@ -349,14 +398,13 @@ class MainWindow(tk.Tk):
             # Determine format from extension
             ext = os.path.splitext(filename)[1].lower()
             if ext == '.json':
-                content = RotationExporter.to_json(self.current_rotation)
+                writer = RotationExporter.write_json
             elif ext == '.soe':
-                content = RotationExporter.to_soe(self.current_rotation)
+                writer = RotationExporter.write_soe
             else:
                 raise ValueError("Unsupported file format")
 
-            with open(filename, 'w') as f:
-                f.write(content)
+            write_file(filename, lambda f: writer(self.current_rotation, f))
 
             self.last_save_path = filename
             self._add_recent_file(filename)
@@ -455,19 +503,11 @@ class MainWindow(tk.Tk):
 
         if filename:
             try:
-                if format_type == 'soe':
-                    content = RotationExporter.to_soe(self.current_rotation)
-                elif format_type == 'json':
-                    content = RotationExporter.to_json(self.current_rotation)
-                elif format_type == 'xml':
-                    content = RotationExporter.to_xml(self.current_rotation)
-                elif format_type == 'lua':
-                    content = RotationExporter.to_lua(self.current_rotation)
-                else:
+                writer = RotationConverter.WRITERS.get(format_type)
+                if writer is None:
                     raise ValueError(f"Unsupported export format: {format_type}")
 
-                with open(filename, 'w') as f:
-                    f.write(content)
+                write_file(filename, lambda f: writer(self.current_rotation, f))
 
                 self.status_label.config(text=f"Exported as {format_type.upper()}")
                 
@@ -680,6 +720,8 @@ F1: Show Documentation
         """Handle window close event"""
         if self.current_rotation and not self._confirm_discard_changes():
             return
+        if self.library is not None:
+            self.library.close()
         self.quit()
 
 if __name__ == "__main__":
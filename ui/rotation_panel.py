@@ -1,8 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import List, Optional, Callable, Dict, Any
-from core.rotation import Rotation, SpellEntry
-from .widgets import ModernFrame, ModernLabel, ModernButton, ModernCombobox
+from core.rotation import Rotation, RotationChange, SpellEntry
+from .widgets import ModernFrame, ModernLabel, ModernButton, ModernCombobox, VirtualTreeview
 
 class RotationPanel(ModernFrame):
     def __init__(self, parent):
@@ -61,21 +61,13 @@ class RotationPanel(ModernFrame):
         list_frame = ModernFrame(self)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
 
-        # Create Treeview with scrollbar
-        self.rotation_tree = ttk.Treeview(
+        # Virtualized list: only the visible spells are rendered; the
+        # priority column is the row number
+        self.rotation_tree = VirtualTreeview(
             list_frame,
             columns=("priority", "spell", "condition", "enabled"),
-            show="headings",
-            selectmode="browse"
+            numbered=True
         )
-        
-        scrollbar = ttk.Scrollbar(
-            list_frame,
-            orient=tk.VERTICAL,
-            command=self.rotation_tree.yview
-        )
-        
-        self.rotation_tree.configure(yscrollcommand=scrollbar.set)
 
         # Setup columns
         self.rotation_tree.heading("priority", text="Priority")
@@ -88,9 +80,7 @@ class RotationPanel(ModernFrame):
         self.rotation_tree.column("condition", width=200)
         self.rotation_tree.column("enabled", width=60, anchor=tk.CENTER)
 
-        # Pack Treeview and scrollbar
-        self.rotation_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.rotation_tree.pack(fill=tk.BOTH, expand=True)
 
         # Button frame
         button_frame = ModernFrame(self)
@@ -170,11 +160,11 @@ class RotationPanel(ModernFrame):
 
     def _bind_events(self):
         """Bind event handlers"""
-        self.rotation_tree.bind("<<TreeviewSelect>>", self._on_spell_selected)
-        self.rotation_tree.bind("<Double-1>", self._on_double_click)
-        self.rotation_tree.bind("<Button-3>", self._show_context_menu)
-        self.rotation_tree.bind("<Delete>", lambda e: self._remove_spell())
-        self.rotation_tree.bind("<space>", lambda e: self._toggle_spell_enabled())
+        self.rotation_tree.bind("<<RowSelect>>", self._on_spell_selected)
+        self.rotation_tree.tree.bind("<Double-1>", self._on_double_click)
+        self.rotation_tree.tree.bind("<Button-3>", self._show_context_menu)
+        self.rotation_tree.tree.bind("<Delete>", lambda e: self._remove_spell())
+        self.rotation_tree.tree.bind("<space>", lambda e: self._toggle_spell_enabled())
         
         # Bind metadata change events
         self.name_entry.bind("<KeyRelease>", self._on_metadata_changed)
@@ -182,9 +172,12 @@ class RotationPanel(ModernFrame):
         self.desc_text.bind("<KeyRelease>", self._on_metadata_changed)
 
     def set_rotation(self, rotation: Rotation):
-        """Set the current rotation"""
+        """Set the current rotation and follow its changes"""
+        self._unwatch()
         self.rotation = rotation
+        rotation.add_observer(self._on_rotation_changed)
         self._update_metadata_display()
+        self.rotation_tree.select(None)
         self.refresh()
         self.has_unsaved_changes = False
 
@@ -195,33 +188,49 @@ class RotationPanel(ModernFrame):
 
         try:
             self.rotation.add_spell(spell_name, condition)
-            self.refresh()
+            self.rotation_tree.see(len(self.rotation.spells) - 1)
             self.has_unsaved_changes = True
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add spell: {str(e)}")
 
     def refresh(self):
-        """Refresh the rotation display"""
-        # Clear existing items
-        for item in self.rotation_tree.get_children():
-            self.rotation_tree.delete(item)
-
+        """Refresh the rotation display; only visible rows that changed are redrawn"""
         if not self.rotation:
+            self.rotation_tree.set_rows([])
             return
 
-        # Add spells
-        for spell in self.rotation.spells:
-            self.rotation_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    spell.priority,
-                    spell.name,
-                    spell.condition,
-                    "Yes" if spell.enabled else "No"
-                )
-            )
+        self.rotation_tree.set_rows([self._row(spell) for spell in self.rotation.spells])
+
+    @staticmethod
+    def _row(spell: SpellEntry) -> tuple:
+        return (spell.name, spell.condition, "Yes" if spell.enabled else "No")
+
+    def _on_rotation_changed(self, rotation: Rotation, change: RotationChange):
+        """Apply one change to the list instead of rebuilding it"""
+        if change.kind == 'inserted':
+            self.rotation_tree.insert_row(change.index, self._row(change.spell))
+        elif change.kind == 'removed':
+            self.rotation_tree.delete_row(change.index)
+        elif change.kind == 'moved':
+            self.rotation_tree.move_row(change.index, change.new_index)
+        elif change.kind == 'updated':
+            self.rotation_tree.update_row(change.index, self._row(change.spell))
+            if change.index == self.rotation_tree.selected_index():
+                self._on_spell_selected(None)
+        else:
+            self.refresh()
+        self.has_unsaved_changes = True
+
+    def _unwatch(self):
+        """Stop following the current rotation"""
+        if self.rotation:
+            self.rotation.remove_observer(self._on_rotation_changed)
+
+    def _selected_spell(self) -> Optional[SpellEntry]:
+        """Spell on the selected row"""
+        index = self.rotation_tree.selected_index()
+        return None if index is None else self._get_spell_by_priority(index + 1)
 
     def _update_metadata_display(self):
         """Update metadata display fields"""
@@ -252,28 +261,17 @@ class RotationPanel(ModernFrame):
 
     def _on_spell_selected(self, event):
         """Handle spell selection"""
-        selection = self.rotation_tree.selection()
-        if selection:
-            item = selection[0]
-            spell_data = self.rotation_tree.item(item)["values"]
-            
-            # Update notes display
-            spell = self._get_spell_by_priority(spell_data[0])
-            if spell:
-                self.notes_text.delete('1.0', tk.END)
-                self.notes_text.insert('1.0', spell.notes)
-        else:
-            self.notes_text.delete('1.0', tk.END)
+        # Update notes display
+        spell = self._selected_spell()
+        self.notes_text.delete('1.0', tk.END)
+        if spell:
+            self.notes_text.insert('1.0', spell.notes)
 
     def _get_spell_by_priority(self, priority: int) -> Optional[SpellEntry]:
         """Get spell entry by priority"""
-        if not self.rotation:
+        if not self.rotation or not 1 <= priority <= len(self.rotation.spells):
             return None
-            
-        for spell in self.rotation.spells:
-            if spell.priority == priority:
-                return spell
-        return None
+        return self.rotation.spells[priority - 1]
 
     def _on_double_click(self, event):
         """Handle double click on spell"""
@@ -281,18 +279,12 @@ class RotationPanel(ModernFrame):
 
     def _show_context_menu(self, event):
         """Show right-click context menu"""
-        if self.rotation_tree.selection():
+        if self.rotation_tree.selected_index() is not None:
             self.context_menu.post(event.x_root, event.y_root)
 
     def _edit_spell(self):
         """Edit selected spell"""
-        selection = self.rotation_tree.selection()
-        if not selection:
-            return
-
-        item = selection[0]
-        spell_data = self.rotation_tree.item(item)["values"]
-        spell = self._get_spell_by_priority(spell_data[0])
+        spell = self._selected_spell()
         if not spell:
             return
 
@@ -330,13 +322,13 @@ class RotationPanel(ModernFrame):
         # Save button
         def save_changes():
             try:
-                # Update spell
-                spell.condition = condition_text.get('1.0', 'end-1c')
-                spell.enabled = enabled_var.get()
-                spell.notes = notes_text.get('1.0', 'end-1c')
-                
-                self.refresh()
-                self.has_unsaved_changes = True
+                # Update spell; the rotation reports the change back to the list
+                self.rotation.update_spell(
+                    spell.priority,
+                    condition=condition_text.get('1.0', 'end-1c'),
+                    enabled=enabled_var.get(),
+                    notes=notes_text.get('1.0', 'end-1c')
+                )
                 edit_window.destroy()
                 
             except Exception as e:
@@ -350,67 +342,53 @@ class RotationPanel(ModernFrame):
 
     def _toggle_spell_enabled(self):
         """Toggle selected spell enabled state"""
-        selection = self.rotation_tree.selection()
-        if not selection:
-            return
-
-        item = selection[0]
-        spell_data = self.rotation_tree.item(item)["values"]
-        spell = self._get_spell_by_priority(spell_data[0])
+        spell = self._selected_spell()
         if spell:
-            spell.enabled = not spell.enabled
-            self.refresh()
-            self.has_unsaved_changes = True
+            self.rotation.update_spell(spell.priority, enabled=not spell.enabled)
 
     def _move_up(self):
         """Move selected spell up"""
-        selection = self.rotation_tree.selection()
-        if not selection:
+        index = self.rotation_tree.selected_index()
+        if index is None:
             return
 
-        item = selection[0]
-        spell_data = self.rotation_tree.item(item)["values"]
-        priority = spell_data[0]
-
+        priority = index + 1
         if priority > 1:
             if self.on_spell_moved:
                 self.on_spell_moved(priority, priority - 1)
+            self.rotation_tree.see(index - 1)
             self.has_unsaved_changes = True
 
     def _move_down(self):
         """Move selected spell down"""
-        selection = self.rotation_tree.selection()
-        if not selection:
+        index = self.rotation_tree.selected_index()
+        if index is None:
             return
 
-        item = selection[0]
-        spell_data = self.rotation_tree.item(item)["values"]
-        priority = spell_data[0]
-
+        priority = index + 1
         if self.rotation and priority < len(self.rotation.spells):
             if self.on_spell_moved:
                 self.on_spell_moved(priority, priority + 1)
+            self.rotation_tree.see(index + 1)
             self.has_unsaved_changes = True
 
     def _remove_spell(self):
         """Remove selected spell"""
-        selection = self.rotation_tree.selection()
-        if not selection:
+        index = self.rotation_tree.selected_index()
+        if index is None:
             return
 
         if messagebox.askyesno("Confirm", "Remove selected spell from rotation?"):
-            item = selection[0]
-            spell_data = self.rotation_tree.item(item)["values"]
-            priority = spell_data[0]
-            
             if self.on_spell_removed:
-                self.on_spell_removed(priority)
+                self.on_spell_removed(index + 1)
             self.has_unsaved_changes = True
 
     def clear(self):
         """Clear the panel"""
+        self._unwatch()
         self.rotation = None
         self._update_metadata_display()
+        self.rotation_tree.select(None)
         self.refresh()
         self.has_unsaved_changes = False
 
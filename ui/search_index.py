@@ -0,0 +1,110 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from bisect import bisect_left
+
+class SearchIndex:
+    """
+    Case-insensitive prefix, substring and fuzzy search over a fixed list of strings
+    Every 1- to 3-character substring of each value is indexed, so a query
+    only checks the values that contain all of its n-grams instead of scanning
+    the list, and a sorted copy answers prefix lookups by bisection. Results
+    are indexes into values, best match first and otherwise in their original
+    order.
+    """
+
+    NGRAM = 3
+
+    def __init__(self, values: Sequence[str], categories: Optional[Sequence[str]] = None):
+        self.values = list(values)
+        self.categories = list(categories) if categories is not None else None
+        self._lower = [value.lower() for value in self.values]
+        self._grams: Dict[str, List[int]] = {}
+        for i, text in enumerate(self._lower):
+            grams = set()
+            for n in range(1, self.NGRAM + 1):
+                grams.update(text[start:start + n] for start in range(len(text) - n + 1))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(i)
+        self._sorted = sorted(range(len(self.values)), key=self._lower.__getitem__)
+        self._sorted_keys = [self._lower[i] for i in self._sorted]
+        # Matches of the previous query, narrowed when the next one extends it
+        self._last: Optional[Tuple[str, bool, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _candidates(self, query: str, fuzzy: bool) -> Iterable[int]:
+        """Values containing every n-gram (fuzzy: every character) of the query"""
+        if self._last is not None:
+            last_query, last_fuzzy, matches = self._last
+            if fuzzy == last_fuzzy and query.startswith(last_query):
+                # Anything matching the longer query matched the shorter one
+                return matches
+        if fuzzy:
+            keys: Set[str] = set(query.replace(" ", ""))
+        elif len(query) <= self.NGRAM:
+            keys = {query}
+        else:
+            keys = {query[i:i + self.NGRAM] for i in range(len(query) - self.NGRAM + 1)}
+        postings = sorted((self._grams.get(key, ()) for key in keys), key=len)
+        if not postings or not postings[0]:
+            return ()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        return candidates
+
+    @staticmethod
+    def _gaps(query: str, text: str) -> Optional[int]:
+        """Characters skipped matching query as a subsequence of text, or None"""
+        gaps = 0
+        position = 0
+        for char in query:
+            found = text.find(char, position)
+            if found < 0:
+                return None
+            gaps += found - position
+            position = found + 1
+        return gaps
+
+    def _rank(self, query: str, index: int, fuzzy: bool) -> Optional[tuple]:
+        """Sort key for a value: exact, prefix, word start, substring, then fuzzy"""
+        text = self._lower[index]
+        position = text.find(query)
+        if position == 0:
+            return (0 if len(text) == len(query) else 1, 0, len(text), index)
+        if position > 0:
+            return (2 if not text[position - 1].isalnum() else 3, position, len(text), index)
+        if fuzzy:
+            gaps = self._gaps(query.replace(" ", ""), text)
+            if gaps is not None:
+                return (4, gaps, len(text), index)
+        return None
+
+    def search(self, query: str, fuzzy: bool = True) -> List[int]:
+        """Indexes of the values matching query, best first; an empty query matches all"""
+        query = query.strip().lower()
+        if not query:
+            return list(range(len(self.values)))
+        ranked = []
+        for index in self._candidates(query, fuzzy):
+            key = self._rank(query, index, fuzzy)
+            if key is not None:
+                ranked.append(key)
+        ranked.sort()
+        matches = [key[-1] for key in ranked]
+        self._last = (query, fuzzy, matches)
+        return matches
+
+    def prefix(self, query: str) -> List[int]:
+        """Indexes of the values starting with query, in sorted order"""
+        query = query.lower()
+        start = bisect_left(self._sorted_keys, query)
+        end = bisect_left(self._sorted_keys, query + "\U0010ffff", start)
+        return self._sorted[start:end]
+
+    def filter(self, indexes: Iterable[int], category: Optional[str]) -> List[int]:
+        """Keep the indexes whose category matches (all of them for None)"""
+        if category is None or self.categories is None:
+            return list(indexes)
+        categories = self.categories
+        return [index for index in indexes if categories[index] == category]
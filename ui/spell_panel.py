@@ -1,16 +1,34 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Optional, Callable, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Callable, Dict, Any, Sequence, Tuple
 import spell_data
-from .widgets import ModernFrame, ModernLabel, ModernButton, SearchEntry
+import spell_mechanics
+from .search_index import SearchIndex
+from .widgets import ModernFrame, ModernLabel, ModernButton, SearchEntry, VirtualTreeview
 
 class SpellPanel(ModernFrame):
+    # Milliseconds to wait after the last keystroke before searching, and
+    # between checks for a finished search
+    SEARCH_DELAY = 150
+    POLL_INTERVAL = 20
+
+    # Search indexes (with each spell's type) by class/spec, built once
+    _indexes: Dict[Tuple[str, str], SearchIndex] = {}
+
     def __init__(self, parent):
         super().__init__(parent)
         self.selected_spell: Optional[str] = None
         self.on_spell_selected: Optional[Callable[[str], None]] = None
         self.spells: List[str] = []
         self.filtered_spells: List[str] = []
+        self.mechanics: Dict[str, spell_mechanics.SpellMechanics] = {}
+        self.search_index = SearchIndex([])
+        self._matches: List[int] = []       # spells matching the search, best first
+        self._filtered: List[int] = []      # _matches narrowed by the category filter
+        self._search_job = None
+        self._search_generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spell-search")
         
         self._create_widgets()
         self._create_context_menu()
@@ -43,7 +61,7 @@ class SpellPanel(ModernFrame):
         filter_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
 
         self.filter_var = tk.StringVar(value="All")
-        categories = ["All", "Damage", "Healing", "Cooldown", "Utility"]
+        categories = ["All"] + list(spell_mechanics.SPELL_TYPES)
         
         for category in categories:
             ttk.Radiobutton(
@@ -58,21 +76,11 @@ class SpellPanel(ModernFrame):
         list_frame = ModernFrame(self)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
 
-        # Create Treeview with scrollbar
-        self.spell_tree = ttk.Treeview(
-            list_frame,
-            columns=("name", "type"),
-            show="headings",
-            selectmode="browse"
-        )
-        
-        scrollbar = ttk.Scrollbar(
+        # Virtualized list: only the visible spells are rendered
+        self.spell_tree = VirtualTreeview(
             list_frame,
-            orient=tk.VERTICAL,
-            command=self.spell_tree.yview
+            columns=("name", "type")
         )
-        
-        self.spell_tree.configure(yscrollcommand=scrollbar.set)
 
         # Setup columns
         self.spell_tree.heading("name", text="Spell Name")
@@ -81,9 +89,7 @@ class SpellPanel(ModernFrame):
         self.spell_tree.column("name", width=150)
         self.spell_tree.column("type", width=80)
 
-        # Pack Treeview and scrollbar
-        self.spell_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.spell_tree.pack(fill=tk.BOTH, expand=True)
 
         # Information frame
         self.info_frame = ModernFrame(self)
@@ -134,37 +140,50 @@ class SpellPanel(ModernFrame):
 
     def _bind_events(self):
         """Bind event handlers"""
-        self.spell_tree.bind("<<TreeviewSelect>>", self._on_spell_selected)
-        self.spell_tree.bind("<Double-1>", self._on_double_click)
-        self.spell_tree.bind("<Button-3>", self._show_context_menu)
-        self.spell_tree.bind("<Return>", lambda e: self._add_selected_spell())
-
-    def update_spells(self, spells: List[str]):
-        """Update the spell list"""
-        self.spells = spells
-        self.filtered_spells = spells.copy()
-        self._update_spell_list()
+        self.spell_tree.bind("<<RowSelect>>", self._on_spell_selected)
+        self.spell_tree.tree.bind("<Double-1>", self._on_double_click)
+        self.spell_tree.tree.bind("<Button-3>", self._show_context_menu)
+        self.spell_tree.tree.bind("<Return>", lambda e: self._add_selected_spell())
+
+    def update_spells(self, spells: Sequence[str], class_name: Optional[str] = None,
+                      spec_name: Optional[str] = None):
+        """Update the spell list; mechanics are only decoded for the given spec"""
+        self.mechanics = (spell_mechanics.get_spec_mechanics(class_name, spec_name)
+                          if class_name and spec_name else {})
+        self.spells = list(spells)
+        self.search_index = self._get_index(class_name, spec_name)
         self._clear_selection()
+        self._matches = self.search_index.search(self.search_entry.get())
+        self._apply_filters()
+
+    def _get_index(self, class_name: Optional[str], spec_name: Optional[str]) -> SearchIndex:
+        """Search index for the current spells, reusing the spec's if it has one"""
+        key = (class_name, spec_name)
+        index = SpellPanel._indexes.get(key)
+        if index is None or index.values != self.spells:
+            index = SearchIndex(self.spells, [self._get_spell_type(spell) for spell in self.spells])
+            if class_name and spec_name:
+                SpellPanel._indexes[key] = index
+        return index
 
     def _update_spell_list(self):
-        """Update the Treeview with current spells"""
-        # Clear existing items
-        for item in self.spell_tree.get_children():
-            self.spell_tree.delete(item)
-
-        # Add filtered spells
-        for spell in self.filtered_spells:
-            spell_type = self._get_spell_type(spell)
-            self.spell_tree.insert(
-                "",
-                tk.END,
-                values=(spell, spell_type)
-            )
+        """Update the list with current spells; only visible rows are redrawn"""
+        values = self.search_index.values
+        categories = self.search_index.categories
+        self.filtered_spells = [values[i] for i in self._filtered]
+        self.spell_tree.set_rows([(values[i], categories[i]) for i in self._filtered])
+
+        # Keep the selected spell selected if it is still listed
+        if self.selected_spell in self.filtered_spells:
+            self.spell_tree.select(self.filtered_spells.index(self.selected_spell))
+        else:
+            self.spell_tree.select(None)
 
     def _get_spell_type(self, spell_name: str) -> str:
-        """Determine spell type based on name/mechanics"""
-        # This is a simplified version - you would want to expand this
-        # based on actual spell data
+        """Determine spell type from the mechanics database, guessing from the name otherwise"""
+        mechanics = self.mechanics.get(spell_name)
+        if mechanics:
+            return mechanics.spell_type
         spell_name_lower = spell_name.lower()
         
         if any(word in spell_name_lower for word in 
@@ -184,10 +203,9 @@ class SpellPanel(ModernFrame):
 
     def _on_spell_selected(self, event):
         """Handle spell selection"""
-        selection = self.spell_tree.selection()
-        if selection:
-            item = selection[0]
-            spell_name = self.spell_tree.item(item)["values"][0]
+        index = self.spell_tree.selected_index()
+        if index is not None:
+            spell_name = self.filtered_spells[index]
             self.selected_spell = spell_name
             self.add_button.configure(state=tk.NORMAL)
             
@@ -205,9 +223,14 @@ class SpellPanel(ModernFrame):
 
     def _get_spell_info(self, spell_name: str) -> str:
         """Get detailed spell information"""
-        # This is a placeholder - you would want to add actual spell data
         spell_type = self._get_spell_type(spell_name)
-        return f"Spell: {spell_name}\nType: {spell_type}\n\nClick 'Add to Rotation' to use this spell."
+        info = f"Spell: {spell_name}\nType: {spell_type}\n"
+        mechanics = self.mechanics.get(spell_name)
+        if mechanics:
+            cast = f"{mechanics.cast_time:g}s cast" if mechanics.cast_time else "Instant"
+            cooldown = f", {mechanics.cooldown:g}s cooldown" if mechanics.cooldown else ""
+            info += f"{cast}{cooldown}\n"
+        return info + "\nClick 'Add to Rotation' to use this spell."
 
     def _on_double_click(self, event):
         """Handle double click on spell"""
@@ -281,57 +304,70 @@ class SpellPanel(ModernFrame):
 
     def _get_spell_description(self, spell_name: str) -> str:
         """Get detailed spell description"""
-        # This is a placeholder - you would want to add actual spell descriptions
+        mechanics = self.mechanics.get(spell_name)
+        if not mechanics:
+            return f"No mechanics data available for {spell_name}."
+        cost = f"{mechanics.cost:g} {mechanics.resource}" if mechanics.resource else "None"
         return (
-            f"Description for {spell_name}\n\n"
-            "This is where the detailed spell description would go, including:\n"
-            "- Spell effects\n"
-            "- Damage/healing values\n"
-            "- Cooldown\n"
-            "- Resource cost\n"
-            "- Additional effects"
+            f"School: {mechanics.school}\n"
+            f"Cast time: {f'{mechanics.cast_time:g} sec' if mechanics.cast_time else 'Instant'}\n"
+            f"Cooldown: {f'{mechanics.cooldown:g} sec' if mechanics.cooldown else 'None'}\n"
+            f"Global cooldown: {f'{mechanics.gcd:g} sec' if mechanics.gcd else 'None'}\n"
+            f"Cost: {cost}\n"
+            f"Charges: {mechanics.charges}\n"
+            f"Area of effect: {'Yes' if mechanics.aoe else 'No'}"
         )
 
     def _clear_selection(self):
         """Clear current selection"""
-        self.spell_tree.selection_remove(*self.spell_tree.selection())
+        self.spell_tree.select(None)
         self.selected_spell = None
         self.add_button.configure(state=tk.DISABLED)
         self.info_label.configure(text="Select a spell to view details")
 
     def _on_search(self, *args):
-        """Handle search input changes"""
-        search_text = self.search_var.get().lower()
-        self.filtered_spells = [
-            spell for spell in self.spells
-            if search_text in spell.lower()
-        ]
+        """Debounce search input changes"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY, self._start_search)
+
+    def _start_search(self):
+        """Run the search on the worker thread so typing stays responsive"""
+        self._search_job = None
+        self._search_generation += 1
+        future = self._executor.submit(self.search_index.search, self.search_entry.get())
+        self._poll_search(future, self.search_index, self._search_generation)
+
+    def _poll_search(self, future: Future, index: SearchIndex, generation: int):
+        """Show a search's results once done, unless the search was superseded"""
+        if not future.done():
+            self.after(self.POLL_INTERVAL, self._poll_search, future, index, generation)
+            return
+        if generation != self._search_generation or index is not self.search_index:
+            return
+        self._matches = future.result()
         self._apply_filters()
 
     def _apply_filters(self):
-        """Apply category filters"""
+        """Apply the category filter to the search results (which it leaves intact)"""
         category = self.filter_var.get()
-        if category == "All":
-            self._update_spell_list()
-            return
-
-        filtered = []
-        for spell in self.filtered_spells:
-            spell_type = self._get_spell_type(spell)
-            if spell_type == category:
-                filtered.append(spell)
-
-        self.filtered_spells = filtered
+        self._filtered = self.search_index.filter(self._matches, None if category == "All" else category)
         self._update_spell_list()
 
     def clear(self):
         """Clear the panel"""
         self.spells = []
-        self.filtered_spells = []
-        self._update_spell_list()
+        self.search_index = SearchIndex([])
+        self._matches = []
+        self._apply_filters()
         self._clear_selection()
         self.search_var.set("")
 
+    def destroy(self):
+        """Stop the search worker with the panel"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
 class SearchEntry(ttk.Entry):
     """Custom Entry widget with placeholder text"""
     def __init__(self, parent, placeholder="", *args, **kwargs):
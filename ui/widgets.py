@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, List, Sequence
 import re
+import time
+from .search_index import SearchIndex
 
 class ModernFrame(ttk.Frame):
     """Modern styled frame"""
@@ -31,22 +33,81 @@ class ModernButton(ttk.Button):
             self.configure(style="Modern.TButton")
 
 class ModernCombobox(ttk.Combobox):
-    """Modern styled combobox with search functionality"""
+    """
+    Modern styled combobox with indexed search
+    Values are indexed when set (see SearchIndex). Typing in an editable
+    combobox lists the matching values, narrowing the previous matches as
+    the text grows; at most PAGE_SIZE are listed, with a last entry that
+    lists more. In a read-only combobox typing jumps to the first value
+    starting with the typed text.
+    """
+
+    # Most matches listed at once
+    PAGE_SIZE = 200
+
+    # Seconds between keystrokes that still extend a read-only type-ahead
+    TYPEAHEAD_TIMEOUT = 1.0
+
     def __init__(self, master=None, **kwargs):
         super().__init__(master, style="Modern.TCombobox", **kwargs)
         
         self._original_values = []
-        self._filtered_values = []
+        self._index = SearchIndex([])
+        self._matches: List[int] = []
+        self._limit = self.PAGE_SIZE
+        self._more_label: Optional[str] = None
         self._last_search = ""
-        
-        self.bind("<KeyRelease>", self._on_key_release)
-        self.bind("<<ComboboxSelected>>", self._on_select)
-
-    def configure(self, **kwargs):
-        """Override configure to capture values"""
+        self._search_text = ""
+        self._typed = ""
+        self._typed_at = 0.0
+        if "values" in kwargs:
+            self._set_values(kwargs["values"])
+
+        # Bound on a tag of our own so bind() calls on the widget do not
+        # replace these handlers
+        tag = f"ModernCombobox{id(self)}"
+        self.bindtags((tag,) + self.bindtags())
+        self.bind_class(tag, "<KeyPress>", self._on_key_press)
+        self.bind_class(tag, "<KeyRelease>", self._on_key_release)
+        self.bind_class(tag, "<<ComboboxSelected>>", self._on_select)
+
+    def configure(self, cnf=None, **kwargs):
+        """Override configure to capture and index values"""
+        if isinstance(cnf, dict):
+            kwargs = {**cnf, **kwargs}
+            cnf = None
         if "values" in kwargs:
-            self._original_values = list(kwargs["values"])
-        super().configure(**kwargs)
+            self._set_values(kwargs["values"])
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def _set_values(self, values):
+        self._original_values = list(values)
+        self._index = SearchIndex([str(value) for value in self._original_values])
+        self._matches = []
+        self._last_search = ""
+
+    def _show(self, values: List[Any]):
+        """List values in the dropdown without re-indexing them"""
+        super().configure(values=values)
+
+    def _on_key_press(self, event):
+        """Type-ahead for read-only comboboxes"""
+        if self["state"] != "readonly" or not event.char or not event.char.isprintable():
+            return
+
+        now = time.monotonic()
+        typed = self._typed + event.char if now - self._typed_at <= self.TYPEAHEAD_TIMEOUT else event.char
+        matches = self._index.prefix(typed)
+        if not matches and typed != event.char:
+            typed = event.char
+            matches = self._index.prefix(typed)
+        self._typed = typed
+        self._typed_at = now
+        if matches:
+            self.current(min(matches))
+            self.event_generate("<<ComboboxSelected>>")
 
     def _on_key_release(self, event):
         """Handle key release for search"""
@@ -57,21 +118,35 @@ class ModernCombobox(ttk.Combobox):
         if current_text == self._last_search:
             return
 
+        # The index narrows the previous matches when the text was extended
         self._last_search = current_text
-        self._filtered_values = [
-            value for value in self._original_values
-            if current_text in str(value).lower()
-        ]
-        
-        self["values"] = self._filtered_values
+        self._search_text = self.get()
+        self._matches = self._index.search(current_text, fuzzy=False)
+        self._limit = self.PAGE_SIZE
+        self._show_matches()
         
-        if self._filtered_values:
+        if self._matches:
             self.event_generate("<Down>")
 
+    def _show_matches(self):
+        """List the first page(s) of matches, with an entry for the rest"""
+        values = [self._original_values[i] for i in self._matches[:self._limit]]
+        remaining = len(self._matches) - len(values)
+        self._more_label = f"... {remaining} more" if remaining > 0 else None
+        self._show(values + [self._more_label] if self._more_label else values)
+
     def _on_select(self, event):
         """Handle selection"""
+        if self._more_label is not None and self.get() == self._more_label:
+            # List the next page instead of selecting the placeholder
+            self._limit += self.PAGE_SIZE
+            self.set(self._search_text)
+            self._show_matches()
+            self.event_generate("<Down>")
+            return "break"
         self._last_search = ""
-        self["values"] = self._original_values
+        self._more_label = None
+        self._show(self._original_values)
 
 class SearchEntry(ttk.Entry):
     """Search entry with placeholder text and clear button"""
@@ -158,34 +233,48 @@ class ModernTreeview(ttk.Treeview):
         self.bind("<<TreeviewSelect>>", self._on_select)
         self._last_selected = None
 
+    def _retag(self, parent, start: int, stop: Optional[int] = None):
+        """Reapply alternating row tags to children start..stop of parent"""
+        items = self.get_children(parent)
+        for i in range(start, len(items) if stop is None else min(stop + 1, len(items))):
+            self.item(items[i], tags=("evenrow" if i % 2 == 0 else "oddrow",))
+
     def insert(self, parent, index, **kwargs):
         """Override insert to add alternating row colors"""
         item = super().insert(parent, index, **kwargs)
         
-        # Add alternating row tags
-        items = self.get_children(parent)
-        for i, item in enumerate(items):
-            self.item(item, tags=("evenrow" if i % 2 == 0 else "oddrow",))
-            
+        # Only rows from the new one down change parity
+        self._retag(parent, self.index(item))
         return item
 
     def delete(self, *items):
         """Override delete to maintain alternating row colors"""
+        parents = {}
+        for item in items:
+            if self.exists(item):
+                parent = self.parent(item)
+                index = self.index(item)
+                parents[parent] = min(index, parents.get(parent, index))
         super().delete(*items)
         
-        # Reapply alternating row tags
-        items = self.get_children("")
-        for i, item in enumerate(items):
-            self.item(item, tags=("evenrow" if i % 2 == 0 else "oddrow",))
+        # Reapply alternating row tags below the first deleted row
+        for parent, start in parents.items():
+            if parent == "" or self.exists(parent):
+                self._retag(parent, start)
 
     def move(self, item, parent, index):
         """Override move to maintain alternating row colors"""
+        old_parent = self.parent(item)
+        old_index = self.index(item)
         super().move(item, parent, index)
         
-        # Reapply alternating row tags
-        items = self.get_children(parent)
-        for i, item in enumerate(items):
-            self.item(item, tags=("evenrow" if i % 2 == 0 else "oddrow",))
+        # Reapply alternating row tags to the rows between the old and new position
+        new_index = self.index(item)
+        if old_parent == parent:
+            self._retag(parent, min(old_index, new_index), max(old_index, new_index))
+        else:
+            self._retag(old_parent, old_index)
+            self._retag(parent, new_index)
 
     def _on_select(self, event):
         """Handle selection"""
@@ -195,6 +284,217 @@ class ModernTreeview(ttk.Treeview):
         else:
             self._last_selected = None
 
+class VirtualTreeview(ModernFrame):
+    """
+    Treeview over a list of rows that only renders the visible ones
+    A pool of Treeview items sized to the viewport is reused as the view
+    scrolls, and a pool item is only updated when the row it shows changed,
+    so replacing or editing rows costs Tk calls for the visible rows only.
+    Selection is tracked by row index; bind <<RowSelect>> for changes and
+    other mouse/key events on .tree. With numbered, the first column shows
+    each row's 1-based position and rows hold the remaining columns.
+    """
+    def __init__(self, master=None, columns: Sequence[str] = (), numbered: bool = False, **kwargs):
+        super().__init__(master, **kwargs)
+
+        self.rows: List[tuple] = []
+        self.numbered = numbered
+        self._top = 0                       # index of the first visible row
+        self._capacity = 20                 # rows that fit the viewport
+        self._selected: Optional[int] = None
+        self._pool: List[str] = []          # Treeview items, one per visible row
+        self._shown: List[Optional[tuple]] = []     # (values, tag) each pool item shows
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=columns,
+            show="headings",
+            selectmode="browse",
+            style="Modern.Treeview",
+            height=1
+        )
+        self.tree.tag_configure("oddrow", background="#f5f5f5")
+        self.tree.tag_configure("evenrow", background="#ffffff")
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._step(-1))
+        self.tree.bind("<Down>", lambda e: self._step(1))
+        self.tree.bind("<Prior>", lambda e: self._step(-self._capacity))
+        self.tree.bind("<Next>", lambda e: self._step(self._capacity))
+        self.tree.bind("<Home>", lambda e: self._step(-len(self.rows)))
+        self.tree.bind("<End>", lambda e: self._step(len(self.rows)))
+
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def set_rows(self, rows: Sequence[Sequence[Any]]):
+        """Replace every row; only visible rows that differ are redrawn"""
+        self.rows = [tuple(row) for row in rows]
+        dropped = self._selected is not None and self._selected >= len(self.rows)
+        if dropped:
+            self._selected = None
+        self._render()
+        if dropped:
+            self.event_generate("<<RowSelect>>")
+
+    def update_row(self, index: int, values: Sequence[Any]):
+        """Replace one row"""
+        self.rows[index] = tuple(values)
+        if self._top <= index < self._top + len(self._pool):
+            self._render()
+
+    def insert_row(self, index: int, values: Sequence[Any]):
+        """Insert a row before index"""
+        index = min(max(index, 0), len(self.rows))
+        self.rows.insert(index, tuple(values))
+        if self._selected is not None and self._selected >= index:
+            self._selected += 1
+        self._render()
+
+    def delete_row(self, index: int):
+        """Remove a row; deleting the selected row clears the selection"""
+        del self.rows[index]
+        dropped = self._selected == index
+        if dropped:
+            self._selected = None
+        elif self._selected is not None and self._selected > index:
+            self._selected -= 1
+        self._render()
+        if dropped:
+            self.event_generate("<<RowSelect>>")
+
+    def move_row(self, old_index: int, new_index: int):
+        """Move a row; the selection follows the row it was on"""
+        self.rows.insert(new_index, self.rows.pop(old_index))
+        selected = self._selected
+        if selected is not None:
+            if selected == old_index:
+                self._selected = new_index
+            elif old_index < selected <= new_index:
+                self._selected = selected - 1
+            elif new_index <= selected < old_index:
+                self._selected = selected + 1
+        self._render()
+
+    def selected_index(self) -> Optional[int]:
+        """Index of the selected row, if any"""
+        return self._selected
+
+    def select(self, index: Optional[int]):
+        """Select a row (None clears the selection) and scroll it into view"""
+        if index is not None:
+            if not self.rows:
+                index = None
+            else:
+                index = min(max(index, 0), len(self.rows) - 1)
+                self._scroll_into_view(index)
+        changed = index != self._selected
+        self._selected = index
+        self._render()
+        if changed:
+            self.event_generate("<<RowSelect>>")
+
+    def see(self, index: int):
+        """Scroll so the row is visible"""
+        self._scroll_into_view(index)
+        self._render()
+
+    def scroll(self, amount: int):
+        """Scroll by a number of rows"""
+        self._top += amount
+        self._render()
+
+    def _scroll_into_view(self, index: int):
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._capacity:
+            self._top = index - self._capacity + 1
+
+    def _render(self):
+        """Sync the item pool with the visible rows and the selection"""
+        self._top = max(0, min(self._top, len(self.rows) - self._capacity))
+        count = max(0, min(self._capacity, len(self.rows) - self._top))
+        while len(self._pool) < count:
+            self._pool.append(self.tree.insert("", tk.END))
+            self._shown.append(None)
+        if len(self._pool) > count:
+            self.tree.delete(*self._pool[count:])
+            del self._pool[count:]
+            del self._shown[count:]
+
+        for slot, item in enumerate(self._pool):
+            index = self._top + slot
+            values = (index + 1,) + self.rows[index] if self.numbered else self.rows[index]
+            shown = (values, "evenrow" if index % 2 == 0 else "oddrow")
+            if self._shown[slot] != shown:
+                self.tree.item(item, values=shown[0], tags=(shown[1],))
+                self._shown[slot] = shown
+
+        slot = -1 if self._selected is None else self._selected - self._top
+        selection = self.tree.selection()
+        if 0 <= slot < count:
+            if selection != (self._pool[slot],):
+                self.tree.selection_set(self._pool[slot])
+            self.tree.focus(self._pool[slot])
+        elif selection:
+            self.tree.selection_remove(*selection)
+
+        if self.rows:
+            self.scrollbar.set(self._top / len(self.rows), (self._top + count) / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_configure(self, event):
+        """Size the pool to the rows that fit the new height"""
+        row_height = int(ttk.Style().lookup("Modern.Treeview", "rowheight") or 20)
+        header = row_height
+        if self._pool:
+            bbox = self.tree.bbox(self._pool[0])
+            if bbox:
+                header = bbox[1]
+        capacity = max(1, (event.height - header) // row_height)
+        if capacity != self._capacity:
+            self._capacity = capacity
+            self._render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * len(self.rows))
+            self._render()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.scroll(amount * self._capacity if args[2] == "pages" else amount)
+
+    def _on_tree_select(self, event):
+        """Map a click on a pool item to its row"""
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self._pool:
+            return
+        index = self._top + self._pool.index(selection[0])
+        if index != self._selected:
+            self._selected = index
+            self.event_generate("<<RowSelect>>")
+
+    def _step(self, step: int):
+        """Move the selection by step rows from the keyboard"""
+        if self.rows:
+            self.select(self._top if self._selected is None else self._selected + step)
+        return "break"
+
 class ModernNotebook(ttk.Notebook):
     """Modern styled notebook with tab features"""
     def __init__(self, master=None, **kwargs):